@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ai_interview_screener.settings')
@@ -14,6 +15,13 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 
+@worker_process_init.connect
+def warm_ai_client(**kwargs):
+    """Create the shared AI client once per worker process, before it takes tasks"""
+    from interviews.services import warm_ai_service
+    warm_ai_service()
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
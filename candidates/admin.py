@@ -1,21 +1,31 @@
 from django.contrib import admin
-from .models import Candidate, CandidateScore
+from .models import Candidate, CandidateScore, ResumeIngestionJob, ResumeParseCacheEntry
 
 
 @admin.register(Candidate)
 class CandidateAdmin(admin.ModelAdmin):
-    list_display = ['name', 'email', 'phone', 'experience_years', 'created_at']
-    list_filter = ['experience_years', 'created_at']
+    list_display = ['name', 'email', 'phone', 'experience_years', 'parse_status', 'created_at']
+    list_filter = ['experience_years', 'parse_status', 'parser_version', 'created_at']
     search_fields = ['name', 'email', 'phone']
-    readonly_fields = ['id', 'created_at', 'updated_at']
+    readonly_fields = [
+        'id', 'resume_hash', 'parse_job_id', 'parse_duration', 'resume_page_count', 'parsed_at',
+        'parser_version', 'reparse_failed_version', 'created_at', 'updated_at'
+    ]
     fieldsets = (
         ('Basic Information', {
-            'fields': ('name', 'email', 'phone', 'resume_file')
+            'fields': ('name', 'email', 'phone', 'resume_file', 'resume_hash')
         }),
         ('Parsed Resume Data', {
             'fields': ('experience_years', 'skills', 'education', 'work_experience', 'summary'),
             'classes': ('collapse',)
         }),
+        ('Resume Parsing', {
+            'fields': (
+                'parse_status', 'parse_job_id', 'parse_error',
+                'parse_duration', 'resume_page_count', 'parsed_at', 'parser_version', 'reparse_failed_version'
+            ),
+            'classes': ('collapse',)
+        }),
         ('Metadata', {
             'fields': ('id', 'created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -30,3 +40,18 @@ class CandidateScoreAdmin(admin.ModelAdmin):
     search_fields = ['candidate__name', 'candidate__email']
     readonly_fields = ['id', 'created_at', 'updated_at']
     raw_id_fields = ['candidate']
+
+
+@admin.register(ResumeParseCacheEntry)
+class ResumeParseCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ['content_hash', 'parser_version', 'page_count', 'hit_count', 'created_at', 'last_hit_at']
+    list_filter = ['parser_version', 'created_at']
+    search_fields = ['content_hash']
+    readonly_fields = ['created_at', 'last_hit_at']
+
+
+@admin.register(ResumeIngestionJob)
+class ResumeIngestionJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'status', 'created_at', 'started_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    readonly_fields = ['id', 'created_at', 'started_at', 'finished_at']
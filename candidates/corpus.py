@@ -0,0 +1,137 @@
+import os
+import random
+from typing import Dict, List
+
+import docx
+
+
+LINES_PER_PAGE = 55
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rahul', 'Sneha', 'Vikram', 'Ananya', 'Rohan', 'Kavya', 'Arjun', 'Meera']
+LAST_NAMES = ['Sharma', 'Patel', 'Mohanty', 'Reddy', 'Nair', 'Das', 'Iyer', 'Behera', 'Gupta', 'Singh']
+TITLES = ['Software Engineer', 'Backend Developer', 'Data Analyst', 'Full Stack Developer', 'DevOps Engineer',
+          'Machine Learning Engineer', 'QA Engineer', 'Product Engineer']
+COMPANIES = ['Infosys', 'TCS', 'Wipro', 'Mindtree', 'Zoho', 'Freshworks', 'Flipkart', 'Razorpay', 'Swiggy']
+SKILLS = ['Python', 'Django', 'Flask', 'JavaScript', 'React', 'Node.js', 'SQL', 'PostgreSQL', 'MySQL', 'Docker',
+          'Kubernetes', 'AWS', 'Git', 'REST APIs', 'Celery', 'Redis', 'Java', 'Spring', 'Pandas', 'TensorFlow']
+DEGREES = ['Bachelor of Technology in Computer Science', 'Master of Computer Applications',
+           'Bachelor of Science in Information Technology', 'Master of Technology in Data Science']
+INSTITUTIONS = ['Utkal University', 'KIIT University', 'National Institute of Technology Rourkela',
+                'Anna University', 'Delhi University']
+VERBS = ['Built', 'Designed', 'Maintained', 'Optimized', 'Migrated', 'Automated', 'Led', 'Implemented']
+OBJECTS = ['payment APIs', 'data pipelines', 'reporting dashboards', 'CI/CD workflows', 'search services',
+           'microservices', 'ETL jobs', 'customer portals', 'test suites', 'caching layers']
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def generate_resume_lines(rng: random.Random, pages: int) -> List[str]:
+    """Build a plausible resume filling roughly ``pages`` pages of text"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | +91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}",
+        "",
+        "Professional Summary",
+        f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience building web applications "
+        f"with {', '.join(rng.sample(SKILLS, 3))}.",
+        "",
+        "Technical Skills",
+        ', '.join(rng.sample(SKILLS, 10)),
+        "",
+        "Work Experience",
+    ]
+
+    target = pages * LINES_PER_PAGE - 8
+    year = 2024
+    while len(lines) < target:
+        start_year = year - rng.randint(1, 3)
+        lines.append(
+            f"{rng.choice(TITLES)} | {rng.choice(COMPANIES)} | "
+            f"{rng.choice(MONTH_NAMES)} {start_year} - {rng.choice(MONTH_NAMES)} {year}"
+        )
+        for _ in range(rng.randint(3, 6)):
+            lines.append(
+                f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, "
+                f"cutting response times by {rng.randint(10, 70)}%."
+            )
+        lines.append("")
+        # Long resumes wrap around to overlapping dates rather than going back decades
+        year = start_year if start_year > 2000 else 2024
+
+    lines += [
+        "Education",
+        f"{rng.choice(DEGREES)}, {rng.choice(INSTITUTIONS)}, 2010 - 2014",
+        "",
+        "Certifications",
+        f"AWS Certified Developer ({rng.randint(2015, 2024)})",
+    ]
+    return lines
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: str, lines: List[str]):
+    """Write lines as a plain Helvetica PDF, LINES_PER_PAGE lines to a page"""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    # Object 1 is the catalog, 2 the page tree, 3 the font; each page adds a page and a content object
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>".encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, page_lines in zip(page_ids, pages):
+        stream = "BT /F1 10 Tf 13 TL 50 770 Td " + ' '.join(
+            f"({_pdf_escape(line)}) Tj T*" for line in page_lines
+        ) + " ET"
+        stream = stream.encode('latin-1', 'replace')
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        ).encode()
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+
+    with open(path, 'wb') as pdf:
+        pdf.write(b"%PDF-1.4\n")
+        offsets = {}
+        for number in sorted(objects):
+            offsets[number] = pdf.tell()
+            pdf.write(b"%d 0 obj\n%s\nendobj\n" % (number, objects[number]))
+        xref = pdf.tell()
+        pdf.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for number in sorted(objects):
+            pdf.write(b"%010d 00000 n \n" % offsets[number])
+        pdf.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+
+def write_docx(path: str, lines: List[str]):
+    """Write lines as DOCX paragraphs with a page break every LINES_PER_PAGE lines"""
+    document = docx.Document()
+    for index, line in enumerate(lines):
+        if index and index % LINES_PER_PAGE == 0:
+            document.add_page_break()
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def generate_corpus(directory: str, page_counts: List[int], files_per_size: int,
+                    seed: int = 0) -> Dict[str, Dict[int, List[str]]]:
+    """Write a reproducible set of PDF and DOCX resumes
+
+    The same seed always produces the same documents. Returns the file
+    paths grouped by file type and page count.
+    """
+    os.makedirs(directory, exist_ok=True)
+    corpus = {'pdf': {}, 'docx': {}}
+    for pages in page_counts:
+        for file_type in corpus:
+            corpus[file_type][pages] = []
+        for index in range(files_per_size):
+            lines = generate_resume_lines(random.Random(f"{seed}-{pages}-{index}"), pages)
+            for file_type, writer in (('pdf', write_pdf), ('docx', write_docx)):
+                path = os.path.join(directory, f"resume_{pages}p_{index}.{file_type}")
+                writer(path, lines)
+                corpus[file_type][pages].append(path)
+    return corpus
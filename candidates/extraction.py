@@ -0,0 +1,141 @@
+import mmap
+import re
+import zipfile
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+from xml.etree import ElementTree
+
+import PyPDF2
+
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PARAGRAPH = WORD_NAMESPACE + 'p'
+TEXT = WORD_NAMESPACE + 't'
+TAB = WORD_NAMESPACE + 'tab'
+BREAKS = (WORD_NAMESPACE + 'br', WORD_NAMESPACE + 'cr')
+TABLE_ROW = WORD_NAMESPACE + 'tr'
+TABLE_CELL = WORD_NAMESPACE + 'tc'
+BODY = WORD_NAMESPACE + 'body'
+
+APP_PAGES_PATTERN = re.compile(rb'<(?:\w+:)?Pages>(\d+)</(?:\w+:)?Pages>')
+
+
+@contextmanager
+def open_pdf(file_path: str) -> Iterator[PyPDF2.PdfReader]:
+    """Open a PDF through a memory map so it is paged in on demand instead of copied onto the heap"""
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        yield PyPDF2.PdfReader(buffer)
+
+
+def iter_pdf_pages(pdf_reader: PyPDF2.PdfReader) -> Iterator[str]:
+    """Yield the text of each PDF page lazily, so stopping early skips the remaining pages"""
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ''
+
+
+def iter_docx_blocks(file_path: str) -> Iterator[str]:
+    """Yield DOCX paragraphs and table rows from word/document.xml
+
+    The XML is parsed incrementally and each element is cleared once it has
+    been read, so memory stays flat for long documents. Table rows are
+    yielded as one line with cells separated by " | ".
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as document:
+        body = None
+        # Stacks allow tables nested inside table cells
+        rows = []
+        cells = []
+        parts = []
+
+        for event, element in ElementTree.iterparse(document, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag == BODY:
+                    body = element
+                elif tag == TABLE_ROW:
+                    rows.append([])
+                elif tag == TABLE_CELL:
+                    cells.append([])
+                continue
+
+            if tag == TEXT:
+                parts.append(element.text or '')
+            elif tag == TAB:
+                parts.append('\t')
+            elif tag in BREAKS:
+                parts.append('\n')
+            elif tag == PARAGRAPH:
+                paragraph = ''.join(parts).strip()
+                parts = []
+                if cells:
+                    if paragraph:
+                        cells[-1].append(paragraph)
+                else:
+                    if paragraph:
+                        yield paragraph
+                    # Drop finished top-level blocks so the tree never grows
+                    if not rows and body is not None:
+                        body.clear()
+                element.clear()
+            elif tag == TABLE_CELL:
+                cell = ' '.join(cells.pop())
+                if rows:
+                    rows[-1].append(cell)
+                element.clear()
+            elif tag == TABLE_ROW:
+                row = ' | '.join(cell for cell in rows.pop() if cell)
+                if cells:
+                    cells[-1].append(row)
+                else:
+                    if row:
+                        yield row
+                    if not rows and body is not None:
+                        body.clear()
+                element.clear()
+
+
+def docx_page_count(file_path: str) -> Optional[int]:
+    """Page count recorded by the authoring application in docProps/app.xml, if any"""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            match = APP_PAGES_PATTERN.search(archive.read('docProps/app.xml'))
+    except KeyError:
+        return None
+    return int(match.group(1)) if match else None
+
+
+def _collect(blocks: Iterator[str], max_blocks: Optional[int], max_chars: Optional[int]) -> Tuple[str, bool]:
+    """Join blocks into text within the budget; returns (text, truncated)"""
+    collected = []
+    length = 0
+    try:
+        for index, block in enumerate(blocks):
+            if max_blocks is not None and index >= max_blocks:
+                return '\n'.join(collected), True
+            if max_chars is not None and length + len(block) > max_chars:
+                collected.append(block[:max(0, max_chars - length)])
+                return '\n'.join(collected), True
+            collected.append(block)
+            length += len(block) + 1
+    finally:
+        blocks.close()
+    return '\n'.join(collected), False
+
+
+def extract_text(file_path: str, file_type: str, max_pages: Optional[int] = None,
+                 max_chars: Optional[int] = None) -> Tuple[str, Optional[int], bool]:
+    """Extract text from a PDF or DOCX resume within a page and character budget
+
+    Returns the text, the document's page count (None when unknown) and
+    whether the text was truncated by the budget.
+    """
+    file_type = file_type.lower()
+    if file_type == 'pdf':
+        with open_pdf(file_path) as pdf_reader:
+            text, truncated = _collect(iter_pdf_pages(pdf_reader), max_pages, max_chars)
+            return text, len(pdf_reader.pages), truncated
+    elif file_type in ['docx', 'doc']:
+        text, truncated = _collect(iter_docx_blocks(file_path), None, max_chars)
+        return text, docx_page_count(file_path), truncated
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
@@ -0,0 +1,211 @@
+import os
+import resource
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import django
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import Candidate
+from .sandbox import ParseFailed
+from .services import PARSER_VERSION, ResumeParseCache, ResumeParserService, compute_file_hash
+from .tasks import apply_parsed_data
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ['pdf', 'docx']
+
+CANDIDATE_UPDATE_FIELDS = [
+    'name', 'phone', 'resume_file', 'resume_hash', 'experience_years', 'skills', 'education',
+    'work_experience', 'summary', 'parse_status', 'parse_error', 'parse_duration',
+    'resume_page_count', 'parsed_at', 'parser_version', 'resume_text_compressed', 'updated_at',
+]
+
+
+def _init_worker(memory_limit_mb):
+    """Configure Django in pool processes started with spawn and cap their memory"""
+    django.setup()
+    if memory_limit_mb:
+        memory_limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+def _parse_resume_file(file_path: str, sandboxed: Optional[bool] = False) -> Dict:
+    """Extract and parse one resume
+
+    In a memory-capped pool process extraction runs in place
+    (sandboxed=False); called from the ingesting process itself, pass
+    sandboxed=None so it goes through the sandboxed parser pool like single
+    uploads (RESUME_PARSE_SANDBOX). Errors are returned rather than raised
+    so one bad file cannot abort the batch.
+    """
+    parser = ResumeParserService()
+    file_type = os.path.splitext(file_path)[1][1:]
+    try:
+        started = time.monotonic()
+        text, page_count = parser.extract_text(file_path, file_type, sandboxed=sandboxed)
+        return {
+            'text': text,
+            'parsed_data': parser._parse_resume_text(text),
+            'page_count': page_count,
+            'duration': time.monotonic() - started,
+        }
+    except MemoryError:
+        return {'error': str(ParseFailed('oom'))}
+    except Exception as e:
+        return {'error': str(e) or e.__class__.__name__}
+
+
+class ResumeIngestionService:
+    """Parse many stored resumes in parallel and create or update candidates
+
+    Candidates are matched on the email address found in the resume. Text
+    extraction is CPU bound, so it is fanned out over a process pool sized to
+    the machine's cores; database writes are batched in the parent process.
+    """
+
+    def __init__(self, max_workers: int = None, batch_size: int = 500):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def ingest(self, file_names: List[str]) -> Dict:
+        """Ingest resumes already saved to default storage under file_names"""
+        started = time.monotonic()
+        errors = []
+        parsed = []
+
+        for file_name, result in zip(file_names, self._parse_all(file_names)):
+            if 'error' in result:
+                errors.append({'file': file_name, 'error': result['error']})
+            elif not result['contact']['email']:
+                errors.append({'file': file_name, 'error': 'No email address found in resume'})
+            else:
+                parsed.append((file_name, result))
+
+        created, updated, conflicts = self._save_candidates(parsed)
+        errors.extend(conflicts)
+        elapsed = time.monotonic() - started
+
+        report = {
+            'total': len(file_names),
+            'created': created,
+            'updated': updated,
+            'failed': len(errors),
+            'errors': errors,
+            'workers': self.max_workers,
+            'elapsed': round(elapsed, 3),
+            'throughput': round(len(file_names) / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+        logger.info(
+            f"Ingested {report['total']} resumes ({created} created, {updated} updated, "
+            f"{report['failed']} failed) at {report['throughput']} resumes/s"
+        )
+        return report
+
+    def _parse_all(self, file_names: List[str]) -> List[Dict]:
+        """Parse files, serving previously seen file contents from the parse cache"""
+        parser = ResumeParserService()
+        cache = ResumeParseCache()
+        paths = [default_storage.path(name) for name in file_names]
+        hashes = [compute_file_hash(path) for path in paths]
+        cached = cache.get_many(hashes)
+
+        # Identical files within the batch are only parsed once
+        pending = {}
+        for path, content_hash in zip(paths, hashes):
+            if content_hash not in cached:
+                pending.setdefault(content_hash, path)
+
+        fresh = dict(zip(pending, self._run_parsers(list(pending.values()))))
+        cache.set_many({
+            content_hash: result for content_hash, result in fresh.items() if 'error' not in result
+        })
+
+        results = []
+        for content_hash in hashes:
+            result = dict(cached.get(content_hash) or fresh[content_hash], content_hash=content_hash)
+            if 'error' not in result:
+                result.setdefault('duration', 0.0)
+                result['contact'] = parser.extract_contact_info(result['text'])
+            results.append(result)
+        return results
+
+    def _run_parsers(self, paths: List[str]) -> List[Dict]:
+        if self.max_workers == 1 or len(paths) <= 1:
+            # Parsing in this process (a Celery worker or the command), so
+            # extraction needs the sandbox's timeout and memory cap
+            return [_parse_resume_file(path, sandboxed=None) for path in paths]
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        chunksize = max(1, len(paths) // (self.max_workers * 4))
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(settings.RESUME_PARSE_MEMORY_LIMIT_MB,)) as executor:
+            return list(executor.map(_parse_resume_file, paths, chunksize=chunksize))
+
+    def _save_candidates(self, parsed):
+        """Create or update candidates with bulk queries; returns (created, updated, errors)
+
+        A resume updates the existing candidate with its email and phone,
+        else the oldest one with its email. Resumes that would give a
+        candidate the (email, phone) of another one are reported in errors
+        instead of failing the whole batch on the unique constraint.
+        """
+        # The last resume wins when the same email appears twice in a batch
+        by_email = {}
+        for file_name, result in parsed:
+            by_email[result['contact']['email']] = (file_name, result)
+
+        existing = {}
+        by_pair = {}
+        for candidate in Candidate.objects.filter(email__in=list(by_email)).order_by('created_at'):
+            existing.setdefault(candidate.email, candidate)
+            by_pair[(candidate.email, candidate.phone)] = candidate
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        errors = []
+        for email, (file_name, result) in by_email.items():
+            contact = result['contact']
+            candidate = by_pair.get((email, contact['phone'])) or existing.get(email)
+            phone = contact['phone'] or (candidate.phone if candidate else '')
+            owner = by_pair.get((email, phone))
+            if owner is not None and owner is not candidate:
+                # One row breaking unique (email, phone) would roll back the whole batch
+                errors.append({
+                    'file': file_name,
+                    'error': f"Another candidate already has email {email} and phone {phone}",
+                })
+                continue
+
+            if candidate is None:
+                candidate = Candidate(email=email)
+                to_create.append(candidate)
+            else:
+                to_update.append(candidate)
+
+            candidate.name = contact['name'] or candidate.name
+            candidate.phone = phone
+            candidate.resume_file = file_name
+            candidate.resume_hash = result['content_hash']
+            apply_parsed_data(candidate, result['parsed_data'])
+            candidate.resume_text = result['text']
+            candidate.parser_version = PARSER_VERSION
+            candidate.parse_status = 'completed'
+            candidate.parse_error = ''
+            candidate.parse_duration = result['duration']
+            candidate.resume_page_count = result['page_count']
+            candidate.parsed_at = now
+            candidate.updated_at = now
+
+        with transaction.atomic():
+            Candidate.objects.bulk_create(to_create, batch_size=self.batch_size)
+            Candidate.objects.bulk_update(to_update, CANDIDATE_UPDATE_FIELDS, batch_size=self.batch_size)
+
+        return len(to_create), len(to_update), errors
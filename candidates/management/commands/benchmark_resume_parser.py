@@ -0,0 +1,175 @@
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates import extraction
+from candidates.corpus import generate_corpus
+from candidates.services import PARSER_VERSION, ResumeParserService
+
+PHASES = ['extract', 'parse']
+
+
+def _percentile(samples, percent):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _summarize(samples):
+    return {
+        'p50': round(_percentile(samples, 50), 6),
+        'p95': round(_percentile(samples, 95), 6),
+        'mean': round(sum(samples) / len(samples), 6),
+        'samples': len(samples),
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark resume text extraction and parsing on a synthetic PDF/DOCX corpus"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', default='1,5,20,50', help="Comma-separated page counts of the generated resumes"
+        )
+        parser.add_argument('--files', type=int, default=3, help="Resumes generated per file type and page count")
+        parser.add_argument('--iterations', type=int, default=5, help="Timed runs per resume")
+        parser.add_argument('--seed', type=int, default=0, help="Seed for the corpus generator")
+        parser.add_argument('--corpus-dir', help="Keep the generated corpus in this directory")
+        parser.add_argument(
+            '--unbounded', action='store_true',
+            help="Ignore RESUME_MAX_PAGES/RESUME_MAX_CHARS and extract whole documents"
+        )
+        parser.add_argument('--output', help="Write the JSON report to this file")
+        parser.add_argument('--baseline', help="JSON report of an earlier run to compare against")
+        parser.add_argument(
+            '--threshold', type=float, default=20.0,
+            help="Percent p50 slowdown against the baseline reported as a regression"
+        )
+        parser.add_argument(
+            '--fail-on-regression', action='store_true', help="Exit with an error if any regression is found"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            page_counts = sorted({int(pages) for pages in options['pages'].split(',') if pages.strip()})
+        except ValueError:
+            raise CommandError(f"Invalid --pages value: {options['pages']}")
+        if not page_counts or options['files'] < 1 or options['iterations'] < 1:
+            raise CommandError("--pages, --files and --iterations must be positive")
+
+        if options['unbounded']:
+            max_pages = max_chars = None
+        else:
+            max_pages, max_chars = settings.RESUME_MAX_PAGES, settings.RESUME_MAX_CHARS
+
+        with tempfile.TemporaryDirectory() as scratch:
+            corpus_dir = options['corpus_dir'] or scratch
+            self.stderr.write(f"Generating corpus in {corpus_dir}...")
+            corpus = generate_corpus(corpus_dir, page_counts, options['files'], options['seed'])
+
+            report = {
+                'parser_version': PARSER_VERSION,
+                'python': platform.python_version(),
+                'config': {
+                    'pages': page_counts,
+                    'files': options['files'],
+                    'iterations': options['iterations'],
+                    'seed': options['seed'],
+                    'max_pages': max_pages,
+                    'max_chars': max_chars,
+                },
+                'results': {},
+            }
+            for file_type, sizes in corpus.items():
+                for pages, paths in sizes.items():
+                    self.stderr.write(f"  {file_type} {pages} pages")
+                    report['results'][f"{file_type}/{pages}"] = self._benchmark(
+                        paths, file_type, options['iterations'], max_pages, max_chars
+                    )
+
+        if options['baseline']:
+            report['comparison'] = self._compare(report, options['baseline'], options['threshold'])
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output + '\n')
+        self.stdout.write(output)
+
+        regressions = report.get('comparison', {}).get('regressions', [])
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f"{len(regressions)} benchmark(s) regressed by more than {options['threshold']:g}%")
+
+    def _benchmark(self, paths, file_type, iterations, max_pages, max_chars):
+        parser = ResumeParserService()
+        timings = {phase: [] for phase in PHASES}
+        total = 0.0
+        chars = 0
+
+        for path in paths:
+            for _ in range(iterations):
+                started = time.perf_counter()
+                text, _, truncated = extraction.extract_text(path, file_type, max_pages, max_chars)
+                extracted = time.perf_counter()
+                parser._parse_resume_text(text)
+                finished = time.perf_counter()
+
+                timings['extract'].append(extracted - started)
+                timings['parse'].append(finished - extracted)
+                total += finished - started
+            chars += len(text)
+
+        # tracemalloc slows allocation down, so peak memory gets its own untimed pass
+        peak_memory = {phase: 0 for phase in PHASES}
+        for path in paths:
+            tracemalloc.start()
+            text, _, _ = extraction.extract_text(path, file_type, max_pages, max_chars)
+            peak_memory['extract'] = max(peak_memory['extract'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            parser._parse_resume_text(text)
+            peak_memory['parse'] = max(peak_memory['parse'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        runs = len(paths) * iterations
+        result = {
+            'files': len(paths),
+            'bytes': sum(os.path.getsize(path) for path in paths) // len(paths),
+            'chars': chars // len(paths),
+            'truncated': truncated,
+            'throughput': round(runs / total, 2) if total else None,
+        }
+        for phase in PHASES:
+            result[phase] = dict(_summarize(timings[phase]), peak_memory=peak_memory[phase])
+        return result
+
+    def _compare(self, report, baseline_path, threshold):
+        """Relative p50/p95 change of each benchmark against a stored report"""
+        try:
+            with open(baseline_path) as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline {baseline_path}: {e}")
+
+        comparison = {'baseline_parser_version': baseline.get('parser_version'), 'changes': {}, 'regressions': []}
+        for key, result in report['results'].items():
+            previous = baseline.get('results', {}).get(key)
+            if not previous:
+                continue
+            changes = {}
+            for phase in PHASES:
+                for stat in ['p50', 'p95']:
+                    before = previous.get(phase, {}).get(stat)
+                    if before:
+                        changes[f"{phase}_{stat}"] = round((result[phase][stat] - before) / before * 100, 1)
+            comparison['changes'][key] = changes
+            for phase in PHASES:
+                if changes.get(f"{phase}_p50", 0) > threshold:
+                    comparison['regressions'].append(f"{key} {phase}")
+        return comparison
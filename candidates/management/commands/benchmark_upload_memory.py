@@ -0,0 +1,136 @@
+import io
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import threading
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
+from django.core.management.base import BaseCommand
+
+from candidates.uploads import save_upload
+
+STRATEGIES = ['buffered', 'streaming']
+
+
+def _rss_bytes():
+    """Current resident set size, or the high-water mark where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+class _RSSSampler(threading.Thread):
+    """Track the peak RSS of this process while uploads run"""
+
+    def __init__(self, interval=0.001):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = _rss_bytes()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+
+def _make_upload(index, size, chunk):
+    """Build an upload the way Django's upload handlers would for this size"""
+    name = f"resume_{index}.pdf"
+    if size > settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+        upload = TemporaryUploadedFile(name, 'application/pdf', size, None)
+    else:
+        upload = InMemoryUploadedFile(io.BytesIO(), 'resume_file', name, 'application/pdf', size, None)
+    written = 0
+    while written < size:
+        upload.write(chunk[:size - written])
+        written += len(chunk)
+    upload.seek(0)
+    return upload
+
+
+def _run_uploads(strategy, concurrency, size, results):
+    """Save concurrent uploads with one strategy; runs in a fresh process"""
+    django.setup()
+    chunk = os.urandom(64 * 1024)
+    uploads = [_make_upload(index, size, chunk) for index in range(concurrency)]
+
+    with tempfile.TemporaryDirectory() as location:
+        storage = FileSystemStorage(location=location)
+        barrier = threading.Barrier(concurrency)
+
+        def upload(resume):
+            barrier.wait()
+            if strategy == 'buffered':
+                storage.save(resume.name, ContentFile(resume.read()))
+            else:
+                save_upload(resume, resume.name, storage)
+
+        baseline = _rss_bytes()
+        sampler = _RSSSampler()
+        sampler.start()
+        threads = [threading.Thread(target=upload, args=(resume,)) for resume in uploads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sampler.stop()
+        peak = sampler.peak
+
+    for resume in uploads:
+        resume.close()
+    results.put({'baseline_rss': baseline, 'peak_rss': peak})
+
+
+class Command(BaseCommand):
+    help = "Measure peak RSS of concurrent resume uploads saved buffered vs. streamed"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8, help="Number of simultaneous uploads")
+        parser.add_argument('--size-mb', type=float, default=8, help="Size of each uploaded file in MB")
+        parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        size = int(options['size_mb'] * 1024 * 1024)
+
+        # A fresh process per strategy keeps the RSS high-water marks independent
+        context = multiprocessing.get_context('spawn')
+        report = {'concurrency': concurrency, 'file_size': size, 'strategies': {}}
+        for strategy in STRATEGIES:
+            results = context.Queue()
+            process = context.Process(target=_run_uploads, args=(strategy, concurrency, size, results))
+            process.start()
+            measurement = results.get()
+            process.join()
+
+            growth = max(0, measurement['peak_rss'] - measurement['baseline_rss'])
+            measurement['rss_growth'] = growth
+            measurement['rss_per_upload'] = growth // concurrency
+            report['strategies'][strategy] = measurement
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{concurrency} concurrent uploads of {size / (1024 * 1024):.1f} MB")
+        for strategy, measurement in report['strategies'].items():
+            self.stdout.write(
+                f"  {strategy:<10} peak RSS growth {measurement['rss_growth'] / (1024 * 1024):8.1f} MB"
+                f"  ({measurement['rss_per_upload'] / (1024 * 1024):.2f} MB per upload)"
+            )
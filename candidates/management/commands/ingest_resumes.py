@@ -0,0 +1,70 @@
+import json
+import os
+import zipfile
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.ingestion import SUPPORTED_EXTENSIONS, ResumeIngestionService
+
+
+class Command(BaseCommand):
+    help = "Bulk ingest PDF/DOCX resumes from a directory or zip archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="Directory or .zip file containing resumes")
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="Number of parser processes (defaults to the number of CPU cores)"
+        )
+        parser.add_argument('--json', action='store_true', help="Print the full report as JSON")
+
+    def handle(self, *args, **options):
+        source = options['source']
+        if zipfile.is_zipfile(source):
+            file_names = self._store_zip(source)
+        elif os.path.isdir(source):
+            file_names = self._store_directory(source)
+        else:
+            raise CommandError(f"{source} is neither a directory nor a zip archive")
+
+        if not file_names:
+            raise CommandError(f"No {'/'.join(SUPPORTED_EXTENSIONS)} files found in {source}")
+
+        self.stdout.write(f"Ingesting {len(file_names)} resumes...")
+        report = ResumeIngestionService(max_workers=options['workers']).ingest(file_names)
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for error in report['errors']:
+            self.stderr.write(f"  {error['file']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['created']} created, {report['updated']} updated, {report['failed']} failed "
+            f"in {report['elapsed']}s ({report['throughput']} resumes/s, {report['workers']} workers)"
+        ))
+
+    def _is_resume(self, name):
+        return os.path.splitext(name)[1][1:].lower() in SUPPORTED_EXTENSIONS
+
+    def _store_directory(self, directory):
+        file_names = []
+        for root, _, names in os.walk(directory):
+            for name in sorted(names):
+                if self._is_resume(name):
+                    with open(os.path.join(root, name), 'rb') as resume:
+                        file_names.append(default_storage.save(f"resumes/{name}", File(resume)))
+        return file_names
+
+    def _store_zip(self, archive_path):
+        file_names = []
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or not self._is_resume(name):
+                    continue
+                with archive.open(info) as resume:
+                    file_names.append(default_storage.save(f"resumes/{name}", File(resume, name=name)))
+        return file_names
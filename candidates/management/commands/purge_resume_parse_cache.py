@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from candidates.models import ResumeParseCacheEntry
+from candidates.services import PARSER_VERSION, ResumeParseCache
+
+
+class Command(BaseCommand):
+    help = "Delete cached resume parse results written by older parser versions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Delete every cached result, including the current version")
+
+    def handle(self, *args, **options):
+        if options['all']:
+            deleted, _ = ResumeParseCacheEntry.objects.all().delete()
+        else:
+            deleted = ResumeParseCache().purge_stale()
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} cached resume parse results (current parser version: {PARSER_VERSION})"
+        ))
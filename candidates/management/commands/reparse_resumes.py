@@ -0,0 +1,47 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from candidates.reparse import ResumeReparseService
+from candidates.services import PARSER_VERSION
+
+
+class Command(BaseCommand):
+    help = "Re-parse stored resume text for candidates parsed by an older parser version"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="Number of parser processes (defaults to the number of CPU cores)"
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Candidates fetched and saved per batch")
+        parser.add_argument('--limit', type=int, default=None, help="Stop after this many candidates")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the candidates that would be re-parsed")
+        parser.add_argument('--json', action='store_true', help="Print the full report as JSON")
+
+    def handle(self, *args, **options):
+        service = ResumeReparseService(max_workers=options['workers'], chunk_size=options['chunk_size'])
+
+        if options['dry_run']:
+            stale = service.stale_candidates()
+            missing_text = stale.filter(resume_text_compressed__isnull=True).count()
+            self.stdout.write(
+                f"{stale.count()} candidates need re-parsing to parser version {PARSER_VERSION} "
+                f"({missing_text} without stored text will be extracted from their files); "
+                f"{service.failed_candidates().count()} that already failed with this version are skipped"
+            )
+            return
+
+        report = service.reparse(limit=options['limit'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for error in report['errors']:
+            self.stderr.write(f"  {error['candidate_id']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['reparsed']} re-parsed ({report['extracted']} extracted from files), "
+            f"{report['failed']} failed in {report['elapsed']}s "
+            f"({report['throughput']} resumes/s, {report['workers']} workers); {report['remaining']} still stale"
+        ))
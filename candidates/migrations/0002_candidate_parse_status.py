@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='parse_duration',
+            field=models.FloatField(blank=True, help_text='Duration in seconds', null=True),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='parse_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='parse_job_id',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='parse_status',
+            field=models.CharField(choices=[('not_started', 'Not Started'), ('queued', 'Queued'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='not_started', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='parsed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_page_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0002_candidate_parse_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeParseCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('parser_version', models.PositiveIntegerField()),
+                ('extracted_text', models.TextField(blank=True)),
+                ('parsed_data', models.JSONField(default=dict)),
+                ('page_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_hit_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'unique_together': {('content_hash', 'parser_version')},
+            },
+        ),
+    ]
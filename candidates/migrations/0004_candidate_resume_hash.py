@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0003_resumeparsecacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the resume file', max_length=64),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0004_candidate_resume_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='parser_version',
+            field=models.PositiveIntegerField(blank=True, db_index=True, help_text='Parser version that produced the parsed fields', null=True),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_text_compressed',
+            field=models.BinaryField(blank=True, help_text='zlib-compressed extracted resume text', null=True),
+        ),
+    ]
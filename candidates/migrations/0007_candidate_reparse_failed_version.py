@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0006_resumeingestionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='reparse_failed_version',
+            field=models.PositiveIntegerField(blank=True, help_text='Parser version whose re-parse of this candidate failed', null=True),
+        ),
+    ]
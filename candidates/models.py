@@ -1,13 +1,23 @@
 from django.db import models
 import uuid
+import zlib
 
 
 class Candidate(models.Model):
+    PARSE_STATUS_CHOICES = [
+        ('not_started', 'Not Started'),
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=200)
     email = models.EmailField()
     phone = models.CharField(max_length=20, help_text="E.164 format (e.g., +1234567890)")
     resume_file = models.FileField(upload_to='resumes/', blank=True, null=True)
+    resume_hash = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the resume file")
     
     # Parsed resume data
     experience_years = models.PositiveIntegerField(null=True, blank=True)
@@ -16,17 +26,89 @@ class Candidate(models.Model):
     work_experience = models.JSONField(default=list, blank=True)
     summary = models.TextField(blank=True)
     
+    # Resume parsing job
+    parse_status = models.CharField(max_length=20, choices=PARSE_STATUS_CHOICES, default='not_started')
+    parse_job_id = models.CharField(max_length=100, blank=True)
+    parse_error = models.TextField(blank=True)
+    parse_duration = models.FloatField(null=True, blank=True, help_text="Duration in seconds")
+    resume_page_count = models.PositiveIntegerField(null=True, blank=True)
+    parsed_at = models.DateTimeField(null=True, blank=True)
+    parser_version = models.PositiveIntegerField(
+        null=True, blank=True, db_index=True, help_text="Parser version that produced the parsed fields"
+    )
+    reparse_failed_version = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Parser version whose re-parse of this candidate failed"
+    )
+    resume_text_compressed = models.BinaryField(
+        null=True, blank=True, editable=False, help_text="zlib-compressed extracted resume text"
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.name} ({self.email})"
 
+    @property
+    def resume_text(self) -> str:
+        """Extracted resume text, kept compressed so re-parsing never has to re-read the file"""
+        if not self.resume_text_compressed:
+            return ''
+        return zlib.decompress(bytes(self.resume_text_compressed)).decode('utf-8')
+
+    @resume_text.setter
+    def resume_text(self, text: str):
+        self.resume_text_compressed = zlib.compress(text.encode('utf-8')) if text else None
+
     class Meta:
         ordering = ['-created_at']
         unique_together = ['email', 'phone']
 
 
+class ResumeParseCacheEntry(models.Model):
+    """Parsed resume output keyed by the SHA-256 of the file bytes and the parser version"""
+    content_hash = models.CharField(max_length=64)
+    parser_version = models.PositiveIntegerField()
+    extracted_text = models.TextField(blank=True)
+    parsed_data = models.JSONField(default=dict)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_hit_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} (v{self.parser_version})"
+
+    class Meta:
+        unique_together = ['content_hash', 'parser_version']
+
+
+class ResumeIngestionJob(models.Model):
+    """A bulk resume upload being ingested by a Celery worker"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    file_names = models.JSONField(default=list, help_text="Stored resume files to ingest")
+    rejected = models.JSONField(default=list, blank=True, help_text="Uploads that failed validation")
+    report = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Resume ingestion {self.id} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
 class CandidateScore(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     candidate = models.OneToOneField(Candidate, on_delete=models.CASCADE, related_name='score')
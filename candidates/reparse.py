@@ -0,0 +1,187 @@
+import os
+import time
+import logging
+import multiprocessing
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .ingestion import _init_worker
+from .models import Candidate
+from .sandbox import ParseFailed
+from .services import PARSER_VERSION, ResumeParserService
+from .tasks import apply_parsed_data
+
+logger = logging.getLogger(__name__)
+
+REPARSE_UPDATE_FIELDS = [
+    'experience_years', 'skills', 'education', 'work_experience', 'summary', 'parser_version', 'updated_at',
+]
+# Also written for legacy candidates whose text had to be extracted from the file
+EXTRACTED_UPDATE_FIELDS = REPARSE_UPDATE_FIELDS + ['resume_text_compressed', 'resume_page_count']
+FAILED_UPDATE_FIELDS = ['parse_error', 'reparse_failed_version', 'updated_at']
+
+
+def _reparse_chunk(items: List[Tuple]) -> List[Dict]:
+    """Re-run the text parser over a chunk of candidates; runs inside a pool process
+
+    Each item is (pk, compressed text or None, resume file path or None).
+    Candidates stored before extracted text was kept have their file
+    extracted once. Errors are returned per candidate rather than raised.
+    """
+    parser = ResumeParserService()
+    results = []
+    for pk, compressed, file_path in items:
+        result = {'pk': pk}
+        try:
+            if compressed:
+                text = zlib.decompress(compressed).decode('utf-8')
+            elif not file_path:
+                raise ValueError("No stored resume text or resume file")
+            else:
+                file_type = os.path.splitext(file_path)[1][1:]
+                # Already in a dedicated process, so skip the sandbox subprocess
+                text, result['page_count'] = parser.extract_text(file_path, file_type, sandboxed=False)
+                result['text'] = text
+            result['parsed_data'] = parser._parse_resume_text(text)
+        except MemoryError:
+            result['error'] = str(ParseFailed('oom'))
+        except Exception as e:
+            result['error'] = str(e) or e.__class__.__name__
+        results.append(result)
+    return results
+
+
+class ResumeReparseService:
+    """Re-run the resume text parser for candidates parsed by an older PARSER_VERSION
+
+    Only the stored extracted text is parsed again, so no resume files are
+    read. Candidates are walked in primary key order in chunks; each chunk is
+    parsed in a process pool and written back with one bulk_update, which
+    also marks it current. An interrupted run therefore resumes where it
+    stopped, since finished candidates no longer match the stale filter.
+    Candidates that fail are marked with the parser version and skipped by
+    later runs until PARSER_VERSION changes again.
+    """
+
+    def __init__(self, max_workers: int = None, chunk_size: int = 1000):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def stale_candidates(self):
+        # exclude() also matches rows whose parser_version is NULL
+        return Candidate.objects.filter(parse_status='completed').exclude(
+            parser_version=PARSER_VERSION
+        ).exclude(reparse_failed_version=PARSER_VERSION)
+
+    def failed_candidates(self):
+        """Stale candidates whose re-parse already failed with this parser version"""
+        return Candidate.objects.filter(parse_status='completed', reparse_failed_version=PARSER_VERSION).exclude(
+            parser_version=PARSER_VERSION
+        )
+
+    def reparse(self, limit: Optional[int] = None) -> Dict:
+        """Re-parse up to limit stale candidates; returns a report of the run"""
+        started = time.monotonic()
+        report = {'reparsed': 0, 'extracted': 0, 'failed': 0, 'errors': [], 'chunks': 0}
+
+        for results in self._run(self._chunks(limit)):
+            self._save(results, report)
+            report['chunks'] += 1
+            logger.info(f"Re-parsed {report['reparsed']} resumes ({report['failed']} failed)")
+
+        elapsed = time.monotonic() - started
+        report.update({
+            'parser_version': PARSER_VERSION,
+            'workers': self.max_workers,
+            'elapsed': round(elapsed, 3),
+            'throughput': round(report['reparsed'] / elapsed, 2) if elapsed > 0 else 0.0,
+            'remaining': self.stale_candidates().count(),
+        })
+        return report
+
+    def _chunks(self, limit: Optional[int]) -> Iterator[List[Tuple]]:
+        """Yield stale candidates in primary key order, fetching one chunk per query"""
+        last_pk = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+            queryset = self.stale_candidates().order_by('pk').values_list('pk', 'resume_text_compressed', 'resume_file')
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            rows = list(queryset[:size])
+            if not rows:
+                return
+
+            last_pk = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+            yield [
+                (pk, bytes(compressed) if compressed else None, self._file_path(resume_file))
+                for pk, compressed, resume_file in rows
+            ]
+
+    def _file_path(self, resume_file: str) -> Optional[str]:
+        return default_storage.path(resume_file) if resume_file else None
+
+    def _run(self, chunks: Iterator[List[Tuple]]) -> Iterator[List[Dict]]:
+        """Parse chunks in worker processes, keeping only a few chunks in flight"""
+        if self.max_workers == 1:
+            for chunk in chunks:
+                yield _reparse_chunk(chunk)
+            return
+
+        # Chunks are queried while workers start, so spawn them rather than fork
+        # copies of the parent's open database connection
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(settings.RESUME_PARSE_MEMORY_LIMIT_MB,)) as executor:
+            pending = set()
+            for chunk in chunks:
+                pending.add(executor.submit(_reparse_chunk, chunk))
+                if len(pending) >= self.max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in pending:
+                yield future.result()
+
+    def _save(self, results: List[Dict], report: Dict):
+        """Write one chunk of parse results back with bulk updates"""
+        now = timezone.now()
+        reparsed = []
+        extracted = []
+        failed = []
+        for result in results:
+            if 'error' in result:
+                report['failed'] += 1
+                report['errors'].append({'candidate_id': str(result['pk']), 'error': result['error']})
+                failed.append(Candidate(
+                    pk=result['pk'], parse_error=result['error'], reparse_failed_version=PARSER_VERSION,
+                    updated_at=now
+                ))
+                continue
+
+            candidate = Candidate(pk=result['pk'])
+            apply_parsed_data(candidate, result['parsed_data'])
+            candidate.parser_version = PARSER_VERSION
+            candidate.updated_at = now
+            if 'text' in result:
+                candidate.resume_text = result['text']
+                candidate.resume_page_count = result['page_count']
+                extracted.append(candidate)
+            else:
+                reparsed.append(candidate)
+
+        with transaction.atomic():
+            Candidate.objects.bulk_update(reparsed, REPARSE_UPDATE_FIELDS, batch_size=self.chunk_size)
+            Candidate.objects.bulk_update(extracted, EXTRACTED_UPDATE_FIELDS, batch_size=self.chunk_size)
+            Candidate.objects.bulk_update(failed, FAILED_UPDATE_FIELDS, batch_size=self.chunk_size)
+
+        report['reparsed'] += len(reparsed) + len(extracted)
+        report['extracted'] += len(extracted)
@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+import queue
+import resource
+import signal
+import threading
+from typing import Optional, Tuple
+
+from django.conf import settings
+
+from . import extraction
+
+
+class ParseFailed(Exception):
+    """Raised when a sandboxed parser job times out, runs out of memory or crashes"""
+
+    def __init__(self, reason: str, detail: str = ''):
+        self.reason = reason
+        self.detail = detail
+        super().__init__(str(self))
+
+    def __str__(self):
+        message = f"parse_failed: {self.reason}"
+        return f"{message} ({self.detail})" if self.detail else message
+
+
+def _worker_main(connection, memory_limit: Optional[int]):
+    """Loop of a parser subprocess: receive a job, extract its text, send the result"""
+    # Let the parent decide when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    while True:
+        try:
+            job = connection.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+
+        try:
+            connection.send(('ok', extraction.extract_text(*job)))
+        except MemoryError:
+            # The heap may be fragmented past recovery; report and let the pool restart us
+            connection.send(('oom', ''))
+            return
+        except Exception as e:
+            connection.send(('error', str(e) or e.__class__.__name__))
+
+
+class _ParserWorker:
+    """A long-lived parser subprocess and the pipe used to talk to it"""
+
+    def __init__(self, context, memory_limit: Optional[int]):
+        self.memory_limit = memory_limit
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection, memory_limit), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def run(self, job: tuple, timeout: float):
+        try:
+            self.connection.send(job)
+            if not self.connection.poll(timeout):
+                raise ParseFailed('timeout', f"no result after {timeout:g}s")
+            status, payload = self.connection.recv()
+        except (EOFError, OSError):
+            raise self._death()
+
+        if status == 'oom':
+            limit = f"{self.memory_limit // (1024 * 1024)} MB" if self.memory_limit else "available memory"
+            raise ParseFailed('oom', f"{limit} exceeded")
+        if status == 'error':
+            raise ValueError(payload)
+        return payload
+
+    def _death(self) -> ParseFailed:
+        """Explain why the worker process went away"""
+        self.process.join(1)
+        # The kernel OOM killer and RLIMIT_AS aborts both end in SIGKILL/SIGABRT
+        if self.process.exitcode in (-signal.SIGKILL, -signal.SIGABRT):
+            return ParseFailed('oom', f"worker killed by signal {-self.process.exitcode}")
+        return ParseFailed('crash', f"worker exited with code {self.process.exitcode}")
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class SandboxedParserPool:
+    """Pool of long-lived subprocesses that extract resume text under resource limits
+
+    Each job gets a wall-clock timeout, and each worker runs with an
+    RLIMIT_AS cap. A worker that times out, runs out of memory or crashes is
+    killed and replaced on the next job, so one pathological file cannot hang
+    or bloat the Django process.
+    """
+
+    def __init__(self, size: int, timeout: float, memory_limit_mb: Optional[int] = None):
+        self.size = size
+        self.timeout = timeout
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        # spawn keeps workers free of the parent's threads, locks and DB connections
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = queue.LifoQueue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self.restarts = 0
+        for _ in range(size):
+            self._idle.put(None)
+
+    def extract_text(self, file_path: str, file_type: str, max_pages: Optional[int] = None,
+                     max_chars: Optional[int] = None) -> Tuple[str, Optional[int], bool]:
+        """Run extraction.extract_text in a worker; raises ParseFailed on timeout, OOM or crash"""
+        try:
+            worker = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise ParseFailed('timeout', "no parser worker became available")
+
+        try:
+            if worker is None or not worker.is_alive():
+                worker = self._start_worker(replacing=worker)
+            return worker.run((file_path, file_type, max_pages, max_chars), self.timeout)
+        except ParseFailed:
+            self._discard(worker)
+            worker = None
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def shutdown(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    def _start_worker(self, replacing=None) -> _ParserWorker:
+        if replacing is not None:
+            self._discard(replacing)
+        worker = _ParserWorker(self._context, self.memory_limit)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _discard(self, worker):
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+                self.restarts += 1
+        worker.kill()
+
+    def stats(self) -> dict:
+        with self._lock:
+            alive = sum(1 for worker in self._workers if worker.is_alive())
+        return {'size': self.size, 'alive': alive, 'idle': self._idle.qsize(), 'restarts': self.restarts}
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_parser_pool() -> SandboxedParserPool:
+    """Return this process's parser pool, creating it on first use (and again after a fork)"""
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = SandboxedParserPool(
+                    size=settings.RESUME_PARSE_WORKERS,
+                    timeout=settings.RESUME_PARSE_TIMEOUT,
+                    memory_limit_mb=settings.RESUME_PARSE_MEMORY_LIMIT_MB,
+                )
+                _pool_pid = os.getpid()
+    return _pool
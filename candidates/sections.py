@@ -0,0 +1,162 @@
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+
+SECTION_HEADINGS = {
+    'summary': [
+        'summary', 'professional summary', 'career summary', 'executive summary', 'objective',
+        'career objective', 'profile', 'professional profile', 'about me', 'personal statement',
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'skill set', 'skillset',
+        'core competencies', 'competencies', 'technologies', 'technical expertise', 'tech stack',
+        'programming languages', 'tools and technologies', 'tools & technologies',
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'relevant experience',
+        'employment', 'employment history', 'work history', 'career history', 'internships',
+        'internship', 'internship experience',
+    ],
+    'education': [
+        'education', 'academic background', 'academics', 'qualifications',
+        'academic qualifications', 'educational qualifications', 'education and training',
+        'education & training',
+    ],
+    # Sections we do not extract from; they end the previous section
+    'other': [
+        'projects', 'personal projects', 'academic projects', 'certifications', 'certification', 'certificates',
+        'achievements', 'awards', 'honors', 'publications', 'languages', 'interests', 'hobbies',
+        'references', 'contact', 'contact information', 'personal details', 'personal information',
+        'volunteering', 'volunteer experience', 'activities', 'extracurricular activities',
+    ],
+}
+
+_HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+# PDF extraction often splits words ("W ORK\tEXPERIENCE"), so bare heading
+# lines are also compared with all whitespace and punctuation removed
+_SQUASHED_HEADINGS = {
+    re.sub(r'[\W_]+', '', heading): section for heading, section in _HEADING_TO_SECTION.items()
+}
+_SQUASH_PATTERN = re.compile(r'[\W_]+')
+
+# A heading is a line that starts with a known title, optionally followed by a
+# separator and inline content ("Skills: Python, Django")
+HEADING_PATTERN = re.compile(
+    r'^\s*(?:[#*•\-]\s*)?(?P<heading>'
+    + '|'.join(re.escape(heading) for heading in sorted(_HEADING_TO_SECTION, key=len, reverse=True))
+    + r')\s*(?:[:\-–|]\s*(?P<rest>.*))?$',
+    re.IGNORECASE
+)
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+# Only 19xx/20xx years count, so phone numbers, zip codes and ids are not taken for dates
+_YEAR = r'(?:19|20)\d{2}'
+_DATE = rf'\b(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s+{_YEAR}|\d{{1,2}}/{_YEAR}|{_YEAR})\b'
+DATE_RANGE_PATTERN = re.compile(
+    rf'(?P<start>{_DATE})\s*(?:-|–|—|\bto\b|\buntil\b)\s*'
+    rf'(?P<end>{_DATE}|\b(?:present|current|now|till date|to date|today)\b)',
+    re.IGNORECASE
+)
+# Longer spans are not a single job
+MAX_RANGE_YEARS = 50
+_DATE_PARTS_PATTERN = re.compile(r'(?:(?P<month_name>[a-z]{3})[a-z]*\.?,?\s+|(?P<month>\d{1,2})/)?(?P<year>\d{4})', re.IGNORECASE)
+
+
+def segment_resume(text: str) -> Dict[str, List[str]]:
+    """Split resume text into sections in a single pass over its lines
+
+    Returns non-empty stripped lines grouped under 'header' (everything
+    before the first heading), 'summary', 'skills', 'experience',
+    'education' and 'other'.
+    """
+    sections = {'header': [], 'summary': [], 'skills': [], 'experience': [], 'education': [], 'other': []}
+    current = 'header'
+
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        # Headings are short; skip the regex for ordinary prose lines
+        if len(line) < 120:
+            match = HEADING_PATTERN.match(line)
+            if match:
+                current = _HEADING_TO_SECTION[match.group('heading').lower()]
+                rest = (match.group('rest') or '').strip()
+                if rest:
+                    sections[current].append(rest)
+                continue
+
+            section = _SQUASHED_HEADINGS.get(_SQUASH_PATTERN.sub('', line).lower())
+            if section:
+                current = section
+                continue
+
+        sections[current].append(line)
+
+    return sections
+
+
+def parse_month(value: str, today: Optional[date] = None) -> Optional[Tuple[int, int]]:
+    """Parse a resume date ("Jan 2019", "03/2018", "2017", "Present") into (year, month)"""
+    value = value.strip().lower()
+    if value in ['present', 'current', 'now', 'till date', 'to date', 'today']:
+        today = today or date.today()
+        return today.year, today.month
+
+    match = _DATE_PARTS_PATTERN.search(value)
+    if not match:
+        return None
+    year = int(match.group('year'))
+    if match.group('month_name'):
+        month = MONTHS.get(match.group('month_name').lower()[:3], 1)
+    elif match.group('month'):
+        month = min(max(int(match.group('month')), 1), 12)
+    else:
+        month = 1
+    return year, month
+
+
+def find_date_range(line: str, today: Optional[date] = None):
+    """First plausible employment date range in a line, as (match, (start, end)), or (None, None)
+
+    Ranges must not start in the future, must not end before they start,
+    and must span at most MAX_RANGE_YEARS.
+    """
+    today = today or date.today()
+    for match in DATE_RANGE_PATTERN.finditer(line):
+        start = parse_month(match.group('start'), today)
+        end = parse_month(match.group('end'), today)
+        if not start or not end or start > end or end > (today.year, today.month):
+            continue
+        if months_between(start, end) > MAX_RANGE_YEARS * 12:
+            continue
+        return match, (start, end)
+    return None, None
+
+
+def months_between(start: Tuple[int, int], end: Tuple[int, int]) -> int:
+    return max(0, (end[0] - start[0]) * 12 + end[1] - start[1])
+
+
+def total_experience_months(ranges: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> int:
+    """Total months covered by date ranges, counting overlapping jobs once"""
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(ranges):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += months_between(current_start, current_end)
+            current_start, current_end = start, end
+        elif end > current_end:
+            current_end = end
+    if current_end is not None:
+        total += months_between(current_start, current_end)
+    return total
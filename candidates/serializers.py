@@ -8,11 +8,17 @@ class CandidateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Candidate
         fields = [
-            'id', 'name', 'email', 'phone', 'resume_file', 
+            'id', 'name', 'email', 'phone', 'resume_file', 'resume_hash',
             'experience_years', 'skills', 'education', 'work_experience', 
-            'summary', 'created_at', 'updated_at'
+            'summary', 'parse_status', 'parse_job_id', 'parse_error',
+            'parse_duration', 'resume_page_count', 'parsed_at', 'parser_version',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'resume_hash', 'parse_status', 'parse_job_id', 'parse_error',
+            'parse_duration', 'resume_page_count', 'parsed_at', 'parser_version',
+            'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
     
     def validate_phone(self, value):
         """Validate phone number is in E.164 format"""
@@ -38,21 +44,32 @@ class CandidateScoreSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+def validate_resume_upload(value):
+    """Validate resume file type and size"""
+    allowed_types = ['application/pdf', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
+    
+    if value.content_type not in allowed_types:
+        raise serializers.ValidationError(
+            "Only PDF and DOCX files are allowed"
+        )
+    
+    if value.size > 10 * 1024 * 1024:  # 10MB
+        raise serializers.ValidationError(
+            "File size cannot exceed 10MB"
+        )
+    
+    return value
+
+
 class ResumeUploadSerializer(serializers.Serializer):
     resume_file = serializers.FileField()
     
     def validate_resume_file(self, value):
         """Validate resume file type and size"""
-        allowed_types = ['application/pdf', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
-        
-        if value.content_type not in allowed_types:
-            raise serializers.ValidationError(
-                "Only PDF and DOCX files are allowed"
-            )
-        
-        if value.size > 10 * 1024 * 1024:  # 10MB
-            raise serializers.ValidationError(
-                "File size cannot exceed 10MB"
-            )
-        
-        return value
+        return validate_resume_upload(value)
+
+
+class BulkResumeUploadSerializer(serializers.Serializer):
+    # Individual files are validated in the view so that one bad file
+    # is reported without rejecting the whole batch
+    resume_files = serializers.ListField(child=serializers.FileField(), allow_empty=False)
@@ -1,8 +1,112 @@
-import PyPDF2
-from docx import Document
 import re
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional, Tuple
 import json
+import hashlib
+import logging
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from . import extraction
+from .models import ResumeParseCacheEntry
+from .sandbox import get_parser_pool
+from .sections import find_date_range, segment_resume, total_experience_months
+from .skill_matcher import get_skill_matcher
+
+logger = logging.getLogger(__name__)
+
+
+# Bump whenever extraction or parsing output changes; cached results from
+# other versions are then ignored
+PARSER_VERSION = 4
+
+
+SKILL_DELIMITER_PATTERN = re.compile(r'[,;|•\n]')
+
+EXPERIENCE_STATEMENT_PATTERN = re.compile(
+    r'(\d+)\+?\s*years?\s*(?:of\s*)?experience'
+    r'|experience[:\s]*(\d+)\+?\s*years?'
+    r'|(\d+)\+?\s*years?\s*in\s*(?:software|development|programming)',
+    re.IGNORECASE
+)
+
+DEGREE_PATTERN = re.compile(
+    r"\b(?P<degree>bachelor(?:'?s)?|master(?:'?s)?|ph\.?\s?d\.?|doctorate|mba|bca|mca|b\.?\s?tech|m\.?\s?tech"
+    r"|b\.e\.?|m\.e\.?|b\.?\s?sc?\.?|m\.?\s?sc?\.?|b\.a\.?|m\.a\.?|associate(?:'?s)?|diploma|degree)(?![a-z])"
+    r"[\s.]*(?:degree\s*)?(?:(?:of|in)\s+)?(?:science\s+(?:in\s+)?)?(?P<field>[^\n,|()]*)",
+    re.IGNORECASE
+)
+INSTITUTION_PATTERN = re.compile(
+    r'[^,|\n()]*\b(?:university|college|institute|school|academy|polytechnic)\b[^,|\n()]*',
+    re.IGNORECASE
+)
+
+TITLE_PATTERN = re.compile(
+    r'\b(?:engineer|developer|programmer|analyst|manager|lead|senior|junior|intern|internship|consultant'
+    r'|architect|designer|scientist|administrator|specialist|director|trainee)\b',
+    re.IGNORECASE
+)
+ENTRY_SEPARATOR_PATTERN = re.compile(r'\s+(?:at|@)\s+|\s*[|,–—]\s*|\s+-\s+')
+BULLET_PATTERN = re.compile(r'^[•\-*▪●◦]\s*')
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE_PATTERN = re.compile(r'\+?\d[\d\s().-]{7,}\d')
+
+
+def compute_file_hash(file_path: str) -> str:
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResumeParseCache:
+    """Content-addressed cache of extracted text and parsed resume data"""
+    
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """Return the cached result for a file hash, or None"""
+        return self.get_many([content_hash]).get(content_hash)
+    
+    def get_many(self, content_hashes: List[str]) -> Dict[str, Dict]:
+        """Return cached results for the given hashes in one query, keyed by hash"""
+        entries = ResumeParseCacheEntry.objects.filter(
+            content_hash__in=set(content_hashes), parser_version=PARSER_VERSION
+        )
+        results = {
+            entry.content_hash: {
+                'text': entry.extracted_text,
+                'parsed_data': entry.parsed_data,
+                'page_count': entry.page_count,
+            }
+            for entry in entries
+        }
+        if results:
+            entries.update(hit_count=F('hit_count') + 1, last_hit_at=timezone.now())
+        return results
+    
+    def set(self, content_hash: str, text: str, parsed_data: Dict, page_count: Optional[int]):
+        """Store a parse result for a file hash"""
+        self.set_many({content_hash: {'text': text, 'parsed_data': parsed_data, 'page_count': page_count}})
+    
+    def set_many(self, results: Dict[str, Dict]):
+        """Store parse results keyed by file hash, ignoring ones already cached"""
+        ResumeParseCacheEntry.objects.bulk_create([
+            ResumeParseCacheEntry(
+                content_hash=content_hash,
+                parser_version=PARSER_VERSION,
+                extracted_text=result['text'],
+                parsed_data=result['parsed_data'],
+                page_count=result['page_count'],
+            )
+            for content_hash, result in results.items()
+        ], ignore_conflicts=True)
+    
+    def purge_stale(self) -> int:
+        """Delete entries written by other parser versions; returns the number removed"""
+        deleted, _ = ResumeParseCacheEntry.objects.exclude(parser_version=PARSER_VERSION).delete()
+        return deleted
 
 
 class ResumeParserService:
@@ -12,191 +116,265 @@ class ResumeParserService:
         """Parse resume file and extract structured data"""
         
         try:
-            if file_type.lower() == 'pdf':
-                text = self._extract_pdf_text(file_path)
-            elif file_type.lower() in ['docx', 'doc']:
-                text = self._extract_docx_text(file_path)
-            else:
-                raise ValueError(f"Unsupported file type: {file_type}")
-            
-            return self._parse_resume_text(text)
+            return self.parse_resume_with_stats(file_path, file_type)['parsed_data']
             
         except Exception as e:
             print(f"Error parsing resume: {e}")
             return self._get_empty_resume_data()
     
-    def _extract_pdf_text(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        text = ""
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-        except Exception as e:
-            print(f"Error extracting PDF text: {e}")
-        return text
+    def parse_resume_with_stats(self, file_path: str, file_type: str, use_cache: bool = True,
+                                content_hash: Optional[str] = None) -> Dict:
+        """Parse resume file and report page count and parse duration
+        
+        Results are cached by the SHA-256 of the file bytes, so re-uploads of
+        the same file skip extraction. Pass content_hash when it was already
+        computed while saving the upload. Unlike parse_resume, extraction
+        errors are raised so that callers can record the failure reason.
+        """
+        started = time.monotonic()
+        cache = ResumeParseCache()
+        content_hash = content_hash or compute_file_hash(file_path)
+        
+        cached = cache.get(content_hash) if use_cache else None
+        if cached:
+            return dict(cached, content_hash=content_hash, cache_hit=True,
+                        duration=time.monotonic() - started)
+        
+        text, page_count = self.extract_text(file_path, file_type)
+        parsed_data = self._parse_resume_text(text)
+        if use_cache:
+            cache.set(content_hash, text, parsed_data, page_count)
+        
+        return {
+            'text': text,
+            'parsed_data': parsed_data,
+            'page_count': page_count,
+            'content_hash': content_hash,
+            'cache_hit': False,
+            'duration': time.monotonic() - started,
+        }
     
-    def _extract_docx_text(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
-        text = ""
-        try:
-            doc = Document(file_path)
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-        except Exception as e:
-            print(f"Error extracting DOCX text: {e}")
-        return text
+    def extract_text(self, file_path: str, file_type: str,
+                     sandboxed: Optional[bool] = None) -> Tuple[str, Optional[int]]:
+        """Extract plain text and page count (None when unknown) from a resume file
+        
+        Extraction stops early once the RESUME_MAX_PAGES / RESUME_MAX_CHARS
+        budget is used up, so very long documents parse in bounded time.
+        Unless disabled, it runs in a sandboxed worker subprocess
+        (RESUME_PARSE_SANDBOX) and raises ParseFailed on timeout or OOM.
+        """
+        if sandboxed is None:
+            sandboxed = settings.RESUME_PARSE_SANDBOX
+        extract = get_parser_pool().extract_text if sandboxed else extraction.extract_text
+        
+        text, page_count, truncated = extract(
+            file_path, file_type,
+            max_pages=settings.RESUME_MAX_PAGES,
+            max_chars=settings.RESUME_MAX_CHARS
+        )
+        if truncated:
+            logger.warning(f"Resume text truncated to the extraction budget: {file_path}")
+        return text, page_count
     
     def _parse_resume_text(self, text: str) -> Dict:
-        """Parse resume text and extract structured information"""
+        """Parse resume text and extract structured information
+        
+        The text is split into sections once, and each extractor only sees
+        the lines of its own section.
+        """
+        sections = segment_resume(text)
+        # Only the experience section: date-like numbers in the contact header are not jobs
+        work_experience, date_ranges = self._extract_work_experience(sections['experience'])
         
         parsed_data = {
-            'skills': self._extract_skills(text),
-            'experience_years': self._extract_experience_years(text),
-            'education': self._extract_education(text),
-            'work_experience': self._extract_work_experience(text),
-            'summary': self._extract_summary(text)
+            'skills': self._extract_skills(text, sections['skills']),
+            'experience_years': self._extract_experience_years(text, date_ranges),
+            'education': self._extract_education(sections['education'] or sections['header']),
+            'work_experience': work_experience[:5],  # Limit to 5 entries
+            'summary': self._extract_summary(sections)
         }
         
         return parsed_data
     
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract skills from resume text"""
+    def _extract_skills(self, text: str, skill_lines: List[str]) -> List[str]:
+        """Extract skills from the skills section plus taxonomy matches anywhere in the text"""
+        matcher = get_skill_matcher()
         skills = []
         
-        # Common technical skills patterns
-        skill_patterns = [
-            r'(?i)skills?[:\s]*([^\n]+)',
-            r'(?i)technologies?[:\s]*([^\n]+)',
-            r'(?i)programming languages?[:\s]*([^\n]+)',
-            r'(?i)technical skills?[:\s]*([^\n]+)'
-        ]
-        
-        # Common skills to look for
-        common_skills = [
-            'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'mongodb',
-            'aws', 'docker', 'kubernetes', 'git', 'agile', 'scrum', 'html', 'css',
-            'angular', 'vue.js', 'django', 'flask', 'spring', 'mysql', 'postgresql',
-            'redis', 'elasticsearch', 'jenkins', 'ci/cd', 'microservices', 'rest api'
-        ]
-        
-        text_lower = text.lower()
-        
-        # Extract from skill sections
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, text, re.MULTILINE)
-            for match in matches:
-                # Split by common delimiters
-                skill_items = re.split(r'[,;|•\n]', match)
-                for item in skill_items:
-                    item = item.strip()
-                    if len(item) > 1 and len(item) < 30:
-                        skills.append(item)
+        for line in skill_lines:
+            # Drop sub-headings such as "Languages: Python, Java"
+            if ':' in line:
+                line = line.split(':', 1)[1]
+            # Split by common delimiters
+            for item in SKILL_DELIMITER_PATTERN.split(line):
+                item = item.strip(' \t*-')
+                if len(item) > 1 and len(item) < 30:
+                    skills.append(matcher.canonicalize(item))
         
-        # Look for common skills in the entire text
-        for skill in common_skills:
-            if skill in text_lower:
-                skills.append(skill.title())
+        # Look for taxonomy skills in the entire text in a single pass
+        skills.extend(matcher.find_skills(text))
         
         # Remove duplicates and return
-        return list(set(skills))
+        return list(dict.fromkeys(skills))
     
-    def _extract_experience_years(self, text: str) -> int:
-        """Extract years of experience from resume"""
-        
-        # Patterns to find experience mentions
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'experience[:\s]*(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*years?\s*in\s*(?:software|development|programming)',
+    def _extract_experience_years(self, text: str, date_ranges: List[Tuple]) -> int:
+        """Years of experience from explicit statements or from the job date ranges"""
+        stated = [
+            int(next(group for group in match.groups() if group))
+            for match in EXPERIENCE_STATEMENT_PATTERN.finditer(text)
         ]
-        
-        years = []
-        text_lower = text.lower()
-        
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text_lower)
-            for match in matches:
-                try:
-                    years.append(int(match))
-                except ValueError:
-                    continue
+        computed = total_experience_months(date_ranges) // 12
         
         # Return the maximum years found, or 0 if none
-        return max(years) if years else 0
+        return max(stated + [computed])
     
-    def _extract_education(self, text: str) -> List[Dict]:
-        """Extract education information"""
+    def _extract_education(self, lines: List[str]) -> List[Dict]:
+        """Extract degrees, fields and institutions from the education section"""
         education = []
+        pending_institution = ''
         
-        # Look for degree patterns
-        degree_patterns = [
-            r'(?i)(bachelor|master|phd|doctorate|b\.?s\.?|m\.?s\.?|b\.?a\.?|m\.?a\.?)\s*(?:of\s*)?(?:science\s*)?(?:in\s*)?([^\n,]+)',
-            r'(?i)(degree)\s*in\s*([^\n,]+)',
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
+        for line in lines:
+            institution_match = INSTITUTION_PATTERN.search(line)
+            institution = institution_match.group().strip(' -–') if institution_match else ''
+            degree_match = DEGREE_PATTERN.search(line)
+            
+            if degree_match:
+                field = degree_match.group('field').strip(' -–.:')
+                if institution and institution in field:
+                    field = field.replace(institution, '').strip(' -–.:')
                 education.append({
-                    'degree': match[0].strip(),
-                    'field': match[1].strip() if len(match) > 1 else '',
-                    'institution': ''  # Could be enhanced to extract institution
+                    'degree': degree_match.group('degree').strip(),
+                    'field': field,
+                    'institution': institution or pending_institution
                 })
+                pending_institution = ''
+            elif institution:
+                # Institutions are listed either right after or right before the degree
+                if education and not education[-1]['institution']:
+                    education[-1]['institution'] = institution
+                else:
+                    pending_institution = institution
         
         return education
     
-    def _extract_work_experience(self, text: str) -> List[Dict]:
-        """Extract work experience information"""
-        experience = []
+    def _extract_work_experience(self, lines: List[str]) -> Tuple[List[Dict], List[Tuple]]:
+        """Extract jobs from the experience section
         
-        # Look for job title patterns
-        title_patterns = [
-            r'(?i)(software engineer|developer|programmer|analyst|manager|lead|senior|junior)\s*[^\n]*',
-            r'(?i)(intern|internship)\s*[^\n]*',
-        ]
+        Each line with a date range starts a job. Title and company come from
+        the rest of that line, or from the lines just above it; bullet lines
+        become the description. Returns the jobs and their parsed date ranges.
+        """
+        experience = []
+        date_ranges = []
+        pending = []
+        current = None
         
-        for pattern in title_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                if isinstance(match, tuple):
-                    match = ' '.join(match)
+        for line in lines:
+            range_match, date_range = find_date_range(line)
+            
+            if range_match:
+                remainder = f"{line[:range_match.start()]} {line[range_match.end():]}"
+                parts = [
+                    part.strip(' ()[]') for part in ENTRY_SEPARATOR_PATTERN.split(remainder)
+                    if part.strip(' ()[]')
+                ]
+                if not parts:
+                    parts, pending = pending[-2:], pending[:-2]
+                if current is not None and pending:
+                    current['description'] = ' '.join([current['description']] + pending).strip()
+                pending = []
                 
-                experience.append({
-                    'title': match.strip(),
-                    'company': '',  # Could be enhanced
-                    'duration': '',  # Could be enhanced
+                title, company = self._split_title_company(parts)
+                current = {
+                    'title': title,
+                    'company': company,
+                    'duration': range_match.group().strip(),
                     'description': ''
-                })
+                }
+                experience.append(current)
+                
+                date_ranges.append(date_range)
+            
+            elif BULLET_PATTERN.match(line) and current is not None:
+                current['description'] = f"{current['description']} {BULLET_PATTERN.sub('', line)}".strip()
+            
+            elif current is not None and not current['title'] and len(line) < 60 and TITLE_PATTERN.search(line):
+                current['title'] = line
+            
+            else:
+                pending.append(line)
+        
+        if current is not None and pending:
+            current['description'] = ' '.join([current['description']] + pending).strip()
         
-        return experience[:5]  # Limit to 5 entries
+        if not experience:
+            # No dated jobs: fall back to lines that mention a job title
+            for line in lines:
+                title_match = TITLE_PATTERN.search(line)
+                if title_match:
+                    experience.append({
+                        'title': line[title_match.start():].strip(),
+                        'company': '',
+                        'duration': '',
+                        'description': ''
+                    })
+        
+        for job in experience:
+            job['description'] = job['description'][:500]
+        
+        return experience, date_ranges
     
-    def _extract_summary(self, text: str) -> str:
-        """Extract or generate a summary from resume"""
+    def _split_title_company(self, parts: List[str]) -> Tuple[str, str]:
+        """Tell the job title from the company name among the parts of an entry header"""
+        if not parts:
+            return '', ''
         
-        # Look for summary/objective sections
-        summary_patterns = [
-            r'(?i)(?:summary|objective|profile)[:\s]*([^\n]+(?:\n[^\n]+)*?)(?:\n\s*\n|\n[A-Z])',
-            r'(?i)(?:about me|personal statement)[:\s]*([^\n]+(?:\n[^\n]+)*?)(?:\n\s*\n|\n[A-Z])',
-        ]
+        for index, part in enumerate(parts):
+            if TITLE_PATTERN.search(part):
+                others = parts[:index] + parts[index + 1:]
+                return part, others[0] if others else ''
         
-        for pattern in summary_patterns:
-            match = re.search(pattern, text, re.MULTILINE)
-            if match:
-                summary = match.group(1).strip()
-                if len(summary) > 50:  # Only return if substantial
-                    return summary
+        return parts[0], parts[1] if len(parts) > 1 else ''
+    
+    def _extract_summary(self, sections: Dict[str, List[str]]) -> str:
+        """Extract or generate a summary from resume"""
         
-        # If no summary found, create a basic one from first few lines
-        lines = text.split('\n')[:5]
-        non_empty_lines = [line.strip() for line in lines if line.strip()]
+        summary = ' '.join(sections['summary'])
+        if len(summary) > 50:  # Only return if substantial
+            return summary
         
-        if non_empty_lines:
-            return ' '.join(non_empty_lines[:2])
+        # If no summary found, create a basic one from first few lines
+        for key in ['header', 'experience', 'other']:
+            if sections[key]:
+                return ' '.join(sections[key][:2])
         
         return "No summary available"
     
+    def extract_contact_info(self, text: str) -> Dict:
+        """Extract candidate name, email and E.164 phone number from resume text"""
+        email_match = EMAIL_PATTERN.search(text)
+        email = email_match.group().lower() if email_match else ''
+        
+        phone = ''
+        for match in PHONE_PATTERN.finditer(text):
+            digits = re.sub(r'\D', '', match.group())
+            # Only numbers written with a country code can be stored as E.164
+            if match.group().startswith('+') and 8 <= len(digits) <= 15:
+                phone = f"+{digits}"
+                break
+        
+        # The name is usually the first short line without contact details
+        name = ''
+        for line in text.split('\n')[:5]:
+            line = line.strip()
+            if line and len(line.split()) <= 5 and not re.search(r'[\d@]', line):
+                name = line
+                break
+        if not name and email:
+            name = email.split('@')[0]
+        
+        return {'name': name[:200], 'email': email, 'phone': phone}
+    
     def _get_empty_resume_data(self) -> Dict:
         """Return empty resume data structure"""
         return {
@@ -0,0 +1,147 @@
+import json
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Synonyms that are everyday words or file extensions ("each node of the
+# tree", "setup.py"); they only count as items of a skills list
+CONTEXT_ONLY_SYNONYMS = ('node', 'ts', 'py', 'tailwind')
+
+
+def _normalize(text: str) -> str:
+    """Lowercase text and collapse whitespace runs so multi-word terms match"""
+    return _WHITESPACE_RE.sub(' ', text.lower())
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _continues_token(text: str, index: int, step: int) -> bool:
+    """Whether text[index], next to a match on the side given by step, is part of the same word
+
+    Dotted names count as one word, so neither ".net" nor "js" match
+    inside "asp.net" or "node.js".
+    """
+    if not 0 <= index < len(text):
+        return False
+    if _is_word_char(text[index]):
+        return True
+    beyond = index + step
+    return text[index] == '.' and 0 <= beyond < len(text) and _is_word_char(text[beyond])
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton that finds taxonomy skills in a single pass
+
+    The taxonomy maps a canonical skill name to a list of synonyms, e.g.
+    ``{"JavaScript": ["js", "ecmascript"]}``. The canonical name itself is
+    always matched as well. Matches only count on word boundaries, so "java"
+    is not reported inside "javascript". Synonyms in context_only are left
+    out of the automaton and only recognized by canonicalize, i.e. as items
+    of a skills list.
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]], context_only: Iterable[str] = ()):
+        # Node 0 is the root. Each node has a transition dict, a failure link
+        # and the canonical names of the terms ending at that node.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[tuple]] = [[]]
+        self._terms: Dict[str, str] = {}
+        context_only = {_normalize(term).strip() for term in context_only}
+
+        for canonical, synonyms in taxonomy.items():
+            for term in [canonical] + list(synonyms or []):
+                term = _normalize(term).strip()
+                if term:
+                    self._terms[term] = canonical
+                    if term not in context_only or term == _normalize(canonical).strip():
+                        self._add_term(term, canonical)
+
+        self._build_failure_links()
+
+    @property
+    def size(self) -> int:
+        """Number of distinct terms (canonical names and synonyms) in the automaton"""
+        return len(self._terms)
+
+    def _add_term(self, term: str, canonical: str):
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._output[node].append((len(term), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[child] = candidate if candidate != child else 0
+                self._output[child].extend(self._output[self._fail[child]])
+
+    def find_skills(self, text: str) -> List[str]:
+        """Return canonical names of all skills in text, in order of first appearance"""
+        text = _normalize(text)
+        goto, fail, output = self._goto, self._fail, self._output
+        found = {}
+        node = 0
+
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not output[node]:
+                continue
+
+            # Terms ending in punctuation ("c++") may be followed by a version number
+            if _is_word_char(char) and _continues_token(text, index + 1, 1):
+                continue
+            for length, canonical in output[node]:
+                if _continues_token(text, index - length, -1):
+                    continue
+                found.setdefault(canonical, None)
+
+        return list(found)
+
+    def canonicalize(self, term: str) -> str:
+        """Return the canonical name for an exact taxonomy term, or the term unchanged"""
+        return self._terms.get(_normalize(term).strip(), term)
+
+    @classmethod
+    def from_file(cls, path: str, context_only: Iterable[str] = ()) -> 'SkillMatcher':
+        """Build a matcher from a JSON taxonomy file"""
+        with open(path, 'r', encoding='utf-8') as taxonomy_file:
+            return cls(json.load(taxonomy_file), context_only)
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Return the process-wide matcher, compiling the taxonomy on first use"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher.from_file(settings.SKILL_TAXONOMY_PATH, CONTEXT_ONLY_SYNONYMS)
+    return _matcher
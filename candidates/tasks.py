@@ -0,0 +1,107 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from .models import Candidate, ResumeIngestionJob
+from .services import PARSER_VERSION, ResumeParserService
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def apply_parsed_data(candidate, parsed_data):
+    """Copy structured resume data onto a candidate without saving it"""
+    candidate.experience_years = parsed_data.get('experience_years', 0)
+    candidate.skills = parsed_data.get('skills', [])
+    candidate.education = parsed_data.get('education', [])
+    candidate.work_experience = parsed_data.get('work_experience', [])
+    candidate.summary = parsed_data.get('summary', '')
+
+
+def run_resume_parse(candidate):
+    """Parse the candidate's stored resume and record the outcome on the candidate
+
+    Returns the parsed data, or None if parsing failed.
+    """
+    candidate.parse_status = 'processing'
+    candidate.parse_error = ''
+    candidate.save(update_fields=['parse_status', 'parse_error', 'updated_at'])
+
+    started = time.monotonic()
+    try:
+        full_path = default_storage.path(candidate.resume_file.name)
+        file_extension = os.path.splitext(candidate.resume_file.name)[1][1:]  # Remove the dot
+        result = ResumeParserService().parse_resume_with_stats(
+            full_path, file_extension, content_hash=candidate.resume_hash or None
+        )
+    except Exception as e:
+        logger.error(f"Error parsing resume for candidate {candidate.id}: {e}")
+        candidate.parse_status = 'failed'
+        candidate.parse_error = str(e) or e.__class__.__name__
+        candidate.parse_duration = time.monotonic() - started
+        candidate.resume_page_count = None
+        candidate.parsed_at = timezone.now()
+        candidate.save()
+        return None
+
+    apply_parsed_data(candidate, result['parsed_data'])
+    candidate.resume_text = result['text']
+    candidate.parser_version = PARSER_VERSION
+    candidate.parse_status = 'completed'
+    candidate.parse_duration = time.monotonic() - started
+    candidate.resume_page_count = result['page_count']
+    candidate.parsed_at = timezone.now()
+    candidate.save()
+    return result['parsed_data']
+
+
+@shared_task
+def parse_resume_async(candidate_id):
+    """Parse an uploaded resume outside the request cycle"""
+    try:
+        candidate = Candidate.objects.get(id=candidate_id)
+    except Candidate.DoesNotExist:
+        logger.error(f"Candidate {candidate_id} not found for resume parsing")
+        return False
+
+    parsed_data = run_resume_parse(candidate)
+    logger.info(f"Resume for candidate {candidate_id} parsed with status {candidate.parse_status}")
+    return parsed_data is not None
+
+
+@shared_task
+def ingest_resumes_async(job_id):
+    """Ingest the resumes of a bulk upload and store the report on its job"""
+    # Imported here because the ingestion module imports apply_parsed_data from this one
+    from .ingestion import ResumeIngestionService
+
+    try:
+        job = ResumeIngestionJob.objects.get(id=job_id)
+    except ResumeIngestionJob.DoesNotExist:
+        logger.error(f"Resume ingestion job {job_id} not found")
+        return False
+
+    job.status = 'processing'
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+
+    try:
+        report = ResumeIngestionService(max_workers=settings.RESUME_INGEST_WORKERS).ingest(job.file_names)
+    except Exception as e:
+        logger.error(f"Error ingesting resumes for job {job_id}: {e}")
+        job.status = 'failed'
+        job.error = str(e) or e.__class__.__name__
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        return False
+
+    report['total'] += len(job.rejected)
+    report['failed'] += len(job.rejected)
+    report['errors'] = job.rejected + report['errors']
+    job.report = report
+    job.status = 'completed'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['report', 'status', 'finished_at'])
+    return True
@@ -1,3 +1,536 @@
-from django.test import TestCase
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+import docx
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.core.files.storage import FileSystemStorage, Storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from . import extraction
+from .corpus import LINES_PER_PAGE, generate_corpus, write_docx, write_pdf
+from .ingestion import ResumeIngestionService
+from .models import Candidate, ResumeParseCacheEntry
+from .reparse import ResumeReparseService
+from .sandbox import ParseFailed, SandboxedParserPool
+from .sections import DATE_RANGE_PATTERN, find_date_range, segment_resume, total_experience_months
+from .services import PARSER_VERSION, ResumeParseCache, ResumeParserService
+from .skill_matcher import SkillMatcher
+from .tasks import parse_resume_async
+from .uploads import save_upload
+
+
+class SkillMatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.matcher = SkillMatcher({
+            'JavaScript': ['js', 'ecmascript'],
+            'Java': [],
+            'Machine Learning': ['ml'],
+            'C++': ['cpp'],
+            'Go': ['golang'],
+        })
+
+    def test_finds_canonical_names_and_synonyms_in_order_of_appearance(self):
+        skills = self.matcher.find_skills("Built ML pipelines in Java and ECMAScript")
+        self.assertEqual(skills, ['Machine Learning', 'Java', 'JavaScript'])
+
+    def test_reports_each_skill_once(self):
+        self.assertEqual(self.matcher.find_skills("js, JavaScript and more js"), ['JavaScript'])
+
+    def test_matches_only_on_word_boundaries(self):
+        self.assertEqual(self.matcher.find_skills("javascript"), ['JavaScript'])
+        self.assertEqual(self.matcher.find_skills("Going to jsonify htmlx"), [])
+
+    def test_multi_word_terms_match_across_whitespace_runs(self):
+        self.assertEqual(self.matcher.find_skills("machine\n  learning"), ['Machine Learning'])
+
+    def test_terms_ending_in_punctuation(self):
+        self.assertEqual(self.matcher.find_skills("C++, golang"), ['C++', 'Go'])
+
+    def test_overlapping_terms(self):
+        matcher = SkillMatcher({'Spring': [], 'Spring Boot': [], 'Boot': []})
+        self.assertEqual(matcher.find_skills("spring boot"), ['Spring', 'Spring Boot', 'Boot'])
+
+    def test_canonicalize(self):
+        self.assertEqual(self.matcher.canonicalize(' JS '), 'JavaScript')
+        self.assertEqual(self.matcher.canonicalize('Rust'), 'Rust')
+
+    def test_size_counts_distinct_terms(self):
+        self.assertEqual(self.matcher.size, 10)
+
+    def test_terms_do_not_match_inside_dotted_names(self):
+        matcher = SkillMatcher({'.NET': ['asp.net'], 'JavaScript': ['js'], 'Node.js': []})
+        self.assertEqual(matcher.find_skills("jane@mail.net, vb.net"), [])
+        self.assertEqual(matcher.find_skills("Node.js services"), ['Node.js'])
+        self.assertEqual(matcher.find_skills("ASP.NET and .NET Core, js."), ['.NET', 'JavaScript'])
+
+    def test_context_only_synonyms_are_not_found_in_prose(self):
+        matcher = SkillMatcher(
+            {'Node.js': ['node', 'nodejs'], 'TypeScript': ['ts'], 'Python': ['py']}, context_only=['node', 'ts', 'py']
+        )
+        self.assertEqual(matcher.find_skills("Balanced each node of the tree; ts and setup.py files"), [])
+        self.assertEqual(matcher.find_skills("NodeJS, TypeScript and Python"), ['Node.js', 'TypeScript', 'Python'])
+        self.assertEqual(matcher.canonicalize('Node'), 'Node.js')
+        self.assertEqual(matcher.size, 7)
+
+    def test_context_only_synonyms_still_count_in_the_skills_section(self):
+        parsed = ResumeParserService()._parse_resume_text(
+            "Jane Doe\nBuilt a graph database node by node in setup.py\n\nSkills\nNode, TS, Py"
+        )
+        self.assertEqual(parsed['skills'], ['Node.js', 'TypeScript', 'Python'])
+
+
+class SegmentResumeTests(SimpleTestCase):
+    def test_groups_lines_under_headings(self):
+        sections = segment_resume(
+            "Jane Doe\njane@example.com\n\nSUMMARY\nBackend engineer\n"
+            "Technical Skills: Python, Django\nWork Experience\nEngineer, Acme 2019 - 2021\n"
+            "Projects\nA side project\nEducation\nB.Sc. Physics"
+        )
+        self.assertEqual(sections['header'], ['Jane Doe', 'jane@example.com'])
+        self.assertEqual(sections['summary'], ['Backend engineer'])
+        self.assertEqual(sections['skills'], ['Python, Django'])
+        self.assertEqual(sections['experience'], ['Engineer, Acme 2019 - 2021'])
+        self.assertEqual(sections['other'], ['A side project'])
+        self.assertEqual(sections['education'], ['B.Sc. Physics'])
+
+    def test_headings_split_by_pdf_extraction(self):
+        sections = segment_resume("W ORK\tEXPERIENCE\nEngineer at Acme")
+        self.assertEqual(sections['experience'], ['Engineer at Acme'])
+
+    def test_prose_mentioning_a_heading_is_not_a_heading(self):
+        sections = segment_resume("Experience\nExperience with large teams and skills in Go")
+        self.assertEqual(sections['experience'], ['Experience with large teams and skills in Go'])
+
+
+class DateRangeTests(SimpleTestCase):
+    today = date(2024, 6, 1)
+
+    def test_date_range_formats(self):
+        for line, expected in [
+            ("Jan 2019 - Mar 2021", ((2019, 1), (2021, 3))),
+            ("September, 2018 to present", ((2018, 9), (2024, 6))),
+            ("03/2016 – 12/2018", ((2016, 3), (2018, 12))),
+            ("2012—2016", ((2012, 1), (2016, 1))),
+        ]:
+            with self.subTest(line=line):
+                match, date_range = find_date_range(line, today=self.today)
+                self.assertIsNotNone(match)
+                self.assertEqual(date_range, expected)
+
+    def test_phone_numbers_are_not_date_ranges(self):
+        for line in ["Tel: 2345-6789", "+91 98765-43210", "Phone: 555-1234", "ZIP 90210-1234"]:
+            with self.subTest(line=line):
+                self.assertIsNone(DATE_RANGE_PATTERN.search(line))
+                self.assertEqual(find_date_range(line, today=self.today), (None, None))
+
+    def test_implausible_ranges_are_rejected(self):
+        for line in ["2021 - 2019", "2023 - 2026", "1950 - 2020"]:
+            with self.subTest(line=line):
+                self.assertEqual(find_date_range(line, today=self.today), (None, None))
+
+    def test_skips_to_the_first_plausible_range(self):
+        match, date_range = find_date_range("2021 - 2019 then 2015 - 2017", today=self.today)
+        self.assertEqual(match.group(), '2015 - 2017')
+        self.assertEqual(date_range, ((2015, 1), (2017, 1)))
+
+    def test_overlapping_ranges_count_once(self):
+        ranges = [((2018, 1), (2020, 1)), ((2019, 1), (2021, 1)), ((2022, 1), (2022, 7))]
+        self.assertEqual(total_experience_months(ranges), 36 + 6)
+
+
+class ResumeTextParsingTests(SimpleTestCase):
+    def test_phone_number_in_header_is_not_a_job(self):
+        parsed = ResumeParserService()._parse_resume_text(
+            "Jane Doe\nTel: 2345-6789\n3 years of experience in Python\n\nEducation\nB.Sc. Physics"
+        )
+        self.assertEqual(parsed['work_experience'], [])
+        self.assertEqual(parsed['experience_years'], 3)
+
+    def test_jobs_come_from_the_experience_section(self):
+        parsed = ResumeParserService()._parse_resume_text(
+            "Jane Doe\n\nExperience\nSenior Engineer, Acme Corp  Jan 2019 - Mar 2021\n- Built APIs\n"
+            "Engineer at Initech (03/2016 - 12/2018)"
+        )
+        self.assertEqual(parsed['work_experience'], [
+            {'title': 'Senior Engineer', 'company': 'Acme Corp', 'duration': 'Jan 2019 - Mar 2021',
+             'description': 'Built APIs'},
+            {'title': 'Engineer', 'company': 'Initech', 'duration': '03/2016 - 12/2018', 'description': ''},
+        ])
+        self.assertEqual(parsed['experience_years'], 4)
+
+
+class ResumeIngestionTests(SimpleTestCase):
+    @mock.patch('candidates.ingestion.ResumeParserService.extract_text', return_value=('Jane Doe', 1))
+    def test_parsing_in_process_goes_through_the_sandbox(self, extract_text):
+        for workers, paths in [(1, ['/tmp/a.pdf', '/tmp/b.pdf']), (4, ['/tmp/a.pdf'])]:
+            with self.subTest(workers=workers):
+                extract_text.reset_mock()
+                ResumeIngestionService(max_workers=workers)._run_parsers(paths)
+                self.assertEqual(extract_text.call_count, len(paths))
+                for call in extract_text.call_args_list:
+                    self.assertIsNone(call.kwargs['sandboxed'])
+
+
+class SaveIngestedCandidatesTests(TestCase):
+    def parsed(self, email, phone):
+        return ('resumes/cv.pdf', {
+            'contact': {'name': 'Jane Doe', 'email': email, 'phone': phone},
+            'content_hash': 'a' * 64, 'text': 'Jane Doe', 'parsed_data': {'skills': ['Python']},
+            'duration': 0.1, 'page_count': 1,
+        })
+
+    def test_updates_the_candidate_with_the_same_email_and_phone(self):
+        Candidate.objects.create(name='Jane', email='jane@example.com', phone='+15550000001')
+        second = Candidate.objects.create(name='Jane', email='jane@example.com', phone='+15550000002')
+
+        created, updated, errors = ResumeIngestionService()._save_candidates(
+            [self.parsed('jane@example.com', '+15550000002')]
+        )
+        self.assertEqual((created, updated, errors), (0, 1, []))
+        second.refresh_from_db()
+        self.assertEqual(second.skills, ['Python'])
+
+    def test_creates_and_updates_by_email(self):
+        existing = Candidate.objects.create(name='Jane', email='jane@example.com', phone='+15550000001')
+        created, updated, errors = ResumeIngestionService()._save_candidates([
+            self.parsed('jane@example.com', '+15550000009'),
+            self.parsed('john@example.com', ''),
+        ])
+        self.assertEqual((created, updated, errors), (1, 1, []))
+        existing.refresh_from_db()
+        self.assertEqual(existing.phone, '+15550000009')
+
+
+class ReadingStorage(Storage):
+    """Storage that reads uploads with read() like S3's upload_fileobj, rereading the start first"""
+
+    def __init__(self):
+        self.saved = {}
+
+    def _save(self, name, content):
+        content.read(10)
+        content.seek(0)
+        data = b''
+        while True:
+            block = content.read(7)
+            if not block:
+                break
+            data += block
+        self.saved[name] = data
+        return name
+
+    def exists(self, name):
+        return name in self.saved
+
+
+class SaveUploadTests(SimpleTestCase):
+    data = b'%PDF-1.4 resume bytes ' * 1000
+
+    def upload(self):
+        return SimpleUploadedFile('cv.pdf', self.data, content_type='application/pdf')
+
+    def test_digest_covers_uploads_saved_in_chunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name, digest = save_upload(self.upload(), 'resumes/cv.pdf', FileSystemStorage(location=directory))
+        self.assertEqual(name, 'resumes/cv.pdf')
+        self.assertEqual(digest, hashlib.sha256(self.data).hexdigest())
+
+    def test_digest_covers_uploads_saved_through_read(self):
+        storage = ReadingStorage()
+        name, digest = save_upload(self.upload(), 'resumes/cv.pdf', storage)
+        self.assertEqual(storage.saved[name], self.data)
+        self.assertEqual(digest, hashlib.sha256(self.data).hexdigest())
+
+    def test_digest_covers_bytes_storage_never_read(self):
+        storage = mock.Mock(save=mock.Mock(side_effect=lambda name, content: content.read(5) and name))
+        _, digest = save_upload(ContentFile(self.data, name='cv.pdf'), 'resumes/cv.pdf', storage)
+        self.assertEqual(digest, hashlib.sha256(self.data).hexdigest())
+
+
+class ResumeUploadTests(TestCase):
+    text = "Jane Doe\njane@example.com\n\nSkills\nPython, Django\n\nExperience\nEngineer at Acme  2019 - 2021"
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.candidate = Candidate.objects.create(name='Jane Doe', email='jane@example.com', phone='+15550000001')
+
+    def upload(self, query=''):
+        return self.client.post(f'/api/candidates/{self.candidate.id}/upload-resume/{query}', {
+            'resume_file': SimpleUploadedFile('cv.pdf', b'%PDF-1.4 resume', content_type='application/pdf'),
+        })
+
+    @mock.patch('candidates.views.parse_resume_async')
+    def test_async_upload_answers_202_and_queues_the_parse_job(self, parse_task):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload('?async=true')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'queued')
+        parse_task.apply_async.assert_called_once_with(
+            args=[str(self.candidate.id)], task_id=response.data['job_id']
+        )
+        status = self.client.get(f'/api/candidates/{self.candidate.id}/parse-status/').json()
+        self.assertEqual((status['status'], status['job_id']), ('queued', response.data['job_id']))
+
+    @mock.patch('candidates.services.ResumeParserService.extract_text')
+    def test_parse_status_reports_the_result_of_the_parse_job(self, extract_text):
+        extract_text.return_value = (self.text, 1)
+        with mock.patch('candidates.views.parse_resume_async'), self.captureOnCommitCallbacks(execute=True):
+            self.upload('?async=true')
+        self.assertTrue(parse_resume_async(str(self.candidate.id)))
+
+        status = self.client.get(f'/api/candidates/{self.candidate.id}/parse-status/').json()
+        self.assertEqual((status['status'], status['page_count']), ('completed', 1))
+        self.assertEqual(status['parsed_data']['skills'], ['Python', 'Django'])
+
+    @mock.patch('candidates.services.ResumeParserService.extract_text', side_effect=ParseFailed('timeout', '30s'))
+    def test_upload_that_cannot_be_parsed_answers_422(self, extract_text):
+        response = self.upload()
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.data['parse_error'], 'parse_failed: timeout (30s)')
+        self.candidate.refresh_from_db()
+        self.assertEqual(self.candidate.parse_status, 'failed')
+
+
+@mock.patch('candidates.services.ResumeParserService.extract_text', return_value=('Jane Doe\nSkills\nPython', 2))
+class ResumeParseCacheTests(TestCase):
+    def setUp(self):
+        resume = tempfile.NamedTemporaryFile(suffix='.pdf')
+        resume.write(b'%PDF-1.4 resume')
+        resume.flush()
+        self.addCleanup(resume.close)
+        self.path = resume.name
+
+    def test_same_file_is_extracted_once(self, extract_text):
+        first = ResumeParserService().parse_resume_with_stats(self.path, 'pdf')
+        second = ResumeParserService().parse_resume_with_stats(self.path, 'pdf')
+
+        self.assertEqual(extract_text.call_count, 1)
+        self.assertEqual((first['cache_hit'], second['cache_hit']), (False, True))
+        self.assertEqual(second['content_hash'], hashlib.sha256(b'%PDF-1.4 resume').hexdigest())
+        self.assertEqual((second['parsed_data'], second['page_count']), (first['parsed_data'], 2))
+        self.assertEqual(ResumeParseCacheEntry.objects.get().hit_count, 1)
+
+    def test_results_of_other_parser_versions_are_ignored_and_purged(self, extract_text):
+        with mock.patch('candidates.services.PARSER_VERSION', 1):
+            ResumeParserService().parse_resume_with_stats(self.path, 'pdf')
+        result = ResumeParserService().parse_resume_with_stats(self.path, 'pdf')
+
+        self.assertFalse(result['cache_hit'])
+        self.assertEqual(extract_text.call_count, 2)
+        self.assertEqual(ResumeParseCache().purge_stale(), 1)
+        self.assertEqual(ResumeParseCacheEntry.objects.count(), 1)
+
+    def test_use_cache_false_skips_the_cache(self, extract_text):
+        ResumeParserService().parse_resume_with_stats(self.path, 'pdf', use_cache=False)
+        ResumeParserService().parse_resume_with_stats(self.path, 'pdf', use_cache=False)
+        self.assertEqual(extract_text.call_count, 2)
+        self.assertFalse(ResumeParseCacheEntry.objects.exists())
+
+
+class ExtractTextTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        # Five pages, each line naming its page
+        self.lines = [f"Page {index // LINES_PER_PAGE + 1} line {index}" for index in range(5 * LINES_PER_PAGE)]
+
+    def path(self, name):
+        return f"{self.directory}/{name}"
+
+    def test_pdf_extraction_stops_at_the_page_budget(self):
+        write_pdf(self.path('cv.pdf'), self.lines)
+        text, page_count, truncated = extraction.extract_text(self.path('cv.pdf'), 'pdf', max_pages=2)
+
+        self.assertEqual((page_count, truncated), (5, True))
+        self.assertIn('Page 2 line', text)
+        self.assertNotIn('Page 3 line', text)
+
+    def test_pdf_within_budget_is_extracted_whole(self):
+        write_pdf(self.path('cv.pdf'), self.lines[:10])
+        text, page_count, truncated = extraction.extract_text(self.path('cv.pdf'), 'PDF', max_pages=2)
+        self.assertEqual((page_count, truncated), (1, False))
+        self.assertEqual(text.splitlines(), self.lines[:10])
+
+    def test_docx_extraction_stops_at_the_character_budget(self):
+        write_docx(self.path('cv.docx'), self.lines)
+        text, _, truncated = extraction.extract_text(self.path('cv.docx'), 'docx', max_chars=100)
+
+        self.assertTrue(truncated)
+        self.assertEqual(len(text), 100)
+        self.assertTrue(text.startswith('Page 1 line 0\nPage 1 line 1\n'))
+
+    def test_docx_tables_become_one_line_per_row(self):
+        document = docx.Document()
+        document.add_paragraph('Technical Skills')
+        table = document.add_table(rows=2, cols=2)
+        for row, cells in zip(table.rows, [('Languages', 'Python, Go'), ('Databases', '')]):
+            for cell, value in zip(row.cells, cells):
+                cell.text = value
+        document.add_paragraph('Experience')
+        document.save(self.path('cv.docx'))
+
+        text, _, truncated = extraction.extract_text(self.path('cv.docx'), 'docx')
+        self.assertFalse(truncated)
+        self.assertEqual(text, 'Technical Skills\nLanguages | Python, Go\nDatabases\nExperience')
+
+    def test_unsupported_file_type(self):
+        with self.assertRaises(ValueError):
+            extraction.extract_text(self.path('cv.txt'), 'txt')
+
+
+class SandboxedParserPoolTests(SimpleTestCase):
+    """Jobs run in real worker subprocesses"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.pool = SandboxedParserPool(size=1, timeout=5, memory_limit_mb=96)
+        self.addCleanup(self.pool.shutdown)
+
+    def resume(self):
+        path = os.path.join(self.directory, 'cv.docx')
+        write_docx(path, ['Jane Doe', 'Skills', 'Python'])
+        return path
+
+    def test_extracts_text_in_a_worker(self):
+        self.assertEqual(self.pool.extract_text(self.resume(), 'docx'), ('Jane Doe\nSkills\nPython', 1, False))
+        self.assertEqual(self.pool.stats()['alive'], 1)
+
+    def test_extraction_errors_are_raised_and_keep_the_worker(self):
+        with self.assertRaisesMessage(ValueError, 'Unsupported file type: txt'):
+            self.pool.extract_text(self.resume(), 'txt')
+        self.pool.extract_text(self.resume(), 'docx')
+        self.assertEqual(self.pool.stats()['restarts'], 0)
+
+    def test_hanging_worker_is_killed_and_replaced(self):
+        self.pool.timeout = 1
+        # Opening a FIFO blocks until a writer shows up, which never happens
+        fifo = os.path.join(self.directory, 'hang.pdf')
+        os.mkfifo(fifo)
+        with self.assertRaises(ParseFailed) as raised:
+            self.pool.extract_text(fifo, 'pdf')
+        self.assertEqual(raised.exception.reason, 'timeout')
+
+        self.pool.timeout = 5
+        self.assertEqual(self.pool.extract_text(self.resume(), 'docx')[0], 'Jane Doe\nSkills\nPython')
+        self.assertEqual(self.pool.stats()['restarts'], 1)
+
+    def test_worker_over_the_memory_limit_fails_with_oom(self):
+        path = os.path.join(self.directory, 'bomb.docx')
+        namespace = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('word/document.xml', (
+                f'<w:document xmlns:w="{namespace}"><w:body><w:p><w:r><w:t>'
+                + 'a' * (32 * 1024 * 1024) + '</w:t></w:r></w:p></w:body></w:document>'
+            ))
+        with self.assertRaises(ParseFailed) as raised:
+            self.pool.extract_text(path, 'docx')
+        self.assertEqual(raised.exception.reason, 'oom')
+        self.assertEqual(self.pool.stats()['alive'], 0)
+
+
+class ResumeParserBenchmarkTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_corpus_is_reproducible_from_its_seed(self):
+        first = generate_corpus(os.path.join(self.directory, 'a'), [2], files_per_size=1, seed=7)
+        second = generate_corpus(os.path.join(self.directory, 'b'), [2], files_per_size=1, seed=7)
+
+        with open(first['pdf'][2][0], 'rb') as a, open(second['pdf'][2][0], 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+        text, page_count, _ = extraction.extract_text(first['pdf'][2][0], 'pdf')
+        self.assertEqual(page_count, 2)
+        self.assertIn('Work Experience', text)
+
+    def benchmark(self, **options):
+        output = os.path.join(self.directory, 'report.json')
+        call_command(
+            'benchmark_resume_parser', pages='1', files=1, iterations=2, output=output,
+            stdout=mock.Mock(), stderr=mock.Mock(), **options
+        )
+        with open(output) as report:
+            return json.load(report)
+
+    def test_report_has_timings_per_file_type_and_size(self):
+        report = self.benchmark()
+        self.assertEqual(sorted(report['results']), ['docx/1', 'pdf/1'])
+        result = report['results']['pdf/1']
+        self.assertEqual(result['extract']['samples'], 2)
+        self.assertGreater(result['parse']['peak_memory'], 0)
+        self.assertFalse(result['truncated'])
+
+    def test_slowdowns_against_the_baseline_are_regressions(self):
+        baseline = self.benchmark()
+        # An impossibly fast parse phase and an impossibly slow extract phase
+        for result in baseline['results'].values():
+            result['parse']['p50'] = 1e-9
+            result['extract']['p50'] = 1000
+        baseline_path = os.path.join(self.directory, 'baseline.json')
+        with open(baseline_path, 'w') as baseline_file:
+            json.dump(baseline, baseline_file)
+
+        report = self.benchmark(baseline=baseline_path)
+        self.assertEqual(sorted(report['comparison']['regressions']), ['docx/1 parse', 'pdf/1 parse'])
+        with self.assertRaises(CommandError):
+            self.benchmark(baseline=baseline_path, fail_on_regression=True)
+
+
+class ReparseResumesTests(TestCase):
+    def candidate(self, email, text=''):
+        candidate = Candidate(
+            name='Jane Doe', email=email, phone='+15550000001', parse_status='completed',
+            parser_version=PARSER_VERSION - 1, skills=['Cobol']
+        )
+        candidate.resume_text = text
+        candidate.save()
+        return candidate
+
+    def test_stale_candidates_are_reparsed_from_their_stored_text(self):
+        candidate = self.candidate('jane@example.com', 'Jane Doe\n\nSkills\nPython, Django')
+        report = ResumeReparseService(max_workers=1).reparse()
+
+        self.assertEqual((report['reparsed'], report['failed'], report['remaining']), (1, 0, 0))
+        candidate.refresh_from_db()
+        self.assertEqual((candidate.skills, candidate.parser_version), (['Python', 'Django'], PARSER_VERSION))
+
+    def test_failed_reparse_is_skipped_until_the_parser_version_changes(self):
+        candidate = self.candidate('jane@example.com')
+        report = ResumeReparseService(max_workers=1).reparse()
+
+        self.assertEqual((report['failed'], report['remaining']), (1, 0))
+        candidate.refresh_from_db()
+        self.assertEqual(candidate.reparse_failed_version, PARSER_VERSION)
+        self.assertEqual(candidate.parse_error, 'No stored resume text or resume file')
+        self.assertEqual(candidate.skills, ['Cobol'])
+        self.assertEqual(ResumeReparseService(max_workers=1).reparse()['failed'], 0)
+
+        with mock.patch('candidates.reparse.PARSER_VERSION', PARSER_VERSION + 1):
+            self.assertEqual(ResumeReparseService(max_workers=1).reparse()['failed'], 1)
+
+    def test_dry_run_counts_stale_and_skipped_candidates(self):
+        self.candidate('jane@example.com', 'Jane Doe')
+        self.candidate('john@example.com')
+        Candidate.objects.filter(email='john@example.com').update(reparse_failed_version=PARSER_VERSION)
+
+        output = mock.Mock()
+        call_command('reparse_resumes', dry_run=True, stdout=output)
+        self.assertIn('1 candidates need re-parsing', output.write.call_args.args[0])
+        self.assertIn('1 that already failed with this version are skipped', output.write.call_args.args[0])
@@ -0,0 +1,48 @@
+import hashlib
+from typing import Tuple
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+
+class HashingFile(File):
+    """File wrapper that computes a SHA-256 digest while storage reads it
+
+    Storages read either through ``chunks()`` or ``read()`` (e.g. S3's
+    upload_fileobj); both go through ``read``, which hashes bytes that
+    continue the hashed prefix, so rereads after a seek back count once.
+    Wrapping an upload also hides ``temporary_file_path``, so storage copies
+    it instead of moving it and the digest can cover every byte.
+    """
+
+    def __init__(self, file, name=None):
+        super().__init__(file, name or getattr(file, 'name', None))
+        self.sha256 = hashlib.sha256()
+        self._hashed = 0
+
+    def read(self, *args, **kwargs):
+        position = self.file.tell()
+        data = self.file.read(*args, **kwargs)
+        if position <= self._hashed < position + len(data):
+            self.sha256.update(data[self._hashed - position:])
+            self._hashed = position + len(data)
+        return data
+
+    def hexdigest(self) -> str:
+        """Digest of the whole file, reading whatever storage did not"""
+        self.file.seek(self._hashed)
+        while self.read(self.DEFAULT_CHUNK_SIZE):
+            pass
+        return self.sha256.hexdigest()
+
+
+def save_upload(uploaded_file, name: str, storage=None) -> Tuple[str, str]:
+    """Stream an uploaded file to storage in chunks
+
+    Returns the stored name and the SHA-256 hex digest of the file contents.
+    Only one chunk of the upload is held in memory at a time.
+    """
+    storage = storage or default_storage
+    hashing_file = HashingFile(uploaded_file, name)
+    stored_name = storage.save(name, hashing_file)
+    return stored_name, hashing_file.hexdigest()
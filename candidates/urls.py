@@ -4,8 +4,11 @@ from . import views
 urlpatterns = [
     # Candidate endpoints
     path('candidates/', views.CandidateListCreateView.as_view(), name='candidate-list'),
+    path('candidates/bulk-upload-resumes/', views.bulk_upload_resumes, name='bulk-upload-resumes'),
+    path('candidates/bulk-upload-resumes/<uuid:job_id>/', views.resume_ingestion_status, name='resume-ingestion-status'),
     path('candidates/<uuid:pk>/', views.CandidateDetailView.as_view(), name='candidate-detail'),
     path('candidates/<uuid:candidate_id>/upload-resume/', views.upload_resume, name='upload-resume'),
+    path('candidates/<uuid:candidate_id>/parse-status/', views.resume_parse_status, name='resume-parse-status'),
     
     # Candidate scoring endpoints
     path('candidate-scores/', views.CandidateScoreListView.as_view(), name='candidate-score-list'),
@@ -1,12 +1,18 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from django.conf import settings
 from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
-from .models import Candidate, CandidateScore
-from .serializers import CandidateSerializer, CandidateScoreSerializer, ResumeUploadSerializer
-from .services import ResumeParserService
-import os
+from django.db import transaction
+from .models import Candidate, CandidateScore, ResumeIngestionJob
+from rest_framework.exceptions import ValidationError
+from .serializers import (
+    CandidateSerializer, CandidateScoreSerializer, ResumeUploadSerializer,
+    BulkResumeUploadSerializer, validate_resume_upload
+)
+from .uploads import save_upload
+from .tasks import ingest_resumes_async, parse_resume_async, run_resume_parse
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,10 +32,37 @@ class CandidateDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.AllowAny]
 
 
+def _async_parse_requested(request):
+    """Whether the upload should be parsed in the background"""
+    value = request.query_params.get('async', request.data.get('async'))
+    if value is None:
+        return settings.RESUME_PARSE_ASYNC
+    return str(value).lower() in ['1', 'true', 'yes']
+
+
+def _parse_status_data(candidate):
+    """Serialize the resume parsing state of a candidate"""
+    return {
+        'candidate_id': candidate.id,
+        'job_id': candidate.parse_job_id,
+        'status': candidate.parse_status,
+        'error': candidate.parse_error,
+        'duration': candidate.parse_duration,
+        'page_count': candidate.resume_page_count,
+        'parsed_at': candidate.parsed_at,
+    }
+
+
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def upload_resume(request, candidate_id):
-    """Upload and parse resume for a candidate"""
+    """Upload and parse resume for a candidate
+    
+    Pass ``async=true`` (or enable RESUME_PARSE_ASYNC) to get a 202 response
+    with a job id and poll the parse-status endpoint for the result. A
+    resume that cannot be parsed synchronously gets a 422 response with the
+    reason in ``parse_error``.
+    """
     try:
         candidate = Candidate.objects.get(id=candidate_id)
     except Candidate.DoesNotExist:
@@ -46,22 +79,38 @@ def upload_resume(request, candidate_id):
         try:
             # Save file
             file_name = f"resumes/{candidate_id}_{resume_file.name}"
-            file_path = default_storage.save(file_name, ContentFile(resume_file.read()))
-            full_path = default_storage.path(file_path)
+            file_path, content_hash = save_upload(resume_file, file_name)
+            candidate.resume_file = file_path
+            candidate.resume_hash = content_hash
             
-            # Parse resume
-            parser = ResumeParserService()
-            file_extension = os.path.splitext(resume_file.name)[1][1:]  # Remove the dot
-            parsed_data = parser.parse_resume(full_path, file_extension)
+            if _async_parse_requested(request):
+                candidate.parse_status = 'queued'
+                candidate.parse_job_id = str(uuid.uuid4())
+                candidate.parse_error = ''
+                candidate.parse_duration = None
+                candidate.resume_page_count = None
+                candidate.parsed_at = None
+                candidate.save()
+                
+                # The worker must not look the candidate up before the new job id is committed
+                job_id = candidate.parse_job_id
+                transaction.on_commit(lambda: parse_resume_async.apply_async(
+                    args=[str(candidate.id)],
+                    task_id=job_id
+                ))
+                
+                return Response({
+                    'message': 'Resume uploaded, parsing queued',
+                    **_parse_status_data(candidate)
+                }, status=status.HTTP_202_ACCEPTED)
             
-            # Update candidate with parsed data
-            candidate.resume_file = file_path
-            candidate.experience_years = parsed_data.get('experience_years', 0)
-            candidate.skills = parsed_data.get('skills', [])
-            candidate.education = parsed_data.get('education', [])
-            candidate.work_experience = parsed_data.get('work_experience', [])
-            candidate.summary = parsed_data.get('summary', '')
-            candidate.save()
+            # Parse resume
+            parsed_data = run_resume_parse(candidate)
+            if parsed_data is None:
+                return Response({
+                    'error': 'Failed to parse resume',
+                    'parse_error': candidate.parse_error
+                }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
             
             return Response({
                 'message': 'Resume uploaded and parsed successfully',
@@ -78,6 +127,94 @@ def upload_resume(request, candidate_id):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def resume_parse_status(request, candidate_id):
+    """Poll the state of a candidate's resume parsing job"""
+    try:
+        candidate = Candidate.objects.get(id=candidate_id)
+    except Candidate.DoesNotExist:
+        return Response(
+            {'error': 'Candidate not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    data = _parse_status_data(candidate)
+    if candidate.parse_status == 'completed':
+        data['parsed_data'] = {
+            'skills': candidate.skills,
+            'experience_years': candidate.experience_years,
+            'education': candidate.education,
+            'work_experience': candidate.work_experience,
+            'summary': candidate.summary
+        }
+    
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def bulk_upload_resumes(request):
+    """Upload many resumes at once and ingest them in the background
+    
+    The files are stored and handed to a Celery worker, which creates or
+    updates candidates matched on the email address found in each resume.
+    Answers 202 with a job id; poll resume_ingestion_status for the report,
+    which lists files that failed validation or parsing in ``errors``.
+    """
+    serializer = BulkResumeUploadSerializer(data=request.data)
+    
+    if serializer.is_valid():
+        file_names = []
+        rejected = []
+        
+        for resume_file in serializer.validated_data['resume_files']:
+            try:
+                validate_resume_upload(resume_file)
+            except ValidationError as e:
+                rejected.append({'file': resume_file.name, 'error': ' '.join(e.detail)})
+                continue
+            file_names.append(default_storage.save(f"resumes/{resume_file.name}", resume_file))
+        
+        job = ResumeIngestionJob.objects.create(file_names=file_names, rejected=rejected)
+        transaction.on_commit(lambda: ingest_resumes_async.apply_async(args=[str(job.id)], task_id=str(job.id)))
+        
+        return Response({
+            'job_id': str(job.id),
+            'status': job.status,
+            'files': len(file_names),
+            'rejected': len(rejected),
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def resume_ingestion_status(request, job_id):
+    """Get the status of a bulk resume upload, with its report once ingested"""
+    try:
+        job = ResumeIngestionJob.objects.get(id=job_id)
+    except ResumeIngestionJob.DoesNotExist:
+        return Response(
+            {'error': 'Ingestion job not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    data = {
+        'job_id': str(job.id),
+        'status': job.status,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
+    if job.status == 'completed':
+        data['report'] = job.report
+    elif job.status == 'failed':
+        data['error'] = job.error
+    return Response(data)
+
+
 class CandidateScoreListView(generics.ListAPIView):
     """List candidate scores"""
     queryset = CandidateScore.objects.all()
@@ -0,0 +1,9 @@
+# Loaded automatically by gunicorn from the working directory
+
+
+def post_worker_init(worker):
+    """Create the shared AI client once per worker, before it accepts requests"""
+    from interviews.services import warm_ai_service
+
+    ai_service = warm_ai_service()
+    worker.log.info(f"AI client ready in worker {worker.pid} (model {ai_service.model_name})")
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import JobDescription, InterviewQuestion, Interview, InterviewAnswer
+from .models import JobDescription, InterviewQuestion, Interview, InterviewAnswer, LLMCallLog, ScoreCacheEntry
 
 
 @admin.register(JobDescription)
@@ -21,17 +21,33 @@ class InterviewQuestionAdmin(admin.ModelAdmin):
 
 @admin.register(Interview)
 class InterviewAdmin(admin.ModelAdmin):
-    list_display = ['id', 'candidate', 'job_description', 'status', 'total_score', 'created_at']
+    list_display = ['id', 'candidate', 'job_description', 'status', 'total_score', 'ai_cost', 'created_at']
     list_filter = ['status', 'created_at']
     search_fields = ['candidate__name', 'candidate__email']
-    readonly_fields = ['id', 'created_at', 'call_sid']
+    readonly_fields = ['id', 'created_at', 'call_sid', 'ai_call_count', 'ai_latency', 'ai_tokens', 'ai_cost']
     raw_id_fields = ['candidate', 'job_description']
 
 
 @admin.register(InterviewAnswer)
 class InterviewAnswerAdmin(admin.ModelAdmin):
-    list_display = ['interview', 'question', 'score', 'answered_at']
-    list_filter = ['score', 'answered_at']
+    list_display = ['interview', 'question', 'score', 'score_source', 'scoring_model', 'answered_at']
+    list_filter = ['score', 'score_source', 'scoring_model', 'answered_at']
     search_fields = ['interview__candidate__name', 'question__question_text']
     readonly_fields = ['id', 'answered_at']
     raw_id_fields = ['interview', 'question']
+
+
+@admin.register(ScoreCacheEntry)
+class ScoreCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ['key', 'model_name', 'prompt_version', 'score', 'hit_count', 'created_at', 'last_hit_at']
+    list_filter = ['model_name', 'prompt_version', 'created_at']
+    search_fields = ['key']
+    readonly_fields = ['created_at', 'last_hit_at']
+
+
+@admin.register(LLMCallLog)
+class LLMCallLogAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'model_name', 'outcome', 'latency', 'prompt_tokens', 'response_tokens', 'cost', 'created_at']
+    list_filter = ['kind', 'model_name', 'outcome', 'backend', 'created_at']
+    readonly_fields = ['created_at']
+    raw_id_fields = ['interview', 'job_description']
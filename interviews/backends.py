@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import client as genai_client
+from django.conf import settings
+
+_configured_pid = None
+_configure_lock = threading.Lock()
+
+
+def _configure_genai():
+    """Configure the Gemini SDK once per process
+
+    genai.configure drops the SDK's cached API clients, so calling it for
+    every AIService would open a new connection for every request.
+    """
+    global _configured_pid
+    if _configured_pid != os.getpid():
+        with _configure_lock:
+            if _configured_pid != os.getpid():
+                genai.configure(api_key=settings.GEMINI_API_KEY, transport=settings.GEMINI_TRANSPORT or None)
+                _configured_pid = os.getpid()
+
+
+class LLMBackend:
+    """Text generation backend used by AIService
+
+    generate returns the response text of a prompt; stream yields it in
+    chunks as it is produced. generation_config holds temperature and
+    max_output_tokens. A generate call given a timeout (seconds) raises
+    DeadlineExceeded once it runs out. Transient failures raise the
+    google.api_core exceptions listed in services.TRANSIENT_ERRORS,
+    whatever the backend.
+    """
+
+    name = 'base'
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def warm_up(self):
+        pass
+
+    def generate(self, prompt: str, generation_config: Dict, timeout: Optional[float] = None) -> str:
+        raise NotImplementedError
+
+    def stream(self, prompt: str, generation_config: Dict) -> Iterator[str]:
+        yield self.generate(prompt, generation_config)
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through the google-generativeai SDK"""
+
+    name = 'gemini'
+
+    def __init__(self, model_name: str):
+        super().__init__(model_name)
+        _configure_genai()
+        self.model = genai.GenerativeModel(model_name)
+
+    def warm_up(self):
+        """Create the SDK's API client now instead of on the first request"""
+        genai_client.get_default_generative_client()
+
+    def generate(self, prompt: str, generation_config: Dict, timeout: Optional[float] = None) -> str:
+        config = genai.types.GenerationConfig(**generation_config)
+        if timeout is None:
+            return self.model.generate_content(prompt, generation_config=config).text
+        # GenerativeModel.generate_content takes no timeout in this SDK version,
+        # so the same request is sent through the API client, which does
+        request = self.model._prepare_request(contents=prompt, generation_config=config)
+        response = genai_client.get_default_generative_client().generate_content(request, timeout=timeout)
+        return genai.types.GenerateContentResponse.from_response(response).text
+
+    def stream(self, prompt: str, generation_config: Dict) -> Iterator[str]:
+        response = self.model.generate_content(
+            prompt,
+            generation_config=genai.types.GenerationConfig(**generation_config),
+            stream=True
+        )
+        for chunk in response:
+            try:
+                yield chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. only a finish reason)
+                continue
+
+
+class FakeBackend(LLMBackend):
+    """Offline stand-in that answers every prompt of AIService without a network
+
+    Outputs are deterministic: they depend only on the prompt, so a load
+    test run twice scores the same answers the same way. Latency is drawn
+    from a log-normal distribution around AI_FAKE_LATENCY_MS
+    (AI_FAKE_LATENCY_SIGMA=0 makes it constant), and AI_FAKE_ERROR_RATE of
+    the calls fail with ServiceUnavailable, like an overloaded provider.
+    """
+
+    name = 'fake'
+    STREAM_CHUNK_SIZE = 40
+
+    def __init__(self, model_name: str, latency_ms: Optional[float] = None, latency_sigma: Optional[float] = None,
+                 error_rate: Optional[float] = None, seed: Optional[int] = None):
+        super().__init__(model_name)
+        self.latency_ms = settings.AI_FAKE_LATENCY_MS if latency_ms is None else latency_ms
+        self.latency_sigma = settings.AI_FAKE_LATENCY_SIGMA if latency_sigma is None else latency_sigma
+        self.error_rate = settings.AI_FAKE_ERROR_RATE if error_rate is None else error_rate
+        self._random = random.Random(settings.AI_FAKE_SEED if seed is None else seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        """Latency in seconds and whether the call fails"""
+        with self._lock:
+            latency = self.latency_ms / 1000
+            if self.latency_sigma > 0:
+                latency *= self._random.lognormvariate(0, self.latency_sigma)
+            return latency, self._random.random() < self.error_rate
+
+    def generate(self, prompt: str, generation_config: Dict, timeout: Optional[float] = None) -> str:
+        latency, fails = self._draw()
+        if timeout is not None and latency > timeout:
+            time.sleep(max(0.0, timeout))
+            raise google_exceptions.DeadlineExceeded("Fake backend call timed out")
+        time.sleep(latency)
+        if fails:
+            raise google_exceptions.ServiceUnavailable("Fake backend injected error")
+        return self.respond(prompt)
+
+    def stream(self, prompt: str, generation_config: Dict) -> Iterator[str]:
+        latency, fails = self._draw()
+        text = self.respond(prompt)
+        chunks = [text[start:start + self.STREAM_CHUNK_SIZE] for start in range(0, len(text), self.STREAM_CHUNK_SIZE)]
+        # A fifth of the latency before the first chunk, the rest spread over the others
+        time.sleep(latency / 5)
+        if fails:
+            raise google_exceptions.ServiceUnavailable("Fake backend injected error")
+        for chunk in chunks:
+            yield chunk
+            time.sleep(latency * 4 / 5 / len(chunks))
+
+    def respond(self, prompt: str) -> str:
+        """Deterministic response in the shape the prompt asks for"""
+        seed = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8], 16)
+
+        answers = re.search(r'Answers \(JSON\):\s*(\[.*?\])\s*\n', prompt, re.DOTALL)
+        if answers:
+            items = json.loads(answers.group(1))
+            return json.dumps([
+                dict(self._score(seed + item['index'], item.get('keyword_coverage')), index=item['index'])
+                for item in items
+            ])
+        if 'Expected Keywords:' in prompt:
+            return json.dumps(self._score(seed))
+
+        count = re.search(r'generate (\d+) relevant interview questions', prompt)
+        if count:
+            return json.dumps(self._questions(seed, int(count.group(1))))
+
+        return (
+            f"Overall recommendation: {['Hire', 'Maybe', 'Reject'][seed % 3]}\n"
+            "Key strengths: clear answers.\nAreas of concern: none noted by the fake backend.\n"
+            "Suggested next steps: follow-up interview."
+        )
+
+    def _score(self, seed: int, coverage: Optional[float] = None) -> Dict:
+        score = 3 + (seed % 50) / 10
+        if coverage is not None:
+            score = min(10.0, score + 2 * coverage)
+        return {
+            'score': round(score, 1),
+            'feedback': f"Deterministic fake feedback #{seed % 1000}.",
+            'strengths': ['clarity'],
+            'improvements': ['depth'],
+        }
+
+    def _questions(self, seed: int, count: int) -> List[Dict]:
+        topics = ['system design', 'debugging', 'testing', 'APIs', 'databases', 'teamwork', 'deadlines', 'security']
+        return [
+            {
+                'question': f"Describe your experience with {topics[(seed + index) % len(topics)]} (#{index + 1}).",
+                'difficulty': ['easy', 'medium', 'hard'][(seed + index) % 3],
+                'expected_keywords': [topics[(seed + index) % len(topics)]],
+                'category': 'technical' if index % 2 == 0 else 'behavioral',
+            }
+            for index in range(count)
+        ]
+
+
+class RecordingNotFound(LookupError):
+    """Raised in replay mode for a prompt that was never recorded"""
+
+
+class RecordReplayBackend(LLMBackend):
+    """Capture another backend's responses to disk ('record') or serve them back offline ('replay')
+
+    Recordings are JSON files in AI_RECORDINGS_DIR named by a hash of the
+    model, prompt and generation config, so replay needs the exact prompt
+    that was recorded.
+    """
+
+    def __init__(self, model_name: str, inner: Optional[LLMBackend], mode: str, directory: str):
+        super().__init__(model_name)
+        self.inner = inner
+        self.mode = mode
+        self.directory = directory
+        self.name = f"{inner.name if inner else 'recordings'}+{mode}"
+        os.makedirs(directory, exist_ok=True)
+
+    def warm_up(self):
+        if self.inner:
+            self.inner.warm_up()
+
+    def _path(self, prompt: str, generation_config: Dict) -> str:
+        payload = json.dumps([self.model_name, prompt, generation_config], sort_keys=True, ensure_ascii=False)
+        return os.path.join(self.directory, hashlib.sha256(payload.encode('utf-8')).hexdigest() + '.json')
+
+    def generate(self, prompt: str, generation_config: Dict, timeout: Optional[float] = None) -> str:
+        path = self._path(prompt, generation_config)
+        if self.mode == 'replay':
+            try:
+                with open(path) as recording:
+                    return json.load(recording)['text']
+            except FileNotFoundError:
+                raise RecordingNotFound(f"No recorded response for this prompt ({os.path.basename(path)})")
+
+        text = self.inner.generate(prompt, generation_config, timeout)
+        with open(path + '.tmp', 'w') as recording:
+            json.dump({
+                'model': self.model_name, 'prompt': prompt, 'generation_config': generation_config, 'text': text,
+            }, recording, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+        return text
+
+    def stream(self, prompt: str, generation_config: Dict) -> Iterator[str]:
+        # Streams are recorded whole and replayed as a single chunk
+        yield self.generate(prompt, generation_config)
+
+
+BACKENDS = {
+    'gemini': GeminiBackend,
+    'fake': FakeBackend,
+}
+
+
+def get_backend(model_name: str) -> LLMBackend:
+    """The backend chosen by AI_BACKEND, wrapped for AI_RECORD_MODE if set"""
+    try:
+        backend_class = BACKENDS[settings.AI_BACKEND]
+    except KeyError:
+        raise ValueError(f"Unknown AI_BACKEND {settings.AI_BACKEND!r}; expected one of {', '.join(BACKENDS)}")
+
+    if settings.AI_RECORD_MODE == 'replay':
+        return RecordReplayBackend(model_name, None, 'replay', settings.AI_RECORDINGS_DIR)
+    backend = backend_class(model_name)
+    if settings.AI_RECORD_MODE == 'record':
+        return RecordReplayBackend(model_name, backend, 'record', settings.AI_RECORDINGS_DIR)
+    return backend
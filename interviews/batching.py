@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .instrumentation import llm_context
+
+_batchers = {}
+_batchers_pid = None
+_batchers_lock = threading.Lock()
+
+
+class _Entry:
+    def __init__(self, item: Dict, interview_id):
+        self.item = item
+        self.interview_id = interview_id
+        self.future = Future()
+        self.queued_at = time.monotonic()
+
+
+class ScoringBatcher:
+    """Collect answers to score from every thread of the process and score them together
+
+    Answers submitted within ``window`` seconds of the oldest queued one,
+    whichever interviews they belong to, are scored with one
+    score_answers_batch call, flushed early once ``batch_size`` are queued.
+    Batches run on ``executor``. Each submitted answer gets a Future
+    resolving to its score dict, or None if the batch could not score it.
+    A batch's model call is attributed to the interviews of its answers in
+    proportion to their number of answers (see llm_context).
+    """
+
+    def __init__(self, ai_service, executor, batch_size: int, window: float):
+        self.ai_service = ai_service
+        self.executor = executor
+        self.batch_size = batch_size
+        self.window = window
+        self._condition = threading.Condition()
+        self._pending: List[_Entry] = []
+        self._thread = None
+        self.batches = 0
+        self.items = 0
+        self.full_batches = 0
+        self.interviews = 0
+
+    def submit(self, items: List[Dict], interview_ids: List) -> List[Future]:
+        """Queue answers (score_answers_batch items) with the id of the interview of each"""
+        entries = [_Entry(item, interview_id) for item, interview_id in zip(items, interview_ids)]
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._collect, name='ai-scoring-batcher', daemon=True)
+                self._thread.start()
+            self._pending.extend(entries)
+            self._condition.notify()
+        return [entry.future for entry in entries]
+
+    def _collect(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                flush_at = self._pending[0].queued_at + self.window
+                while len(self._pending) < self.batch_size and time.monotonic() < flush_at:
+                    self._condition.wait(flush_at - time.monotonic())
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+            self.executor.submit(self._score, batch)
+
+    def _score(self, batch: List[_Entry]):
+        counts = Counter(entry.interview_id for entry in batch if entry.interview_id)
+        shares = {interview_id: count / len(batch) for interview_id, count in counts.items()}
+        try:
+            with llm_context(interview_shares=shares):
+                results = self.ai_service.score_answers_batch([entry.item for entry in batch])
+        except Exception as e:
+            for entry in batch:
+                entry.future.set_exception(e)
+            return
+        finally:
+            # The call log was written from this pool thread
+            close_old_connections()
+            with self._condition:
+                self.batches += 1
+                self.items += len(batch)
+                self.full_batches += len(batch) >= self.batch_size
+                self.interviews += len(counts)
+
+        for entry, result in zip(batch, results):
+            entry.future.set_result(result)
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return {
+                'batch_size': self.batch_size,
+                'window': self.window,
+                'queued': len(self._pending),
+                'batches': self.batches,
+                # Batches sent because they were full rather than because the window ended
+                'full_batches': self.full_batches,
+                'answers': self.items,
+                'answers_per_batch': round(self.items / self.batches, 2) if self.batches else None,
+                'interviews_per_batch': round(self.interviews / self.batches, 2) if self.batches else None,
+            }
+
+
+def get_scoring_batcher(ai_service, executor) -> ScoringBatcher:
+    """This process's batcher for ai_service, created on first use (and again after a fork)"""
+    global _batchers, _batchers_pid
+    with _batchers_lock:
+        if _batchers_pid != os.getpid():
+            _batchers = {}
+            _batchers_pid = os.getpid()
+        batcher = _batchers.get(id(ai_service))
+        if batcher is None or batcher.ai_service is not ai_service:
+            batcher = _batchers[id(ai_service)] = ScoringBatcher(
+                ai_service, executor, max(1, settings.AI_SCORING_BATCH_SIZE), settings.AI_SCORING_BATCH_WINDOW
+            )
+        return batcher
+
+
+def scoring_batcher_stats(ai_service) -> Optional[Dict]:
+    """Stats of ai_service's batcher in this process, or None if it has none"""
+    batcher = _batchers.get(id(ai_service)) if _batchers_pid == os.getpid() else None
+    return batcher.stats() if batcher is not None and batcher.ai_service is ai_service else None
@@ -0,0 +1,184 @@
+import re
+import threading
+from typing import Dict, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Headings of job description sections that do not help write interview questions
+BOILERPLATE_HEADINGS = [
+    'benefit', 'perk', 'what we offer', 'we offer', 'compensation', 'salary', 'pay range', 'equal opportunity',
+    'eeo', 'diversity', 'about us', 'about the company', 'who we are', 'why join', 'how to apply',
+    'disclaimer', 'privacy', 'accommodation',
+]
+# Paragraphs dropped wherever they appear, e.g. EEO statements without a heading
+BOILERPLATE_PARAGRAPH = re.compile(
+    r"equal (employment )?opportunity|without regard to|regardless of (race|gender|age|religion)|"
+    r"reasonable accommodation|e-verify",
+    re.IGNORECASE,
+)
+HEADING_PATTERN = re.compile(r"^\s*(#+\s*|\*\*)?(?P<title>[A-Za-z][\w &/',-]{1,60}?)(\*\*)?\s*:?\s*$")
+_BOILERPLATE_TOPIC = r"(?:our |the )?(?:" + '|'.join(re.escape(heading) for heading in BOILERPLATE_HEADINGS) + r")s?"
+# Plain-text headings made only of boilerplate topics: "Benefits", "About Us", "Salary & Perks"
+PLAIN_BOILERPLATE_HEADING = re.compile(rf"^{_BOILERPLATE_TOPIC}(?:\s*(?:,|and|&|/)\s*{_BOILERPLATE_TOPIC})*(?: us)?$")
+
+FILLER_PATTERN = re.compile(
+    r"\b(?:u+m+|u+h+|e+r+m*|h+m+|a+h+|m+h*m+)\b[,.]?\s*|\b(?:you know|i mean),?\s+|\blike,\s+",
+    re.IGNORECASE,
+)
+REPEATED_WORD_PATTERN = re.compile(r"\b(\w+)(\s+\1\b)+", re.IGNORECASE)
+TRUNCATION_MARKER = ' [...]'
+
+
+def count_tokens(text: str) -> int:
+    """Local estimate of the model's token count
+
+    Words count one token per four characters, rounded up, and punctuation
+    one token each, which slightly overestimates SentencePiece counts for
+    English, so prompts that fit the estimate fit the real budget.
+    """
+    return sum((len(token) + 3) // 4 for token in TOKEN_PATTERN.findall(text or ''))
+
+
+def _truncate(units: List[str], budget: int, separator: str) -> str:
+    """Join units (lines or words) from the start while they fit the budget
+
+    The line that overflows keeps as many of its words as still fit.
+    """
+    kept = []
+    used = count_tokens(TRUNCATION_MARKER)
+    for unit in units:
+        cost = count_tokens(unit)
+        if used + cost > budget:
+            if separator == '\n':
+                words = _truncate(unit.split(' '), budget - used + count_tokens(TRUNCATION_MARKER), ' ')
+                kept.append(words[:-len(TRUNCATION_MARKER)].rstrip())
+            return separator.join(unit for unit in kept if unit) + TRUNCATION_MARKER
+        kept.append(unit)
+        used += cost
+    return separator.join(kept)
+
+
+def _heading_title(line: str):
+    """Lowercased title of a short heading-shaped line, or None"""
+    match = HEADING_PATTERN.match(line)
+    if not match or len(match.group('title').split()) > 6:
+        return None
+    return match.group('title').lower()
+
+
+def _is_styled_heading(line: str) -> bool:
+    """Whether line is marked as a heading: ends in ':', starts with '#' or '**', or is in capitals"""
+    return _heading_title(line) is not None and (
+        line.rstrip().endswith(':') or line.lstrip().startswith(('#', '**')) or line.strip().isupper()
+    )
+
+
+def _is_boilerplate_heading(line: str) -> bool:
+    """Whether line heads a boilerplate section
+
+    Styled headings count when they mention a boilerplate topic ("Our
+    Benefits:"); plain lines only when they consist of boilerplate topics
+    ("Perks & Benefits"), so body text such as "Competitive salary" never
+    starts a section.
+    """
+    title = _heading_title(line)
+    if title is None:
+        return False
+    if _is_styled_heading(line):
+        return any(heading in title for heading in BOILERPLATE_HEADINGS)
+    return bool(PLAIN_BOILERPLATE_HEADING.match(title))
+
+
+def compress_job_description(text: str, budget: int) -> str:
+    """Drop boilerplate sections (benefits, EEO, about us...) and duplicate lines, then fit the token budget
+
+    Text already within the budget (or with no budget) is returned
+    unchanged. A boilerplate section runs from its heading to the next
+    heading-shaped line or paragraph break. When the rest is still over
+    budget, trailing lines are cut.
+    """
+    if not budget or count_tokens(text) <= budget:
+        return text or ''
+
+    lines = []
+    seen = set()
+    skipping = False
+    skipped = 0
+    for line in (text or '').splitlines():
+        stripped = ' '.join(line.split())
+        if not stripped:
+            # A blank line after the section's first paragraph ends it
+            if skipping and skipped:
+                skipping = False
+            continue
+        if _is_boilerplate_heading(stripped):
+            skipping = True
+            skipped = 0
+            continue
+        if skipping and _heading_title(stripped) is not None:
+            skipping = False
+        if skipping:
+            skipped += 1
+            continue
+        if BOILERPLATE_PARAGRAPH.search(stripped) or stripped.lower() in seen:
+            continue
+        seen.add(stripped.lower())
+        lines.append(stripped)
+
+    # Everything was boilerplate; keep the original rather than send nothing
+    if not lines:
+        lines = [' '.join(line.split()) for line in (text or '').splitlines() if line.strip()]
+    if count_tokens('\n'.join(lines)) > budget:
+        return _truncate(lines, budget, '\n')
+    return '\n'.join(lines)
+
+
+def compress_transcript(text: str, budget: int) -> str:
+    """Remove spoken filler (um, uh, you know...) and stutters, then fit the token budget"""
+    text = FILLER_PATTERN.sub('', text or '')
+    text = REPEATED_WORD_PATTERN.sub(r'\1', text)
+    text = ' '.join(text.split())
+    if budget and count_tokens(text) > budget:
+        return _truncate(text.split(' '), budget, ' ')
+    return text
+
+
+def compress_summary(text: str, budget: int) -> str:
+    """Fit multi-line text to the token budget by cutting trailing lines"""
+    lines = [line for line in (text or '').splitlines() if line.strip()]
+    if budget and count_tokens(text) > budget:
+        return _truncate(lines, budget, '\n')
+    return '\n'.join(lines)
+
+
+def fit(text: str, budget: int, compress) -> Tuple[str, int]:
+    """compress(text, budget), also returning the number of tokens saved"""
+    fitted = compress(text, budget)
+    return fitted, max(0, count_tokens(text) - count_tokens(fitted))
+
+
+class PromptBudgetStats:
+    """Thread-safe prompt token usage per call type, against its budget"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, kind: str, prompt_tokens: int, saved_tokens: int, budget: int):
+        with self._lock:
+            counts = self._counts.setdefault(kind, {
+                'calls': 0, 'prompt_tokens': 0, 'max_prompt_tokens': 0, 'saved_tokens': 0, 'compressed_calls': 0,
+            })
+            counts['calls'] += 1
+            counts['prompt_tokens'] += prompt_tokens
+            counts['max_prompt_tokens'] = max(counts['max_prompt_tokens'], prompt_tokens)
+            counts['saved_tokens'] += saved_tokens
+            counts['compressed_calls'] += 1 if saved_tokens else 0
+            counts['budget'] = budget
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                kind: dict(counts, average_prompt_tokens=round(counts['prompt_tokens'] / counts['calls'], 1))
+                for kind, counts in self._counts.items()
+            }
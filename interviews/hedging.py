@@ -0,0 +1,98 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from django.conf import settings
+
+_deadline = contextvars.ContextVar('ai_deadline', default=None)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+@contextmanager
+def ai_deadline(seconds: Optional[float]):
+    """Model calls made inside the block must finish within seconds from now
+
+    The deadline covers all calls of the block together; a nested block can
+    only shorten it. Calls still running when it passes fail with
+    AIServiceUnavailable, so callers defer the work instead of blocking,
+    e.g. a Twilio webhook that would otherwise time out. None sets no
+    deadline. Thread pool tasks wrapped with instrumentation.in_context
+    inherit it.
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    parent = _deadline.get()
+    token = _deadline.set(min(deadline, parent) if parent is not None else deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def call_deadline() -> float:
+    """Monotonic time by which the next model call must finish
+
+    AI_CALL_DEADLINE seconds from now, or earlier if an enclosing ai_deadline ends first.
+    """
+    deadline = time.monotonic() + settings.AI_CALL_DEADLINE
+    parent = _deadline.get()
+    return min(deadline, parent) if parent is not None else deadline
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """Thread pool running the primary and hedged requests of model calls in this process
+
+    A call blocks its caller's thread, so two workers per concurrent scoring
+    call (primary and hedge) plus a few for web requests are enough.
+    """
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=2 * max(1, settings.AI_SCORING_CONCURRENCY) + 8, thread_name_prefix='ai-hedge'
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+class HedgeStats:
+    """Thread-safe counts of hedged model calls"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+        self.deadline_exceeded = 0
+
+    def record(self, hedged: bool = False, hedge_won: bool = False, skipped: bool = False,
+               deadline_exceeded: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.hedged += hedged
+            self.hedge_wins += hedge_won
+            self.hedges_skipped += skipped
+            self.deadline_exceeded += deadline_exceeded
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                # Hedges not sent because the fallback model's rate limit was used up
+                'hedges_skipped': self.hedges_skipped,
+                'deadline_exceeded': self.deadline_exceeded,
+                'hedge_rate': round(self.hedged / self.calls, 3) if self.calls else None,
+            }
@@ -0,0 +1,249 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import F
+
+from .budget import count_tokens
+
+# USD per million (prompt, response) tokens; AI_INPUT_TOKEN_PRICE and
+# AI_OUTPUT_TOKEN_PRICE override these for every model
+MODEL_PRICES = {
+    'gemini-2.5-pro': (1.25, 10.0),
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-2.5-flash-lite': (0.10, 0.40),
+    'gemini-1.5-pro': (1.25, 5.0),
+    'gemini-1.5-flash': (0.075, 0.30),
+}
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+_call_context = contextvars.ContextVar('llm_call_context', default=None)
+
+
+def token_prices(model_name: str) -> Tuple[float, float]:
+    input_price, output_price = MODEL_PRICES.get(model_name, (0.0, 0.0))
+    if settings.AI_INPUT_TOKEN_PRICE is not None:
+        input_price = settings.AI_INPUT_TOKEN_PRICE
+    if settings.AI_OUTPUT_TOKEN_PRICE is not None:
+        output_price = settings.AI_OUTPUT_TOKEN_PRICE
+    return input_price, output_price
+
+
+class LLMCall:
+    """Measurements of one model call, filled in while it runs
+
+    outcome is 'ok', 'fallback' (the response was unusable and fallback
+    data was used), 'error', 'unavailable' (refused by the rate limiter or
+    circuit breaker, a transient provider error or a missed deadline),
+    'cancelled' (a hedged request that lost to another model's response) or
+    'coalesced' (served by an identical call in flight, see SingleFlight).
+    """
+
+    def __init__(self, kind: str, model_name: str, backend: str, prompt: str):
+        self.kind = kind
+        self.model_name = model_name
+        self.backend = backend
+        self.prompt_tokens = count_tokens(prompt)
+        self.response_tokens = 0
+        self.latency = 0.0
+        self.outcome = 'ok'
+
+    @property
+    def cost(self) -> Decimal:
+        input_price, output_price = token_prices(self.model_name)
+        cost = (self.prompt_tokens * input_price + self.response_tokens * output_price) / 1_000_000
+        return Decimal(str(round(cost, 6)))
+
+
+class _Histogram:
+    """Prometheus-style cumulative latency histogram per label set"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, labels: Tuple, value: float):
+        with self._lock:
+            series = self._series.setdefault(labels, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def series(self) -> Dict:
+        with self._lock:
+            return {labels: dict(series, buckets=list(series['buckets'])) for labels, series in self._series.items()}
+
+
+class _Counter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, labels: Tuple, amount: float):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def values(self) -> Dict:
+        with self._lock:
+            return dict(self._values)
+
+
+latency_histogram = _Histogram(LATENCY_BUCKETS)
+token_counter = _Counter()
+cost_counter = _Counter()
+
+
+@contextmanager
+def llm_context(**ids):
+    """Attribute the model calls made inside the block to an interview and/or job description
+
+    Accepts interview_id and job_description_id; nested blocks inherit the
+    outer ids. A call serving several interviews (a batch scoring answers
+    of each) takes interview_shares instead, mapping interview ids to their
+    share: each interview's AI usage totals get the call, its latency, and
+    that share of its tokens and cost. Calls are collected and written with one bulk insert when the
+    block exits, so calls made on worker threads (see in_context) need no
+    database connection of their own. The yielded dict may be updated
+    inside the block, e.g. with the id of a job description created after
+    its questions were generated.
+    """
+    parent = _call_context.get()
+    context = {'ids': dict(parent['ids'] if parent else {}, **ids), 'calls': []}
+    token = _call_context.set(context)
+    try:
+        yield context['ids']
+    finally:
+        _call_context.reset(token)
+        _save(context['calls'], context['ids'])
+
+
+def in_context(function: Callable) -> Callable:
+    """Wrap function to run in a copy of the caller's context, for thread pool tasks"""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(function, *args, **kwargs)
+    return run
+
+
+def record(call: LLMCall):
+    """Add a finished call to the metrics, and to the enclosing llm_context or straight to the database"""
+    labels = (call.kind, call.model_name, call.outcome)
+    latency_histogram.observe(labels, call.latency)
+    token_counter.inc((call.kind, call.model_name, 'prompt'), call.prompt_tokens)
+    token_counter.inc((call.kind, call.model_name, 'response'), call.response_tokens)
+    cost_counter.inc((call.kind, call.model_name), float(call.cost))
+
+    context = _call_context.get()
+    if context is not None:
+        context['calls'].append(call)
+    else:
+        _save([call], {})
+
+
+def _save(calls: List[LLMCall], ids: Dict):
+    if not calls or not settings.AI_CALL_LOG_ENABLED:
+        return
+    from .models import Interview, LLMCallLog
+
+    shares = ids.get('interview_shares') or ({ids['interview_id']: 1} if ids.get('interview_id') else {})
+    interview_id = ids.get('interview_id') or (next(iter(shares)) if len(shares) == 1 else None)
+    LLMCallLog.objects.bulk_create([
+        LLMCallLog(
+            kind=call.kind,
+            model_name=call.model_name,
+            backend=call.backend,
+            outcome=call.outcome,
+            latency=round(call.latency, 4),
+            prompt_tokens=call.prompt_tokens,
+            response_tokens=call.response_tokens,
+            cost=call.cost,
+            interview_id=interview_id,
+            job_description_id=ids.get('job_description_id'),
+        )
+        for call in calls
+    ])
+    tokens = sum(call.prompt_tokens + call.response_tokens for call in calls)
+    cost = sum((call.cost for call in calls), Decimal(0))
+    for interview, share in shares.items():
+        Interview.objects.filter(pk=interview).update(
+            ai_call_count=F('ai_call_count') + len(calls),
+            ai_latency=F('ai_latency') + sum(call.latency for call in calls),
+            ai_tokens=F('ai_tokens') + round(tokens * share),
+            ai_cost=F('ai_cost') + (cost * Decimal(str(share))).quantize(Decimal('0.000001')),
+        )
+
+
+def _labels(names: Tuple, values: Tuple, **extra) -> str:
+    pairs = dict(zip(names, values), **extra)
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for value in pairs.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(pairs, escaped)) + '}'
+
+
+def _logged_metrics() -> Tuple[Dict, Dict, Dict]:
+    """Latency histogram series, token and cost counter values aggregated from LLMCallLog"""
+    from django.db.models import Count, Q, Sum
+    from .models import LLMCallLog
+
+    buckets = {
+        f'le_{index}': Count('id', filter=Q(latency__lte=bound)) for index, bound in enumerate(LATENCY_BUCKETS)
+    }
+    rows = LLMCallLog.objects.order_by().values('kind', 'model_name', 'outcome').annotate(
+        count=Count('id'), total_latency=Sum('latency'), total_prompt_tokens=Sum('prompt_tokens'),
+        total_response_tokens=Sum('response_tokens'), total_cost=Sum('cost'), **buckets
+    )
+    series, tokens, costs = {}, {}, {}
+    for row in rows:
+        kind, model = row['kind'], row['model_name']
+        series[(kind, model, row['outcome'])] = {
+            'buckets': [row[f'le_{index}'] for index in range(len(LATENCY_BUCKETS))],
+            'sum': row['total_latency'] or 0.0,
+            'count': row['count'],
+        }
+        for direction in ('prompt', 'response'):
+            key = (kind, model, direction)
+            tokens[key] = tokens.get(key, 0) + (row[f'total_{direction}_tokens'] or 0)
+        costs[(kind, model)] = costs.get((kind, model), 0.0) + float(row['total_cost'] or 0)
+    return series, tokens, costs
+
+
+def render_metrics() -> str:
+    """Model call metrics in the Prometheus text exposition format
+
+    Aggregated from LLMCallLog, so calls made by every web and Celery worker
+    process count and every scrape sees the same totals; purging old logs
+    (purge_llm_call_logs) lowers them, which Prometheus treats as a counter
+    reset. With AI_CALL_LOG_ENABLED off only this process's calls are known.
+    """
+    if settings.AI_CALL_LOG_ENABLED:
+        histogram, tokens, costs = _logged_metrics()
+    else:
+        histogram, tokens, costs = latency_histogram.series(), token_counter.values(), cost_counter.values()
+
+    lines = [
+        '# HELP ai_call_duration_seconds Latency of model calls',
+        '# TYPE ai_call_duration_seconds histogram',
+    ]
+    names = ('kind', 'model', 'outcome')
+    for labels, series in sorted(histogram.items()):
+        for bound, count in zip(LATENCY_BUCKETS, series['buckets']):
+            lines.append(f"ai_call_duration_seconds_bucket{_labels(names, labels, le=bound)} {count}")
+        lines.append(f"ai_call_duration_seconds_bucket{_labels(names, labels, le='+Inf')} {series['count']}")
+        lines.append(f"ai_call_duration_seconds_sum{_labels(names, labels)} {series['sum']:.6f}")
+        lines.append(f"ai_call_duration_seconds_count{_labels(names, labels)} {series['count']}")
+
+    lines += ['# HELP ai_call_tokens_total Estimated tokens of model calls', '# TYPE ai_call_tokens_total counter']
+    for labels, value in sorted(tokens.items()):
+        lines.append(f"ai_call_tokens_total{_labels(('kind', 'model', 'direction'), labels)} {value}")
+
+    lines += ['# HELP ai_call_cost_usd_total Estimated cost of model calls', '# TYPE ai_call_cost_usd_total counter']
+    for labels, value in sorted(costs.items()):
+        lines.append(f"ai_call_cost_usd_total{_labels(('kind', 'model'), labels)} {value:.6f}")
+    return '\n'.join(lines) + '\n'
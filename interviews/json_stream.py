@@ -0,0 +1,185 @@
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class JSONArrayStream:
+    """Incrementally pull the objects out of a JSON array as its text arrives
+
+    Feed chunks of model output with feed(); every object of the top-level
+    array is returned as soon as its closing brace has been seen. Text
+    before the array (such as a markdown code fence) is skipped, as are
+    scalar items and objects that fail to decode.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item = []
+        self.done = False
+
+    def feed(self, text: str) -> List[Any]:
+        items = []
+        for char in text:
+            if self.done:
+                break
+            if self._depth == 0:
+                if char == '[':
+                    self._depth = 1
+                continue
+
+            if self._depth > 1:
+                self._item.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = self._depth > 1
+            elif char in '{[':
+                if self._depth == 1:
+                    self._item = [char]
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 1:
+                    item = self._decode(''.join(self._item))
+                    if isinstance(item, dict):
+                        items.append(item)
+                    self._item = []
+                elif self._depth == 0:
+                    self.done = True
+        return items
+
+    def _decode(self, text: str):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+def _scan(text: str, start: int) -> Tuple[Optional[int], int, List[str], bool, Optional[Tuple[int, List[str]]]]:
+    """Scan one bracket-balanced JSON value starting at text[start]
+
+    Returns (end index or None if the value does not close, index the scan
+    stopped at, open brackets left, whether the text ended inside a string,
+    and the last cut point: the position of the last comma outside strings,
+    with the brackets open there). The scan stops after the closing bracket,
+    at a mismatched bracket (with no brackets left open) or at the end of
+    the text.
+    """
+    stack = []
+    in_string = False
+    escaped = False
+    last_cut = None
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append(char)
+        elif char in '}]':
+            if not stack or _CLOSERS[stack[-1]] != char:
+                return None, index, [], False, None
+            stack.pop()
+            if not stack:
+                return index + 1, index + 1, [], False, last_cut
+        elif char == ',':
+            last_cut = (index, list(stack))
+    return None, len(text), stack, in_string, last_cut
+
+
+def _close(stack: List[str]) -> str:
+    return ''.join(_CLOSERS[bracket] for bracket in reversed(stack))
+
+
+def _repair(text: str, stack: List[str], in_string: bool, last_cut) -> Optional[Any]:
+    """Complete a value cut off mid-way, e.g. by max_output_tokens
+
+    Either the open string and brackets are closed as they are, or
+    everything after the last comma (the half-written member or item) is
+    dropped before closing. Arrays try dropping first, so a list of
+    questions loses its cut-off last member rather than keeping it
+    truncated; objects keep their truncated text, such as feedback.
+    """
+    attempts = [text + ('"' if in_string else '') + _close(stack)]
+    if last_cut:
+        cut, cut_stack = last_cut
+        attempts.insert(0 if stack[0] == '[' else 1, text[:cut] + _close(cut_stack))
+    for attempt in attempts:
+        try:
+            return json.loads(attempt)
+        except (ValueError, RecursionError):
+            continue
+    return None
+
+
+def extract_json(text: str, opener: str = '[') -> Tuple[Optional[Any], str]:
+    """Pull the first valid JSON array ('[') or object ('{') out of model output
+
+    Brackets are balanced while skipping strings, so commentary before or
+    after the value and brackets inside strings do not matter. Candidates
+    that close but do not parse are skipped along with any values nested in
+    them. If the output ends before the value is closed, it is repaired. Returns (value, outcome) where outcome is 'ok',
+    'repaired' or 'failed'.
+    """
+    text = text or ''
+    start = text.find(opener)
+    while start != -1:
+        end, stopped, stack, in_string, last_cut = _scan(text, start)
+        if end is not None:
+            try:
+                return json.loads(text[start:end]), 'ok'
+            except (ValueError, RecursionError):
+                # A closed value that does not parse is skipped whole;
+                # rescanning from each opener inside it would be quadratic
+                start = text.find(opener, stopped)
+                continue
+        elif stack:
+            value = _repair(text[start:], stack, in_string, last_cut and (last_cut[0] - start, last_cut[1]))
+            if value is not None:
+                return value, 'repaired'
+        # An opener that never closed may be prose ("[0, 10)"), so the value can start inside it
+        start = text.find(opener, start + 1)
+    return None, 'failed'
+
+
+class ExtractionStats:
+    """Thread-safe counts of extract_json outcomes per response kind"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, kind: str, outcome: str):
+        with self._lock:
+            counts = self._counts.setdefault(kind, {'ok': 0, 'repaired': 0, 'failed': 0, 'invalid': 0})
+            counts[outcome] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            result = {}
+            for kind, counts in self._counts.items():
+                total = sum(counts.values())
+                result[kind] = dict(
+                    counts,
+                    repair_rate=round(counts['repaired'] / total, 3),
+                    failure_rate=round((counts['failed'] + counts['invalid']) / total, 3),
+                )
+            return result
@@ -0,0 +1,144 @@
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from candidates.models import Candidate
+from interviews.batching import scoring_batcher_stats
+from interviews.models import Interview, InterviewAnswer, InterviewQuestion, JobDescription, ScoreCacheEntry
+from interviews.scoring import ScoreCache, score_interview
+from interviews.services import get_ai_service
+
+WORDS = (
+    'I built deployed tested designed a service with python django docker kubernetes postgres redis '
+    'celery queue cache api team deadline customer incident debugging logs metrics review'
+).split()
+
+
+def _percentile(samples, percent):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = "Load-test interview scoring end to end against the configured AI backend (use AI_BACKEND=fake offline)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interviews', type=int, default=20, help="Synthetic interviews to score")
+        parser.add_argument('--answers', type=int, default=6, help="Answers per interview")
+        parser.add_argument('--concurrency', type=int, default=4, help="Interviews scored at the same time")
+        parser.add_argument('--seed', type=int, default=0, help="Seed for the synthetic transcripts")
+        parser.add_argument('--keep', action='store_true', help="Keep the synthetic interviews and cached scores")
+        parser.add_argument(
+            '--live', action='store_true', help="Allow running against the real Gemini API (uses quota)"
+        )
+
+    def handle(self, *args, **options):
+        if settings.AI_BACKEND == 'gemini' and settings.AI_RECORD_MODE != 'replay' and not options['live']:
+            raise CommandError("AI_BACKEND is 'gemini'; set AI_BACKEND=fake or AI_RECORD_MODE=replay, or pass --live")
+        if options['interviews'] < 1 or options['answers'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--interviews, --answers and --concurrency must be positive")
+
+        ai_service = get_ai_service()
+        calls_before = ai_service.stats()['calls']
+        job_description, interviews = self._create(options['interviews'], options['answers'], options['seed'])
+
+        durations = []
+        failures = []
+
+        def run(interview):
+            started = time.perf_counter()
+            try:
+                score_interview(interview, ai_service)
+            except Exception as e:
+                failures.append(f"{e.__class__.__name__}: {e}")
+                return
+            durations.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            list(executor.map(run, interviews))
+        elapsed = time.perf_counter() - started
+
+        stats = ai_service.stats()
+        answers = InterviewAnswer.objects.filter(interview__in=interviews)
+        report = {
+            'backend': stats['backend'],
+            'model': stats['model'],
+            'config': {key: options[key] for key in ['interviews', 'answers', 'concurrency', 'seed']},
+            'elapsed': round(elapsed, 3),
+            'interviews_per_second': round(len(durations) / elapsed, 3) if elapsed else None,
+            'answers_per_second': round(answers.exclude(score=None).count() / elapsed, 3) if elapsed else None,
+            'interview_latency': {
+                'p50': round(_percentile(durations, 50), 3),
+                'p95': round(_percentile(durations, 95), 3),
+            } if durations else None,
+            'model_calls': stats['calls'] - calls_before,
+            'answers_by_source': {
+                source: answers.filter(score_source=source).count() for source in ['ai', 'local']
+            },
+            'failures': len(failures),
+            'errors': sorted(set(failures))[:10],
+            'answers_by_model': {
+                row['scoring_model']: row['answers']
+                for row in answers.exclude(scoring_model='').values('scoring_model').annotate(answers=Count('id'))
+            },
+            'json_extraction': stats['json_extraction'],
+            'hedging': stats['hedging'],
+            'scoring_batcher': scoring_batcher_stats(ai_service),
+        }
+
+        if not options['keep']:
+            self._clean_up(job_description, interviews, ai_service.model_name)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def _create(self, count, answers_per_interview, seed):
+        rng = random.Random(seed)
+        job_description = JobDescription.objects.create(
+            title="Pipeline benchmark", description="Synthetic job description for benchmark_interview_pipeline"
+        )
+        questions = [
+            InterviewQuestion.objects.create(
+                job_description=job_description,
+                question_text=f"Benchmark question {order}: describe a project where you used {rng.choice(WORDS)}.",
+                expected_keywords=rng.sample(WORDS, 3),
+                order=order,
+            )
+            for order in range(1, answers_per_interview + 1)
+        ]
+
+        interviews = []
+        for number in range(count):
+            candidate = Candidate.objects.create(
+                name=f"Benchmark Candidate {number}", email=f"benchmark{number}@example.com", phone='+10000000000'
+            )
+            interview = Interview.objects.create(
+                candidate=candidate, job_description=job_description, status='completed'
+            )
+            InterviewAnswer.objects.bulk_create([
+                InterviewAnswer(
+                    interview=interview,
+                    question=question,
+                    # About one answer in ten is too short for the model
+                    transcript=' '.join(rng.choices(WORDS, k=rng.choice([3] + [40] * 9))),
+                )
+                for question in questions
+            ])
+            interviews.append(interview)
+        return job_description, interviews
+
+    def _clean_up(self, job_description, interviews, model_name):
+        cache = ScoreCache()
+        keys = [
+            cache.key(answer.question.question_text, answer.transcript, answer.question.expected_keywords, model_name)
+            for answer in InterviewAnswer.objects.filter(interview__in=interviews).select_related('question')
+        ]
+        ScoreCacheEntry.objects.filter(key__in=keys).delete()
+        Candidate.objects.filter(interviews__in=interviews).delete()
+        job_description.delete()
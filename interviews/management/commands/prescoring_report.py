@@ -0,0 +1,48 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count
+from django.utils import timezone
+
+from interviews.models import InterviewAnswer
+
+
+class Command(BaseCommand):
+    help = "Report how many interview answers were scored locally instead of by the AI model"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="Only count answers from the last N days")
+        parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        answers = InterviewAnswer.objects.filter(score__isnull=False).exclude(score_source='')
+        if options['days']:
+            answers = answers.filter(answered_at__gte=timezone.now() - timedelta(days=options['days']))
+
+        by_source = {
+            row['score_source']: {'answers': row['answers'], 'average_score': round(row['average_score'], 2)}
+            for row in answers.values('score_source').annotate(answers=Count('id'), average_score=Avg('score'))
+        }
+        local = by_source.get('local', {}).get('answers', 0)
+        total = sum(source['answers'] for source in by_source.values())
+        report = {
+            'days': options['days'],
+            'scored_answers': total,
+            'by_source': by_source,
+            'model_scorings_saved': local,
+            'saved_fraction': round(local / total, 3) if total else None,
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        if not total:
+            self.stdout.write("No answers scored with a recorded source yet")
+            return
+        for source, stats in sorted(by_source.items()):
+            self.stdout.write(f"  {source:<6} {stats['answers']:>8} answers  average score {stats['average_score']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{local} of {total} answers ({report['saved_fraction']:.1%}) were scored without a model call"
+        ))
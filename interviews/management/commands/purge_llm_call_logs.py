@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from interviews.models import LLMCallLog
+
+
+class Command(BaseCommand):
+    help = "Delete model call logs older than AI_CALL_LOG_RETENTION_DAYS (interview totals are kept)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help=f"Maximum age to keep, in days (default: {settings.AI_CALL_LOG_RETENTION_DAYS})"
+        )
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.AI_CALL_LOG_RETENTION_DAYS
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = LLMCallLog.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} model call logs; {LLMCallLog.objects.count()} remain"
+        ))
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from interviews.models import ScoreCacheEntry
+from interviews.scoring import ScoreCache
+
+
+class Command(BaseCommand):
+    help = "Delete cached answer scores older than SCORE_CACHE_MAX_AGE_DAYS"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help=f"Maximum age to keep, in days (default: {settings.SCORE_CACHE_MAX_AGE_DAYS})"
+        )
+        parser.add_argument('--all', action='store_true', help="Delete every cached score")
+
+    def handle(self, *args, **options):
+        cache = ScoreCache()
+        if options['all']:
+            deleted, _ = ScoreCacheEntry.objects.all().delete()
+        else:
+            deleted = cache.purge(options['days'])
+        stats = cache.stats()
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats['hit_rate'] is not None else "n/a"
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} cached answer scores; {stats['entries']} remain (hit rate {hit_rate})"
+        ))
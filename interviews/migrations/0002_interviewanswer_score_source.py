@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewanswer',
+            name='score_source',
+            field=models.CharField(blank=True, choices=[('ai', 'AI'), ('local', 'Local Pre-scorer')], max_length=10),
+        ),
+    ]
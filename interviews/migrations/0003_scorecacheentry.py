@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0002_interviewanswer_score_source'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('model_name', models.CharField(max_length=100)),
+                ('prompt_version', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('feedback', models.TextField(blank=True)),
+                ('strengths', models.JSONField(blank=True, default=list)),
+                ('improvements', models.JSONField(blank=True, default=list)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('last_hit_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_scorecacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='ai_call_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='ai_cost',
+            field=models.DecimalField(decimal_places=6, default=0, help_text='Estimated USD', max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='ai_latency',
+            field=models.FloatField(default=0.0, help_text='Seconds spent in model calls'),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='ai_tokens',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='LLMCallLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('questions', 'Question Generation'), ('score', 'Answer Scoring'), ('batch_scores', 'Batch Answer Scoring'), ('recommendation', 'Recommendation')], max_length=20)),
+                ('model_name', models.CharField(max_length=100)),
+                ('backend', models.CharField(max_length=50)),
+                ('outcome', models.CharField(choices=[('ok', 'OK'), ('fallback', 'Fallback'), ('error', 'Error'), ('unavailable', 'Unavailable')], max_length=20)),
+                ('latency', models.FloatField(help_text='Seconds')),
+                ('prompt_tokens', models.PositiveIntegerField(default=0)),
+                ('response_tokens', models.PositiveIntegerField(default=0)),
+                ('cost', models.DecimalField(decimal_places=6, default=0, help_text='Estimated USD', max_digits=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('interview', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='interviews.interview')),
+                ('job_description', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='interviews.jobdescription')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0004_llmcalllog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewanswer',
+            name='scoring_model',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='llmcalllog',
+            name='outcome',
+            field=models.CharField(choices=[('ok', 'OK'), ('fallback', 'Fallback'), ('error', 'Error'), ('unavailable', 'Unavailable'), ('cancelled', 'Cancelled')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0005_interviewanswer_scoring_model'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='llmcalllog',
+            name='outcome',
+            field=models.CharField(choices=[('ok', 'OK'), ('fallback', 'Fallback'), ('error', 'Error'), ('unavailable', 'Unavailable'), ('cancelled', 'Cancelled'), ('coalesced', 'Coalesced')], max_length=20),
+        ),
+    ]
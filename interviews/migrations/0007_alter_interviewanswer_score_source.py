@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0006_alter_llmcalllog_outcome'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interviewanswer',
+            name='score_source',
+            field=models.CharField(blank=True, choices=[('ai', 'AI'), ('local', 'Local Pre-scorer'), ('unscorable', 'Could Not Be Scored')], max_length=10),
+        ),
+    ]
@@ -59,6 +59,11 @@ class Interview(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     total_score = models.FloatField(null=True, blank=True)
     recommendation = models.TextField(blank=True)
+    # Totals of the model calls made for this interview (see LLMCallLog)
+    ai_call_count = models.PositiveIntegerField(default=0)
+    ai_latency = models.FloatField(default=0.0, help_text="Seconds spent in model calls")
+    ai_tokens = models.PositiveIntegerField(default=0)
+    ai_cost = models.DecimalField(max_digits=10, decimal_places=6, default=0, help_text="Estimated USD")
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -69,6 +74,12 @@ class Interview(models.Model):
 
 
 class InterviewAnswer(models.Model):
+    SCORE_SOURCE_CHOICES = [
+        ('ai', 'AI'),
+        ('local', 'Local Pre-scorer'),
+        ('unscorable', 'Could Not Be Scored'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     interview = models.ForeignKey(Interview, on_delete=models.CASCADE)
     question = models.ForeignKey(InterviewQuestion, on_delete=models.CASCADE)
@@ -77,6 +88,9 @@ class InterviewAnswer(models.Model):
     audio_duration = models.FloatField(null=True, blank=True)
     score = models.FloatField(null=True, blank=True)
     feedback = models.TextField(blank=True)
+    score_source = models.CharField(max_length=10, choices=SCORE_SOURCE_CHOICES, blank=True)
+    # Model that produced an AI score; hedged calls may be answered by AI_FALLBACK_MODEL
+    scoring_model = models.CharField(max_length=100, blank=True)
     answered_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -85,3 +99,56 @@ class InterviewAnswer(models.Model):
     class Meta:
         unique_together = ['interview', 'question']
         ordering = ['question__order']
+
+
+class ScoreCacheEntry(models.Model):
+    """AI score of an answer keyed by a hash of question, transcript, keywords, prompt version and model"""
+    key = models.CharField(max_length=64, unique=True)
+    model_name = models.CharField(max_length=100)
+    prompt_version = models.PositiveIntegerField()
+    score = models.FloatField()
+    feedback = models.TextField(blank=True)
+    strengths = models.JSONField(default=list, blank=True)
+    improvements = models.JSONField(default=list, blank=True)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    last_hit_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.key[:12]} ({self.model_name}, v{self.prompt_version})"
+
+
+class LLMCallLog(models.Model):
+    """One model call: what it was for, how long it took, its token counts and estimated cost"""
+    KIND_CHOICES = [
+        ('questions', 'Question Generation'),
+        ('score', 'Answer Scoring'),
+        ('batch_scores', 'Batch Answer Scoring'),
+        ('recommendation', 'Recommendation'),
+    ]
+    OUTCOME_CHOICES = [
+        ('ok', 'OK'),
+        ('fallback', 'Fallback'),
+        ('error', 'Error'),
+        ('unavailable', 'Unavailable'),
+        ('cancelled', 'Cancelled'),
+        ('coalesced', 'Coalesced'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    model_name = models.CharField(max_length=100)
+    backend = models.CharField(max_length=50)
+    outcome = models.CharField(max_length=20, choices=OUTCOME_CHOICES)
+    latency = models.FloatField(help_text="Seconds")
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    response_tokens = models.PositiveIntegerField(default=0)
+    cost = models.DecimalField(max_digits=10, decimal_places=6, default=0, help_text="Estimated USD")
+    interview = models.ForeignKey(Interview, on_delete=models.SET_NULL, null=True, blank=True)
+    job_description = models.ForeignKey(JobDescription, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.model_name} {self.outcome} ({self.latency:.2f}s)"
+
+    class Meta:
+        ordering = ['-created_at']
@@ -0,0 +1,80 @@
+import re
+from typing import Dict, List, Set
+
+from django.conf import settings
+
+
+# Stored by the voice webhooks until Twilio delivers the real transcription
+TRANSCRIPT_PENDING = 'Transcription pending...'
+
+PLACEHOLDER_TRANSCRIPTS = {
+    TRANSCRIPT_PENDING.lower(),
+    'transcription will be provided by twilio webhook',
+}
+
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.']*", re.IGNORECASE)
+
+# Longest suffixes first; enough to match "deploying"/"deployed"/"deployment"
+SUFFIXES = [
+    'izations', 'ization', 'ational', 'fulness', 'ousness', 'iveness', 'izing', 'ations', 'ation',
+    'ating', 'ated', 'ates', 'ate', 'ments', 'ment', 'ized', 'izes', 'ize', 'ness', 'ings', 'ing', 'ies', 'ied', 'ers', 'er', 'ed', 'ly', 's',
+]
+
+
+def stem(word: str) -> str:
+    """Light suffix-stripping stemmer; keeps at least three characters of the word"""
+    word = word.lower().strip(".'")
+    for suffix in SUFFIXES:
+        # "class" keeps its s
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith('ss'):
+            word = word[:-len(suffix)]
+            break
+    # "services" -> "service" -> "servic", matching "service"
+    if len(word) > 4 and word.endswith('e'):
+        word = word[:-1]
+    # "running" -> "runn" -> "run"
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'ls':
+        word = word[:-1]
+    return word
+
+
+def _stems(text: str) -> Set[str]:
+    return {stem(word) for word in WORD_PATTERN.findall(text)}
+
+
+def is_pending(transcript: str) -> bool:
+    """Whether the transcript is a placeholder for a transcription that has not arrived yet"""
+    return transcript.strip().lower() in PLACEHOLDER_TRANSCRIPTS
+
+
+def prescore(transcript: str, expected_keywords: List[str]) -> Dict:
+    """Deterministic features of an answer, and a local score for trivial ones
+
+    Keywords match on word stems, and multi-word keywords need every word
+    present. Answers shorter than AI_PRESCORE_MIN_WORDS are 'trivial' and
+    get a local score (at most the 2 keyword points of the scoring rubric),
+    so they never need a model call.
+    """
+    words = WORD_PATTERN.findall(transcript or '')
+    transcript_stems = {stem(word) for word in words}
+    keywords = [keyword for keyword in expected_keywords or [] if keyword and keyword.strip()]
+    matched = [keyword for keyword in keywords if _stems(keyword) <= transcript_stems]
+    coverage = len(matched) / len(keywords) if keywords else 0.0
+
+    result = {
+        'word_count': len(words),
+        'matched_keywords': matched,
+        'keyword_coverage': round(coverage, 2),
+        'trivial': len(words) < settings.AI_PRESCORE_MIN_WORDS,
+    }
+    if not words:
+        result.update(score=0.0, feedback="No answer was given.")
+    elif result['trivial']:
+        result.update(
+            score=round(2.0 * coverage, 1),
+            feedback=(
+                f"Answer too short to evaluate ({len(words)} words)."
+                + (f" Mentioned: {', '.join(matched)}." if matched else "")
+            ),
+        )
+    return result
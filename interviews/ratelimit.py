@@ -0,0 +1,158 @@
+import random
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .budget import count_tokens
+
+
+class AIServiceUnavailable(Exception):
+    """Raised when a model call is refused by the rate limiter or circuit breaker, or fails transiently
+
+    Callers should retry after ``retry_after`` seconds instead of storing
+    fallback results.
+    """
+
+    def __init__(self, reason: str, retry_after: float = 60.0):
+        self.reason = reason
+        self.retry_after = max(1.0, retry_after)
+        super().__init__(f"AI service unavailable: {reason} (retry after {self.retry_after:.0f}s)")
+
+
+# In-memory stand-in for the shared cache, for tests and single-process setups
+_memory_cache = LocMemCache('ai-ratelimit', {})
+
+
+def get_limiter_cache():
+    """Cache shared by every process (AI_RATE_LIMIT_BACKEND='cache') or local to this one ('memory')"""
+    if settings.AI_RATE_LIMIT_BACKEND == 'memory':
+        return _memory_cache
+    return default_cache
+
+
+def _incr(cache, key: str, amount: int, timeout: int) -> int:
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key, amount)
+    except ValueError:
+        # The key expired between add() and incr()
+        cache.add(key, 0, timeout=timeout)
+        return cache.incr(key, amount)
+
+
+class TokenBucket:
+    """Requests-per-minute and tokens-per-minute budget for model calls
+
+    The buckets refill at the start of every minute and are counted with the
+    cache's atomic incr, so with a shared cache backend (Redis) every web
+    and Celery process draws from the same budget. A limit of 0 disables
+    that bucket.
+    """
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int, cache=None):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.cache = cache or get_limiter_cache()
+
+    def try_acquire(self, tokens: int = 0) -> float:
+        """Take one request and ``tokens`` tokens; returns 0 on success or the seconds until the next refill"""
+        now = time.time()
+        window = int(now // 60)
+        taken = []
+        for bucket, amount, limit in (('requests', 1, self.requests_per_minute),
+                                      ('tokens', tokens, self.tokens_per_minute)):
+            if not limit or not amount:
+                continue
+            # A call larger than the whole budget still goes through on an empty bucket
+            amount = min(amount, limit)
+            key = f"{self.name}:{bucket}:{window}"
+            count = _incr(self.cache, key, amount, timeout=120)
+            taken.append((key, amount))
+            if count > limit:
+                for taken_key, taken_amount in taken:
+                    self.cache.decr(taken_key, taken_amount)
+                return 60 - now % 60
+        return 0.0
+
+    def acquire(self, tokens: int = 0, max_wait: float = 0.0):
+        """Wait up to max_wait seconds for budget; raises AIServiceUnavailable if none frees up"""
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise AIServiceUnavailable('rate limit reached', retry_after=wait)
+            # Jitter keeps waiting processes from all retrying at the same instant
+            time.sleep(wait + random.uniform(0, 1))
+
+    def usage(self) -> Dict:
+        window = int(time.time() // 60)
+        return {
+            'requests_per_minute': self.requests_per_minute,
+            'tokens_per_minute': self.tokens_per_minute,
+            'requests_this_minute': self.cache.get(f"{self.name}:requests:{window}", 0),
+            'tokens_this_minute': self.cache.get(f"{self.name}:tokens:{window}", 0),
+        }
+
+
+class CircuitBreaker:
+    """Stop calling the model for a cooldown once its recent error rate is too high
+
+    Outcomes are counted per ``window`` seconds in the cache. When at least
+    ``min_calls`` calls were made in the window and the share of failures
+    reaches ``error_rate``, the circuit opens for ``cooldown`` seconds and
+    calls are refused. After the cooldown, calls flow again and the error
+    rate is measured afresh.
+    """
+
+    def __init__(self, name: str, error_rate: float, min_calls: int, window: int, cooldown: int, cache=None):
+        self.name = name
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.cooldown = cooldown
+        self.cache = cache or get_limiter_cache()
+        self._open_key = f"{name}:open_until"
+
+    def retry_after(self) -> float:
+        """Seconds until calls are allowed again; 0 while the circuit is closed"""
+        open_until = self.cache.get(self._open_key)
+        return max(0.0, open_until - time.time()) if open_until else 0.0
+
+    def check(self):
+        retry_after = self.retry_after()
+        if retry_after:
+            raise AIServiceUnavailable('circuit open after repeated errors', retry_after=retry_after)
+
+    def record(self, success: bool):
+        window = int(time.time() // self.window)
+        calls_key = f"{self.name}:calls:{window}"
+        failures_key = f"{self.name}:failures:{window}"
+        calls = _incr(self.cache, calls_key, 1, timeout=self.window * 2)
+        if success:
+            return
+
+        failures = _incr(self.cache, failures_key, 1, timeout=self.window * 2)
+        if calls >= self.min_calls and failures / calls >= self.error_rate:
+            self.cache.set(self._open_key, time.time() + self.cooldown, timeout=self.cooldown)
+            self.cache.delete_many([calls_key, failures_key])
+
+    def state(self) -> Dict:
+        window = int(time.time() // self.window)
+        retry_after = self.retry_after()
+        return {
+            'open': bool(retry_after),
+            'retry_after': round(retry_after, 1),
+            'calls_in_window': self.cache.get(f"{self.name}:calls:{window}", 0),
+            'failures_in_window': self.cache.get(f"{self.name}:failures:{window}", 0),
+        }
+
+
+def estimate_tokens(prompt: str, max_output_tokens: Optional[int] = None) -> int:
+    """Estimated token count of a call: the prompt's tokens plus the output budget"""
+    return count_tokens(prompt) + (max_output_tokens or 0)
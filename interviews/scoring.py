@@ -0,0 +1,328 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .batching import get_scoring_batcher
+from .budget import compress_transcript
+from .hedging import call_deadline
+from .instrumentation import in_context, llm_context
+from .models import InterviewAnswer, ScoreCacheEntry
+from .prescoring import is_pending, prescore
+from .ratelimit import AIServiceUnavailable
+from .services import SCORING_PROMPT_VERSION, get_ai_service
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_scoring_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by all scoring in this process, capping concurrent model calls
+
+    The cap is AI_SCORING_CONCURRENCY per worker process, however many
+    interviews are being scored at once.
+    """
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.AI_SCORING_CONCURRENCY), thread_name_prefix='ai-scoring'
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+class ScoreCache:
+    """Persistent memo of AI answer scores
+
+    Entries are keyed by a hash of the question, transcript, expected
+    keywords, SCORING_PROMPT_VERSION and model, so task retries, redelivered
+    webhooks and rescoring of an unchanged answer reuse the stored score
+    instead of calling the model. The key names the configured model; an
+    entry's model_name is the one that answered, which differs when a hedged
+    call was won by the fallback model. Entries older than
+    SCORE_CACHE_MAX_AGE_DAYS are ignored and removed by purge.
+    """
+
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    def key(self, question: str, transcript: str, expected_keywords: List[str], model_name: str) -> str:
+        payload = json.dumps(
+            [question, transcript, list(expected_keywords or []), SCORING_PROMPT_VERSION, model_name],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _fresh(self):
+        cutoff = timezone.now() - timedelta(days=settings.SCORE_CACHE_MAX_AGE_DAYS)
+        return ScoreCacheEntry.objects.filter(created_at__gte=cutoff)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Return stored scores for the given keys in one query, keyed by key"""
+        if not keys:
+            return {}
+        entries = self._fresh().filter(key__in=set(keys))
+        results = {
+            entry.key: {
+                'score': entry.score,
+                'feedback': entry.feedback,
+                'strengths': entry.strengths,
+                'improvements': entry.improvements,
+                'model': entry.model_name,
+            }
+            for entry in entries
+        }
+        if results:
+            entries.update(hit_count=F('hit_count') + 1, last_hit_at=timezone.now())
+
+        hits = sum(1 for key in keys if key in results)
+        with self._lock:
+            ScoreCache.hits += hits
+            ScoreCache.misses += len(keys) - hits
+        return results
+
+    def set_many(self, model_name: str, results: Dict[str, Dict]):
+        """Store validated scores keyed by key, ignoring ones already stored
+
+        model_name is recorded for results without the 'model' that scored them.
+        """
+        ScoreCacheEntry.objects.bulk_create([
+            ScoreCacheEntry(
+                key=key,
+                model_name=result.get('model') or model_name,
+                prompt_version=SCORING_PROMPT_VERSION,
+                score=result['score'],
+                feedback=result['feedback'],
+                strengths=result['strengths'],
+                improvements=result['improvements'],
+            )
+            for key, result in results.items()
+        ], ignore_conflicts=True)
+
+    def purge(self, max_age_days: Optional[int] = None) -> int:
+        """Delete entries older than max_age_days (default SCORE_CACHE_MAX_AGE_DAYS); returns the number removed"""
+        if max_age_days is None:
+            max_age_days = settings.SCORE_CACHE_MAX_AGE_DAYS
+        cutoff = timezone.now() - timedelta(days=max_age_days)
+        deleted, _ = ScoreCacheEntry.objects.filter(created_at__lt=cutoff).delete()
+        return deleted
+
+    def stats(self) -> Dict:
+        """Lookups by this process, and hits recorded on the stored entries by all processes"""
+        with self._lock:
+            hits, misses = ScoreCache.hits, ScoreCache.misses
+        stored = self._fresh().aggregate(total_hits=Sum('hit_count'))
+        entries = self._fresh().count()
+        total_hits = stored['total_hits'] or 0
+        return {
+            'process_hits': hits,
+            'process_misses': misses,
+            'process_hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+            'entries': entries,
+            # Every entry was stored after one miss
+            'hit_rate': round(total_hits / (total_hits + entries), 3) if entries else None,
+        }
+
+
+def _score_item(answer, features: Dict) -> Dict:
+    return {
+        'question': answer.question.question_text,
+        'answer': answer.transcript,
+        'expected_keywords': answer.question.expected_keywords,
+        'features': features,
+    }
+
+
+def score_answers(answers: List[InterviewAnswer], ai_service=None, share_batches: bool = True) -> List[Dict]:
+    """Score answers concurrently; returns one score dict per answer, in order
+
+    AI results carry the 'model' that scored them.
+
+    Each answer is pre-scored locally first: empty and very short answers
+    keep the local score (source 'local') and never reach the model. Answers
+    already in the ScoreCache reuse their stored score. The rest are grouped
+    into batches of AI_SCORING_BATCH_SIZE, one model call each (a size of 1
+    disables batching), with the pre-scorer's findings added to the prompt.
+    With AI_SCORING_BATCH_WINDOW set and share_batches, batches are filled
+    across all answers being scored in the process for that long (see
+    ScoringBatcher), so interviews scored together by a threaded worker
+    share model calls; latency-bound callers pass share_batches=False.
+    Batches, and the
+    single-answer retries of items a batch could not score, run
+    concurrently on the shared scoring thread pool.
+    """
+    # Model calls are attributed to the interview when all answers belong to one
+    interview_ids = {answer.interview_id for answer in answers}
+    with llm_context(**({'interview_id': interview_ids.pop()} if len(interview_ids) == 1 else {})):
+        return _score_answers(answers, ai_service or get_ai_service(), share_batches)
+
+
+def _score_answers(answers: List[InterviewAnswer], ai_service, share_batches: bool) -> List[Dict]:
+    executor = get_scoring_executor()
+    batch_size = max(1, settings.AI_SCORING_BATCH_SIZE)
+
+    features = [prescore(answer.transcript, answer.question.expected_keywords) for answer in answers]
+    results = [
+        {'score': feature['score'], 'feedback': feature['feedback'], 'source': 'local'} if feature['trivial'] else None
+        for feature in features
+    ]
+    remote = [index for index, result in enumerate(results) if result is None]
+
+    # Answers scored before (retries, redelivered webhooks) come from the score cache
+    cache = ScoreCache()
+    keys = {
+        index: cache.key(
+            answers[index].question.question_text,
+            answers[index].transcript,
+            answers[index].question.expected_keywords,
+            ai_service.model_name
+        )
+        for index in remote
+    }
+    cached = cache.get_many(list(keys.values()))
+    for index in remote:
+        results[index] = cached.get(keys[index])
+    misses = [index for index in remote if results[index] is None]
+
+    if batch_size > 1 and share_batches and settings.AI_SCORING_BATCH_WINDOW > 0:
+        futures = get_scoring_batcher(ai_service, executor).submit(
+            [_score_item(answers[index], features[index]) for index in misses],
+            [answers[index].interview_id for index in misses]
+        )
+        deadline = call_deadline()
+        for index, future in zip(misses, futures):
+            try:
+                results[index] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                raise AIServiceUnavailable('deadline exceeded waiting for a scoring batch', retry_after=5)
+    elif batch_size > 1:
+        batches = [misses[start:start + batch_size] for start in range(0, len(misses), batch_size)]
+        for batch, batch_results in zip(batches, executor.map(
+            in_context(lambda batch: ai_service.score_answers_batch([
+                _score_item(answers[index], features[index]) for index in batch
+            ])),
+            batches
+        )):
+            for index, score_data in zip(batch, batch_results):
+                results[index] = score_data
+
+    retry = [index for index in misses if results[index] is None]
+    if retry and batch_size > 1:
+        logger.warning(f"Batch scoring fell back to {len(retry)} single-answer calls")
+    retried = executor.map(
+        in_context(lambda index: ai_service.score_answer(
+            answers[index].question.question_text,
+            answers[index].transcript,
+            answers[index].question.expected_keywords,
+            features=features[index]
+        )),
+        retry
+    )
+    for index, score_data in zip(retry, retried):
+        results[index] = score_data
+
+    # Fallback results of failed calls are not valid scores and are not stored
+    fresh = {}
+    for index in misses:
+        validated = not results[index].get('fallback') and ai_service.validate_score(results[index])
+        if validated:
+            fresh[keys[index]] = dict(validated, model=results[index].get('model'))
+    cache.set_many(ai_service.model_name, fresh)
+
+    for index in remote:
+        results[index]['source'] = 'ai'
+    return results
+
+
+def score_interview(interview, ai_service=None, finalize: bool = False) -> Optional[float]:
+    """Score an interview's unscored answers and store its total score and recommendation
+
+    Trivial answers are scored locally and model calls run concurrently (see
+    score_answers); all answer scores are written with one bulk_update.
+    Answers the model failed to score are left unscored and
+    AIServiceUnavailable is raised, so the caller retries later; with
+    finalize (the last retry), they are marked 'unscorable' instead and the
+    total and recommendation come from the answers that were scored.
+    Every model call is logged and added to the interview's AI usage totals.
+    Returns the interview's total score, or None if nothing was scored.
+    """
+    with llm_context(interview_id=interview.id, job_description_id=interview.job_description_id):
+        return _score_interview(interview, ai_service or get_ai_service(), finalize)
+
+
+def _score_interview(interview, ai_service, finalize: bool) -> Optional[float]:
+    answers = list(
+        InterviewAnswer.objects.filter(interview=interview).select_related('question').order_by('question__order')
+    )
+
+    # Placeholders are scored when the transcription webhook delivers the text
+    pending = [
+        answer for answer in answers
+        if answer.score is None and answer.transcript and not is_pending(answer.transcript)
+        and answer.score_source != 'unscorable'
+    ]
+    unscorable = 0
+    if pending:
+        scored_now = []
+        for answer, score_data in zip(pending, score_answers(pending, ai_service)):
+            # Placeholder results of failed model calls are not scores; the answer stays unscored
+            if score_data.get('fallback'):
+                unscorable += 1
+                if finalize:
+                    answer.feedback = 'This answer could not be scored automatically.'
+                    answer.score_source = 'unscorable'
+                    scored_now.append(answer)
+                continue
+            answer.score = score_data.get('score', 0)
+            answer.feedback = score_data.get('feedback', '')
+            answer.score_source = score_data['source']
+            answer.scoring_model = score_data.get('model') or ''
+            scored_now.append(answer)
+        with transaction.atomic():
+            InterviewAnswer.objects.bulk_update(scored_now, ['score', 'feedback', 'score_source', 'scoring_model'])
+    if unscorable and not finalize:
+        # Retried through the deferral path instead of averaging a partial total
+        raise AIServiceUnavailable(f"{unscorable} answers could not be scored", retry_after=60)
+    if unscorable:
+        logger.error(
+            f"Interview {interview.id} finalized without {unscorable} answers the model could not score"
+        )
+
+    scored = [answer for answer in answers if answer.score is not None]
+    if not scored:
+        return None
+
+    interview.total_score = sum(answer.score for answer in scored) / len(scored)
+
+    # Generate final recommendation; each answer gets an equal share of the summary's token budget
+    answer_budget = settings.AI_SUMMARY_TOKEN_BUDGET // max(1, len(answers)) if settings.AI_SUMMARY_TOKEN_BUDGET else 0
+    interview_data = {
+        'candidate_name': interview.candidate.name,
+        'total_score': interview.total_score,
+        'individual_scores': [a.score for a in answers if a.score],
+        'qa_summary': '\n'.join([
+            f"Q: {a.question.question_text}\nA: {compress_transcript(a.transcript, answer_budget)}"
+            for a in answers if a.transcript
+        ])
+    }
+
+    interview.recommendation = ai_service.generate_final_recommendation(interview_data)
+    # The AI usage totals are incremented in the database by llm_context
+    interview.save(update_fields=['total_score', 'recommendation'])
+    return interview.total_score
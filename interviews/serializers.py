@@ -22,8 +22,11 @@ class InterviewAnswerSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = InterviewAnswer
-        fields = ['id', 'question', 'transcript', 'audio_url', 'audio_duration', 'score', 'feedback', 'answered_at']
-        read_only_fields = ['id', 'answered_at']
+        fields = [
+            'id', 'question', 'transcript', 'audio_url', 'audio_duration', 'score', 'feedback', 'score_source',
+            'scoring_model', 'answered_at'
+        ]
+        read_only_fields = ['id', 'score_source', 'scoring_model', 'answered_at']
 
 
 class InterviewSerializer(serializers.ModelSerializer):
@@ -37,9 +40,9 @@ class InterviewSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'candidate_name', 'candidate_phone', 'job_title', 'status', 
             'call_sid', 'started_at', 'completed_at', 'total_score', 
-            'recommendation', 'created_at', 'answers'
+            'recommendation', 'ai_call_count', 'ai_latency', 'ai_tokens', 'ai_cost', 'created_at', 'answers'
         ]
-        read_only_fields = ['id', 'created_at', 'call_sid']
+        read_only_fields = ['id', 'created_at', 'call_sid', 'ai_call_count', 'ai_latency', 'ai_tokens', 'ai_cost']
 
 
 class CreateInterviewSerializer(serializers.Serializer):
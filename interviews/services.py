@@ -1,22 +1,430 @@
-import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from django.conf import settings
-from typing import List, Dict
-import re
+from typing import Callable, Iterator, List, Dict, Optional
+import copy
+import hashlib
+import os
 import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import contextmanager
+
+from .backends import LLMBackend, get_backend
+from .budget import (
+    PromptBudgetStats, compress_job_description, compress_summary, compress_transcript, count_tokens, fit
+)
+from .cache import TTLLRUCache
+from .hedging import HedgeStats, call_deadline, get_hedge_executor
+from .instrumentation import LLMCall, record
+from .json_stream import ExtractionStats, JSONArrayStream, extract_json
+from .ratelimit import AIServiceUnavailable, CircuitBreaker, TokenBucket, estimate_tokens
+from .singleflight import SingleFlight
+
+# Bump whenever the question generation prompt changes; cached questions
+# generated with other versions are then ignored
+QUESTION_PROMPT_VERSION = 2
+# Same for the answer scoring prompts and the persistent score cache
+SCORING_PROMPT_VERSION = 2
+
+# Provider errors worth retrying later (quota, overload, timeouts)
+TRANSIENT_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.RetryError,
+)
 
 
 class AIService:
     """Service for AI-powered question generation and scoring"""
     
-    def __init__(self):
-        genai.configure(api_key=settings.GEMINI_API_KEY)
+    def __init__(self, model_name: Optional[str] = None, backend: Optional[LLMBackend] = None,
+                 hedge_backend: Optional[LLMBackend] = None):
         # self.model = genai.GenerativeModel('gemini-pro')
-        self.model = genai.GenerativeModel('gemini-2.5-pro')
         # self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model_name = model_name or settings.GEMINI_MODEL
+        self.backend = backend or get_backend(self.model_name)
+        # Faster model that slow calls are hedged with (see _generate)
+        fallback_model = settings.AI_FALLBACK_MODEL if settings.AI_FALLBACK_MODEL != self.model_name else ''
+        self.hedge_backend = hedge_backend or (get_backend(fallback_model) if fallback_model else None)
+        self.created_at = time.time()
+        self.warmed = False
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.question_cache = TTLLRUCache(settings.QUESTION_CACHE_SIZE, settings.QUESTION_CACHE_TTL)
+        self.json_stats = ExtractionStats()
+        self.prompt_stats = PromptBudgetStats()
+        self.hedge_stats = HedgeStats()
+        self.single_flight = SingleFlight(
+            'ai:gemini:flight', settings.AI_SINGLE_FLIGHT_RESULT_TTL
+        ) if settings.AI_SINGLE_FLIGHT else None
+        self.rate_limiter = TokenBucket(
+            'ai:gemini', settings.AI_REQUESTS_PER_MINUTE, settings.AI_TOKENS_PER_MINUTE
+        )
+        # Quotas are per model, so hedges draw from their own budget
+        self.hedge_limiter = TokenBucket(
+            f"ai:gemini:{self.hedge_backend.model_name}", settings.AI_REQUESTS_PER_MINUTE,
+            settings.AI_TOKENS_PER_MINUTE
+        ) if self.hedge_backend else None
+        self.circuit_breaker = CircuitBreaker(
+            'ai:gemini:circuit',
+            error_rate=settings.AI_CIRCUIT_ERROR_RATE,
+            min_calls=settings.AI_CIRCUIT_MIN_CALLS,
+            window=settings.AI_CIRCUIT_WINDOW,
+            cooldown=settings.AI_CIRCUIT_COOLDOWN,
+        )
+    
+    def warm_up(self):
+        """Create the backend's API client now instead of on the first request"""
+        self.backend.warm_up()
+        self.warmed = True
+    
+    def stats(self) -> Dict:
+        """Call counters for this process's client"""
+        with self._stats_lock:
+            calls, errors, total_latency = self.calls, self.errors, self.total_latency
+        return {
+            'initialized': True,
+            'pid': os.getpid(),
+            'model': self.model_name,
+            'fallback_model': self.hedge_backend.model_name if self.hedge_backend else None,
+            'backend': self.backend.name,
+            'transport': settings.GEMINI_TRANSPORT or 'grpc',
+            'warmed': self.warmed,
+            'uptime': round(time.time() - self.created_at, 3),
+            'calls': calls,
+            'errors': errors,
+            'average_latency': round(total_latency / calls, 3) if calls else None,
+            'question_cache': self.question_cache.stats(),
+            'json_extraction': self.json_stats.stats(),
+            'prompt_tokens': self.prompt_stats.stats(),
+            'hedging': self.hedge_stats.stats(),
+            'single_flight': self.single_flight.stats() if self.single_flight else None,
+            'rate_limit': self.rate_limiter.usage(),
+            'circuit': self.circuit_breaker.state(),
+        }
+    
+    def _generate(self, prompt: str, call: LLMCall, expect: Optional[str] = None, **generation_config) -> str:
+        """Call the model and return the response text, recording latency and errors
+        
+        Calls wait for the shared rate limit budget and are refused while the
+        circuit breaker is open. Refusals and transient provider errors raise
+        AIServiceUnavailable, which callers must not turn into fallback scores.
+        Every call must finish by its deadline (see hedging.call_deadline) or
+        raises AIServiceUnavailable too.
+        
+        With a fallback model (AI_FALLBACK_MODEL), a primary request that has
+        not answered after AI_HEDGE_DELAY seconds (at most half the time left
+        to the deadline), or failed sooner, is hedged: the same prompt also
+        goes to the fallback model and the first valid response wins, i.e.
+        one containing JSON that starts with expect, if given. The other
+        request is abandoned and recorded as 'cancelled'.
+        
+        Identical concurrent calls (same model, prompt and generation config),
+        in this process or any other sharing the cache, are coalesced into one
+        (see SingleFlight); the others wait for it, share its response and are
+        recorded as 'coalesced', without tokens or cost.
+        The call's latency, response tokens and answering model are stored on call.
+        """
+        deadline = call_deadline()
+        if self.single_flight is None:
+            return self._generate_once(prompt, call, expect, generation_config, deadline)
+        
+        started = time.monotonic()
+        key = self.single_flight.key(self.model_name, prompt, generation_config)
+        (text, model_name), shared = self.single_flight.do(
+            key,
+            lambda: (self._generate_once(prompt, call, expect, generation_config, deadline), call.model_name),
+            deadline
+        )
+        if shared:
+            call.model_name = model_name
+            call.outcome = 'coalesced'
+            call.prompt_tokens = call.response_tokens = 0
+            call.latency = time.monotonic() - started
+        return text
+    
+    def _generate_once(self, prompt: str, call: LLMCall, expect: Optional[str], generation_config: Dict,
+                       deadline: float) -> str:
+        self._acquire(prompt, generation_config, deadline)
+        if self.hedge_backend is None:
+            return self._invoke(self.backend, prompt, generation_config, deadline, call)
+        return self._generate_hedged(prompt, call, expect, generation_config, deadline)
+    
+    def _invoke(self, backend: LLMBackend, prompt: str, generation_config: Dict, deadline: float,
+                call: LLMCall) -> str:
+        """One backend request with the time left until deadline as its timeout"""
+        started = time.monotonic()
+        if deadline - started <= 0:
+            raise AIServiceUnavailable('deadline exceeded', retry_after=settings.AI_HEDGE_DELAY)
+        try:
+            text = backend.generate(prompt, generation_config, timeout=deadline - started)
+            call.response_tokens = count_tokens(text)
+        except Exception as e:
+            with self._stats_lock:
+                self.errors += 1
+            if isinstance(e, google_exceptions.DeadlineExceeded):
+                # Running out of our own deadline says nothing about the provider's health
+                raise AIServiceUnavailable('deadline exceeded', retry_after=settings.AI_HEDGE_DELAY) from e
+            if backend is self.backend:
+                self.circuit_breaker.record(success=False)
+            if isinstance(e, TRANSIENT_ERRORS):
+                raise AIServiceUnavailable(f"{e.__class__.__name__}: {e}") from e
+            raise
+        finally:
+            call.latency = time.monotonic() - started
+            with self._stats_lock:
+                self.calls += 1
+                self.total_latency += call.latency
+        
+        if backend is self.backend:
+            self.circuit_breaker.record(success=True)
+        return text
+    
+    def _generate_hedged(self, prompt: str, call: LLMCall, expect: Optional[str], generation_config: Dict,
+                         deadline: float) -> str:
+        executor = get_hedge_executor()
+        started = time.monotonic()
+        # Short deadlines hedge sooner, leaving the fallback model time to answer
+        hedge_at = started + min(settings.AI_HEDGE_DELAY, (deadline - started) / 2)
+        primary = LLMCall(call.kind, self.model_name, self.backend.name, prompt)
+        running = {
+            executor.submit(self._invoke, self.backend, prompt, generation_config, deadline, primary): primary
+        }
+        hedge = None
+        hedge_started = None
+        skipped = False
+        responses = {}
+        errors = {}
+        winner = None
+        
+        while running and winner is None:
+            wake_at = deadline if hedge or skipped else min(hedge_at, deadline)
+            done, _ = wait(running, timeout=max(0.0, wake_at - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                attempt = running.pop(future)
+                try:
+                    responses[attempt] = future.result()
+                except Exception as e:
+                    errors[attempt] = e
+                    attempt.outcome = 'unavailable' if isinstance(e, AIServiceUnavailable) else 'error'
+                    continue
+                if winner is None and (expect is None or extract_json(responses[attempt], expect)[0] is not None):
+                    winner = attempt
+                elif winner is None:
+                    attempt.outcome = 'fallback'
+            
+            now = time.monotonic()
+            if winner is None and hedge is None and not skipped and now < deadline and (now >= hedge_at or not running):
+                tokens = estimate_tokens(prompt, generation_config.get('max_output_tokens'))
+                if self.hedge_limiter.try_acquire(tokens) > 0:
+                    skipped = True
+                else:
+                    hedge = LLMCall(call.kind, self.hedge_backend.model_name, self.hedge_backend.name, prompt)
+                    hedge_started = now
+                    running[executor.submit(
+                        self._invoke, self.hedge_backend, prompt, generation_config, deadline, hedge
+                    )] = hedge
+            if now >= deadline:
+                break
+        
+        # The winner, else an invalid response for the caller's fallback handling, else the primary's failure
+        answered = winner or next((attempt for attempt in (primary, hedge) if attempt in responses), None)
+        chosen = answered or primary
+        
+        # Requests still running lost or ran out of time; they are not waited
+        # for, end by the deadline at the latest and their results are discarded
+        now = time.monotonic()
+        cancelled = {attempt: future.cancel() for future, attempt in running.items()}
+        for attempt in (primary, hedge):
+            if attempt is None or attempt is chosen or cancelled.get(attempt):
+                continue
+            if attempt in cancelled:
+                attempt = copy.copy(attempt)
+                attempt.outcome = 'cancelled'
+                attempt.latency = now - (hedge_started if attempt is hedge else started)
+            record(attempt)
+        
+        call.model_name, call.backend = chosen.model_name, chosen.backend
+        call.response_tokens = chosen.response_tokens
+        call.latency = time.monotonic() - started
+        timed_out = answered is None and (chosen not in errors or time.monotonic() >= deadline)
+        self.hedge_stats.record(
+            hedged=hedge is not None, hedge_won=winner is not None and winner is hedge, skipped=skipped,
+            deadline_exceeded=timed_out
+        )
+        if answered is not None:
+            return responses[answered]
+        if timed_out:
+            raise AIServiceUnavailable('deadline exceeded', retry_after=settings.AI_HEDGE_DELAY)
+        raise errors[chosen]
+    
+    def _acquire(self, prompt: str, generation_config: Dict, deadline: Optional[float] = None):
+        """Refuse the call while the circuit is open, else wait for rate limit budget (not past deadline)"""
+        self.circuit_breaker.check()
+        max_wait = settings.AI_RATE_LIMIT_MAX_WAIT
+        if deadline is not None:
+            max_wait = max(0.0, min(max_wait, deadline - time.monotonic()))
+        self.rate_limiter.acquire(
+            estimate_tokens(prompt, generation_config.get('max_output_tokens')),
+            max_wait=max_wait
+        )
+    
+    def _generate_stream(self, prompt: str, call: LLMCall, **generation_config) -> Iterator[str]:
+        """Like _generate, but yield the response text chunk by chunk as the model produces it"""
+        self._acquire(prompt, generation_config)
+        
+        started = time.monotonic()
+        try:
+            for text in self.backend.stream(prompt, generation_config):
+                call.response_tokens += count_tokens(text)
+                yield text
+        except Exception as e:
+            with self._stats_lock:
+                self.errors += 1
+            self.circuit_breaker.record(success=False)
+            if isinstance(e, TRANSIENT_ERRORS):
+                raise AIServiceUnavailable(f"{e.__class__.__name__}: {e}") from e
+            raise
+        finally:
+            call.latency = time.monotonic() - started
+            with self._stats_lock:
+                self.calls += 1
+                self.total_latency += call.latency
+        
+        self.circuit_breaker.record(success=True)
+    
+    def _record_prompt(self, kind: str, prompt: str, saved_tokens: int, budget: int) -> str:
+        """Count a prompt's tokens against its call type's budget; returns the prompt"""
+        self.prompt_stats.record(kind, count_tokens(prompt), saved_tokens, budget)
+        return prompt
+    
+    @contextmanager
+    def _track(self, kind: str, prompt: str) -> Iterator[LLMCall]:
+        """Measure the model call made in the block and record it (see instrumentation)"""
+        call = LLMCall(kind, self.model_name, self.backend.name, prompt)
+        try:
+            yield call
+        except AIServiceUnavailable:
+            call.outcome = 'unavailable'
+            raise
+        except Exception:
+            call.outcome = 'error'
+            raise
+        finally:
+            record(call)
+    
+    def _extract(self, call: LLMCall, text: str, opener: str, validate: Callable):
+        """extract_json followed by validate, counting the outcome under the call's kind for the stats
+        
+        Returns validate's result, or None if no JSON was found or it did not
+        pass validation ('invalid'); the call's outcome is then 'fallback'.
+        """
+        value, outcome = extract_json(text, opener)
+        if value is not None:
+            value = validate(value)
+            if not value:
+                outcome = 'invalid'
+        self.json_stats.record(call.kind, outcome)
+        if not value:
+            call.outcome = 'fallback'
+        return value or None
+    
+    def _validate_questions(self, data) -> Optional[List[Dict]]:
+        if not isinstance(data, list):
+            return None
+        return [question for question in map(self.validate_question, data) if question]
+    
+    def question_cache_key(self, job_description: str, num_questions: int) -> str:
+        """Fingerprint of a question request; whitespace and case changes to the JD map to the same key"""
+        normalized = ' '.join(job_description.casefold().split())
+        fingerprint = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        return f"{fingerprint}:{num_questions}:{self.model_name}:v{QUESTION_PROMPT_VERSION}"
     
     def generate_questions_from_jd(self, job_description: str, num_questions: int = 6) -> List[Dict]:
-        """Generate interview questions based on job description"""
+        """Generate interview questions based on job description
+        
+        Generated questions are cached per normalized JD, so resubmitting the
+        same description skips the model call. Fallback questions are not cached.
+        """
+        cache_key = self.question_cache_key(job_description, num_questions)
+        questions = self.question_cache.get(cache_key)
+        if questions is not None:
+            return questions
+        
+        questions = self._request_questions(job_description, num_questions)
+        if questions is None:
+            return self._get_fallback_questions()
+        self.question_cache.set(cache_key, questions)
+        return questions
+    
+    def stream_questions_from_jd(self, job_description: str, num_questions: int = 6) -> Iterator[Dict]:
+        """Yield interview questions one by one as the model streams them
+        
+        Questions are parsed out of the partial JSON array as soon as each one
+        is complete. A cached result is replayed instead of calling the model,
+        and a complete streamed result is cached like generate_questions_from_jd's.
+        Fallback questions are yielded if the model produced none.
+        AIServiceUnavailable is raised even after some questions were yielded,
+        so callers can tell an interrupted stream from a complete one.
+        """
+        cache_key = self.question_cache_key(job_description, num_questions)
+        questions = self.question_cache.get(cache_key)
+        if questions is not None:
+            yield from questions
+            return
         
+        questions = []
+        parser = JSONArrayStream()
+        prompt = self._questions_prompt(job_description, num_questions)
+        try:
+            with self._track('questions', prompt) as call:
+                for text in self._generate_stream(prompt, call, temperature=0.7, max_output_tokens=1500):
+                    for question in parser.feed(text):
+                        question = self.validate_question(question)
+                        if question:
+                            questions.append(question)
+                            yield question
+                if not questions:
+                    call.outcome = 'fallback'
+        except AIServiceUnavailable:
+            raise
+        except Exception as e:
+            print(f"Error streaming questions: {e}")
+            if not questions:
+                yield from self._get_fallback_questions()
+            return
+        
+        if not questions:
+            yield from self._get_fallback_questions()
+        elif parser.done:
+            self.question_cache.set(cache_key, questions)
+    
+    def _request_questions(self, job_description: str, num_questions: int) -> Optional[List[Dict]]:
+        """Ask the model for interview questions; returns None if it fails"""
+        prompt = self._questions_prompt(job_description, num_questions)
+        try:
+            with self._track('questions', prompt) as call:
+                text = self._generate(prompt, call, '[', temperature=0.7, max_output_tokens=1500)
+                # None makes the caller fall back to default questions
+                return self._extract(call, text, '[', self._validate_questions)
+                
+        except AIServiceUnavailable:
+            raise
+        except Exception as e:
+            print(f"Error generating questions: {e}")
+            return None
+    
+    def _questions_prompt(self, job_description: str, num_questions: int) -> str:
+        """Question generation prompt, with the JD's boilerplate removed and fitted to AI_JD_TOKEN_BUDGET"""
+        job_description, saved = fit(job_description, settings.AI_JD_TOKEN_BUDGET, compress_job_description)
         prompt = f"""
         Based on the following job description, generate {num_questions} relevant interview questions.
         
@@ -40,41 +448,24 @@ class AIService:
             }}
         ]
         """
-        
-        try:
-            system_prompt = "You are an expert HR interviewer. Generate relevant, professional interview questions."
-            full_prompt = f"{system_prompt}\n\n{prompt}"
-            
-            response = self.model.generate_content(
-                full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=1500,
-                )
-            )
-            
-            content = response.text
-            
-            # Extract JSON from response
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                questions_data = json.loads(json_match.group())
-                return questions_data
-            else:
-                # Fallback questions if AI fails
-                return self._get_fallback_questions()
-                
-        except Exception as e:
-            print(f"Error generating questions: {e}")
-            return self._get_fallback_questions()
+        system_prompt = "You are an expert HR interviewer. Generate relevant, professional interview questions."
+        return self._record_prompt('questions', f"{system_prompt}\n\n{prompt}", saved, settings.AI_JD_TOKEN_BUDGET)
     
-    def score_answer(self, question: str, answer_transcript: str, expected_keywords: List[str]) -> Dict:
-        """Score an interview answer using AI"""
+    def score_answer(self, question: str, answer_transcript: str, expected_keywords: List[str],
+                     features: Optional[Dict] = None) -> Dict:
+        """Score an interview answer using AI
+        
+        features are the local pre-scorer's findings, passed to the model as a hint.
+        The result's 'model' is the model that scored it (see _generate's hedging).
+        The transcript is stripped of filler and fitted to AI_TRANSCRIPT_TOKEN_BUDGET.
+        """
+        answer_transcript, saved = fit(answer_transcript, settings.AI_TRANSCRIPT_TOKEN_BUDGET, compress_transcript)
         
         prompt = f"""
         Question: {question}
         Answer: {answer_transcript}
         Expected Keywords: {', '.join(expected_keywords)}
+        {self._features_hint(features)}
         
         Please score this interview answer on a scale of 0-10 and provide feedback.
         Consider:
@@ -94,29 +485,160 @@ class AIService:
         
         try:
             system_prompt = "You are an expert technical interviewer. Provide fair and constructive scoring."
-            full_prompt = f"{system_prompt}\n\n{prompt}"
-            
-            response = self.model.generate_content(
-                full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.3,
-                    max_output_tokens=500,
-                )
+            full_prompt = self._record_prompt(
+                'score', f"{system_prompt}\n\n{prompt}", saved, settings.AI_TRANSCRIPT_TOKEN_BUDGET
             )
             
-            content = response.text
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                return {"score": 5.0, "feedback": "Unable to process answer", "strengths": [], "improvements": []}
+            with self._track('score', full_prompt) as call:
+                text = self._generate(full_prompt, call, '{', temperature=0.3, max_output_tokens=500)
+                validated = self._extract(
+                    call, text, '{', lambda data: isinstance(data, dict) and self.validate_score(data)
+                )
+            if validated:
+                return dict(validated, model=call.model_name)
+            return {"score": 5.0, "feedback": "Unable to process answer", "strengths": [], "improvements": [], "fallback": True}
                 
+        except AIServiceUnavailable:
+            raise
         except Exception as e:
             print(f"Error scoring answer: {e}")
-            return {"score": 5.0, "feedback": "Scoring unavailable", "strengths": [], "improvements": []}
+            return {"score": 5.0, "feedback": "Scoring unavailable", "strengths": [], "improvements": [], "fallback": True}
+    
+    def _features_hint(self, features: Optional[Dict]) -> str:
+        if not features:
+            return ''
+        matched = ', '.join(features['matched_keywords']) or 'none'
+        return (
+            f"Automatic pre-check: {features['word_count']} words, expected keywords found: {matched} "
+            f"({features['keyword_coverage']:.0%} coverage)"
+        )
+    
+    def score_answers_batch(self, items: List[Dict]) -> List[Optional[Dict]]:
+        """Score several interview answers with a single model call
+        
+        Each item has 'question', 'answer', 'expected_keywords' and optionally
+        the pre-scorer's 'features'. Returns one
+        result per item, in order, with the answering 'model', or None for items the model skipped or
+        scored with invalid output, so callers can retry just those.
+        """
+        if not items:
+            return []
+        
+        budget = settings.AI_TRANSCRIPT_TOKEN_BUDGET
+        fitted = [fit(item['answer'], budget, compress_transcript) for item in items]
+        answers = [
+            {
+                'index': index,
+                'question': item['question'],
+                'answer': fitted[index][0],
+                'expected_keywords': item.get('expected_keywords') or [],
+                **self._batch_features(item.get('features')),
+            }
+            for index, item in enumerate(items)
+        ]
+        prompt = f"""
+        Score each of the following {len(answers)} interview answers on a scale of 0-10 and provide feedback.
+        Consider:
+        1. Relevance to the question (0-3 points)
+        2. Technical accuracy (0-3 points)
+        3. Communication clarity (0-2 points)
+        4. Use of expected keywords (0-2 points)
+        
+        Score every answer independently of the others. word_count, keywords_found and
+        keyword_coverage come from an automatic pre-check and are hints only.
+        
+        Answers (JSON):
+        {json.dumps(answers, ensure_ascii=False)}
+        
+        Return response as a JSON array with exactly one object per answer, in the same order:
+        [
+            {{
+                "index": 0,
+                "score": 7.5,
+                "feedback": "Detailed feedback here",
+                "strengths": ["strength1", "strength2"],
+                "improvements": ["improvement1", "improvement2"]
+            }}
+        ]
+        """
+        
+        results = [None] * len(items)
+        try:
+            system_prompt = "You are an expert technical interviewer. Provide fair and constructive scoring."
+            full_prompt = self._record_prompt(
+                'batch_scores', f"{system_prompt}\n\n{prompt}", sum(saved for _, saved in fitted), budget * len(items)
+            )
+            
+            with self._track('batch_scores', full_prompt) as call:
+                text = self._generate(
+                    full_prompt, call, '[', temperature=0.3, max_output_tokens=min(8192, 400 * len(items) + 200)
+                )
+                scored = self._extract(call, text, '[', lambda data: data if isinstance(data, list) else None)
+        except AIServiceUnavailable:
+            raise
+        except Exception as e:
+            print(f"Error batch scoring answers: {e}")
+            return results
+        
+        if not scored:
+            return results
+        for position, data in enumerate(scored):
+            if not isinstance(data, dict):
+                continue
+            index = data.get('index', position)
+            if isinstance(index, int) and 0 <= index < len(items) and results[index] is None:
+                validated = self.validate_score(data)
+                results[index] = validated and dict(validated, model=call.model_name)
+        return results
+    
+    def _batch_features(self, features: Optional[Dict]) -> Dict:
+        if not features:
+            return {}
+        return {
+            'word_count': features['word_count'],
+            'keywords_found': features['matched_keywords'],
+            'keyword_coverage': features['keyword_coverage'],
+        }
+    
+    def validate_question(self, data) -> Optional[Dict]:
+        """Normalize one generated question, or None if it has no question text"""
+        if not isinstance(data, dict):
+            return None
+        question = data.get('question')
+        if not isinstance(question, str) or not question.strip():
+            return None
+        difficulty = data.get('difficulty')
+        keywords = data.get('expected_keywords')
+        return {
+            'question': question.strip(),
+            'difficulty': difficulty if difficulty in ('easy', 'medium', 'hard') else 'medium',
+            'expected_keywords': [str(item) for item in keywords if item] if isinstance(keywords, list) else [],
+            'category': data.get('category') if isinstance(data.get('category'), str) else 'technical',
+        }
+    
+    def validate_score(self, data: Dict) -> Optional[Dict]:
+        """Normalize one scoring result, or None if it is unusable"""
+        score = data.get('score')
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 10:
+            return None
+        feedback = data.get('feedback')
+        if not isinstance(feedback, str) or not feedback.strip():
+            return None
+        return {
+            'score': float(score),
+            'feedback': feedback,
+            'strengths': [str(item) for item in data.get('strengths') or [] if item],
+            'improvements': [str(item) for item in data.get('improvements') or [] if item],
+        }
     
     def generate_final_recommendation(self, interview_data: Dict) -> str:
-        """Generate final hiring recommendation based on interview performance"""
+        """Generate final hiring recommendation based on interview performance
+        
+        The questions and answers ('qa_summary') are fitted to AI_SUMMARY_TOKEN_BUDGET.
+        """
+        qa_summary, saved = fit(
+            interview_data.get('qa_summary', ''), settings.AI_SUMMARY_TOKEN_BUDGET, compress_summary
+        )
         
         prompt = f"""
         Based on the following interview performance data, provide a hiring recommendation:
@@ -126,7 +648,7 @@ class AIService:
         Individual Scores: {interview_data.get('individual_scores', [])}
         
         Questions and Answers:
-        {interview_data.get('qa_summary', '')}
+        {qa_summary}
         
         Please provide:
         1. Overall recommendation (Hire/Maybe/Reject)
@@ -139,18 +661,15 @@ class AIService:
         
         try:
             system_prompt = "You are an experienced hiring manager providing final interview recommendations."
-            full_prompt = f"{system_prompt}\n\n{prompt}"
-            
-            response = self.model.generate_content(
-                full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.5,
-                    max_output_tokens=800,
-                )
+            full_prompt = self._record_prompt(
+                'recommendation', f"{system_prompt}\n\n{prompt}", saved, settings.AI_SUMMARY_TOKEN_BUDGET
             )
             
-            return response.text
+            with self._track('recommendation', full_prompt) as call:
+                return self._generate(full_prompt, call, temperature=0.5, max_output_tokens=800)
             
+        except AIServiceUnavailable:
+            raise
         except Exception as e:
             print(f"Error generating recommendation: {e}")
             return "Unable to generate recommendation due to technical issues."
@@ -195,3 +714,33 @@ class AIService:
                 "category": "behavioral"
             }
         ]
+
+
+_ai_service = None
+_ai_service_pid = None
+_ai_service_lock = threading.Lock()
+
+
+def get_ai_service() -> AIService:
+    """Return this process's shared AIService, creating it on first use (and again after a fork)"""
+    global _ai_service, _ai_service_pid
+    if _ai_service is None or _ai_service_pid != os.getpid():
+        with _ai_service_lock:
+            if _ai_service is None or _ai_service_pid != os.getpid():
+                _ai_service = AIService()
+                _ai_service_pid = os.getpid()
+    return _ai_service
+
+
+def warm_ai_service() -> AIService:
+    """Create and warm the shared AIService; called from worker boot hooks"""
+    ai_service = get_ai_service()
+    ai_service.warm_up()
+    return ai_service
+
+
+def ai_service_stats() -> Dict:
+    """Stats of this process's shared AIService without creating it"""
+    if _ai_service is None or _ai_service_pid != os.getpid():
+        return {'initialized': False, 'pid': os.getpid()}
+    return _ai_service.stats()
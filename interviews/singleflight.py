@@ -0,0 +1,120 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from .ratelimit import AIServiceUnavailable, get_limiter_cache
+
+POLL_INTERVAL = 0.2  # seconds
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical model calls into one
+
+    The first caller of a key (the leader) runs the call; callers of the
+    same key arriving while it runs wait for it and share its result or
+    exception. Within a process they wait on an event. Across processes the
+    leader holds a lock in the cache and publishes its result there for
+    ``result_ttl`` seconds, and processes that found the lock taken poll for
+    it; if the lock goes away without a result (the call failed or the
+    leader's process died), the next waiter runs the call itself. Values
+    must be picklable.
+    """
+
+    def __init__(self, name: str, result_ttl: int, cache=None):
+        self.name = name
+        self.result_ttl = result_ttl
+        self.cache = cache or get_limiter_cache()
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced_local = 0
+        self.coalesced_remote = 0
+
+    def key(self, *parts) -> str:
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def do(self, key: str, function: Callable[[], Any], deadline: float) -> Tuple[Any, bool]:
+        """Return function's result, or that of an identical call in flight; also whether it was shared
+
+        Waiting stops at deadline (time.monotonic()) with AIServiceUnavailable.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if not flight.done.wait(timeout=max(0.0, deadline - time.monotonic())):
+                raise AIServiceUnavailable('deadline exceeded waiting for an identical call', retry_after=5)
+            self._count('coalesced_local')
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+
+        try:
+            flight.value, shared = self._run(key, function, deadline)
+            return flight.value, shared
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _run(self, key: str, function: Callable[[], Any], deadline: float) -> Tuple[Any, bool]:
+        """Run function as the leader across processes, or wait for another process's result"""
+        lock_key = f"{self.name}:lock:{key}"
+        result_key = f"{self.name}:result:{key}"
+        waiting = False
+        while True:
+            # Only callers that found a call in flight use published results,
+            # so a later identical call is not served a stale response
+            if waiting:
+                result = self.cache.get(result_key)
+                if result is not None:
+                    self._count('coalesced_remote')
+                    return result, True
+            # The lock outlives the leader's call, which ends by its deadline
+            lease = max(1, int(deadline - time.monotonic()) + 1)
+            if self.cache.add(lock_key, 1, timeout=lease):
+                break
+            waiting = True
+            if time.monotonic() + POLL_INTERVAL > deadline:
+                raise AIServiceUnavailable('deadline exceeded waiting for an identical call', retry_after=5)
+            time.sleep(POLL_INTERVAL)
+
+        self._count('leaders')
+        try:
+            value = function()
+            self.cache.set(result_key, value, timeout=self.result_ttl)
+            return value, False
+        finally:
+            self.cache.delete(lock_key)
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            coalesced = self.coalesced_local + self.coalesced_remote
+            return {
+                'calls': self.leaders,
+                'coalesced': coalesced,
+                'coalesced_in_process': self.coalesced_local,
+                'coalesced_across_processes': self.coalesced_remote,
+                'in_flight': len(self._flights),
+                'coalesced_rate': round(coalesced / (self.leaders + coalesced), 3) if self.leaders + coalesced else None,
+            }
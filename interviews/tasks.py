@@ -1,61 +1,36 @@
 from celery import shared_task
 from django.utils import timezone
-from .models import Interview, InterviewAnswer
-from .services import AIService
+from .models import Interview
+from .scoring import score_interview
+from .services import AIServiceUnavailable
 import logging
+import random
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task
-def score_interview_async(interview_id):
-    """Asynchronously score all answers for an interview"""
+@shared_task(bind=True, max_retries=5)
+def score_interview_async(self, interview_id):
+    """Asynchronously score all answers for an interview
+    
+    Retried later while the AI service is rate limited or failing, so
+    unscored answers are never filled with fallback scores. The last
+    attempt finalizes the interview from the answers that could be scored.
+    """
+    last_attempt = self.request.retries >= self.max_retries
     try:
         interview = Interview.objects.get(id=interview_id)
-        answers = InterviewAnswer.objects.filter(interview=interview)
-        total_score = 0
-        scored_answers = 0
-        
-        ai_service = AIService()
-        
-        for answer in answers:
-            if answer.score is None and answer.transcript:
-                # Score the answer
-                score_data = ai_service.score_answer(
-                    answer.question.question_text,
-                    answer.transcript,
-                    answer.question.expected_keywords
-                )
-                
-                answer.score = score_data.get('score', 0)
-                answer.feedback = score_data.get('feedback', '')
-                answer.save()
-            
-            if answer.score is not None:
-                total_score += answer.score
-                scored_answers += 1
+        score_interview(interview, finalize=last_attempt)
         
-        # Calculate average score
-        if scored_answers > 0:
-            interview.total_score = total_score / scored_answers
-            
-            # Generate final recommendation
-            interview_data = {
-                'candidate_name': interview.candidate.name,
-                'total_score': interview.total_score,
-                'individual_scores': [a.score for a in answers if a.score],
-                'qa_summary': '\n'.join([
-                    f"Q: {a.question.question_text}\nA: {a.transcript[:200]}..."
-                    for a in answers if a.transcript
-                ])
-            }
-            
-            interview.recommendation = ai_service.generate_final_recommendation(interview_data)
-            interview.save()
-            
         logger.info(f"Interview {interview_id} scored successfully")
         return True
         
+    except AIServiceUnavailable as e:
+        if last_attempt:
+            logger.error(f"Giving up scoring interview {interview_id} after {self.request.retries + 1} attempts: {e}")
+            return False
+        logger.warning(f"Scoring interview {interview_id} deferred: {e}")
+        raise self.retry(exc=e, countdown=e.retry_after + random.uniform(0, 30))
     except Exception as e:
         logger.error(f"Error scoring interview {interview_id}: {e}")
         return False
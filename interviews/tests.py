@@ -1,3 +1,909 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from google.api_core import exceptions as google_exceptions
+
+from candidates.models import Candidate
+from . import backends, instrumentation, json_stream, services
+from .batching import ScoringBatcher
+from .budget import compress_job_description, count_tokens, fit
+from .cache import TTLLRUCache
+from .hedging import ai_deadline
+from .json_stream import JSONArrayStream, extract_json
+from .backends import FakeBackend, RecordReplayBackend, RecordingNotFound, get_backend
+from .models import Interview, InterviewAnswer, InterviewQuestion, JobDescription, LLMCallLog, ScoreCacheEntry
+from .prescoring import TRANSCRIPT_PENDING, is_pending, prescore, stem
+from .ratelimit import AIServiceUnavailable, CircuitBreaker, TokenBucket
+from .scoring import ScoreCache, get_scoring_executor, score_answers, score_interview
+from .services import AIService, ai_service_stats, get_ai_service
+from .singleflight import SingleFlight
+from .tasks import score_interview_async
+
+
+class TTLLRUCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('interviews.cache.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_returns_stored_value_until_it_expires(self):
+        cache = TTLLRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        self.now += 59
+        self.assertEqual(cache.get('a'), 1)
+        self.now += 1
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLLRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_values_are_copied(self):
+        cache = TTLLRUCache(max_size=2, ttl=60)
+        value = {'questions': ['q1']}
+        cache.set('a', value)
+        value['questions'].append('q2')
+        cache.get('a')['questions'].append('q3')
+        self.assertEqual(cache.get('a'), {'questions': ['q1']})
+
+    def test_zero_size_disables_caching(self):
+        cache = TTLLRUCache(max_size=0, ttl=60)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_stats(self):
+        cache = TTLLRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 1, 0.5))
+
+
+class StemTests(SimpleTestCase):
+    def test_word_forms_share_a_stem(self):
+        for words in [
+            ['deploy', 'deploying', 'deployed', 'deployment'],
+            ['service', 'services'],
+            ['run', 'running'],
+            ['optimize', 'optimization'],
+        ]:
+            with self.subTest(words=words):
+                self.assertEqual(len({stem(word) for word in words}), 1)
+
+    def test_short_words_and_double_s_are_kept(self):
+        self.assertEqual(stem('class'), 'class')
+        self.assertEqual(stem('is'), 'is')
+        self.assertEqual(stem('APIs'), 'api')
+
+
+@override_settings(AI_PRESCORE_MIN_WORDS=5)
+class PrescoreTests(SimpleTestCase):
+    def test_keywords_match_on_stems(self):
+        result = prescore(
+            "I deployed the services with Docker containers and Kubernetes",
+            ['deployment', 'Docker', 'service mesh', 'container'],
+        )
+        self.assertEqual(result['matched_keywords'], ['deployment', 'Docker', 'container'])
+        self.assertEqual(result['keyword_coverage'], 0.75)
+        self.assertFalse(result['trivial'])
+        self.assertNotIn('score', result)
+
+    def test_multi_word_keywords_need_every_word(self):
+        result = prescore("We split the service into parts and added a mesh", ['service mesh'])
+        self.assertEqual(result['matched_keywords'], ['service mesh'])
+        result = prescore("We split the service into smaller parts", ['service mesh'])
+        self.assertEqual(result['matched_keywords'], [])
+
+    def test_short_answers_are_scored_locally(self):
+        result = prescore("Docker mostly", ['docker', 'kubernetes'])
+        self.assertTrue(result['trivial'])
+        self.assertEqual(result['score'], 1.0)
+        self.assertIn('Mentioned: docker', result['feedback'])
+
+    def test_empty_answer(self):
+        result = prescore("", ['docker'])
+        self.assertEqual((result['word_count'], result['score']), (0, 0.0))
+
+    def test_blank_keywords_are_ignored(self):
+        result = prescore("I have used Docker for five years now", ['docker', ' ', ''])
+        self.assertEqual(result['keyword_coverage'], 1.0)
+
+    def test_pending_transcripts(self):
+        self.assertTrue(is_pending(TRANSCRIPT_PENDING))
+        self.assertTrue(is_pending(' transcription pending... '))
+        self.assertFalse(is_pending('I have not used Kafka'))
+
+
+class StubAIService:
+    """Scores every answer 7 without a model, recording the calls"""
+    model_name = 'stub-model'
+    validate_score = AIService.validate_score
+
+    def __init__(self, batch_result=None):
+        self.batch_result = batch_result
+        self.batches = []
+        self.single = []
+
+    def score_answers_batch(self, items):
+        self.batches.append(items)
+        if self.batch_result:
+            return [self.batch_result(item) for item in items]
+        return [{'score': 7, 'feedback': 'Good', 'model': self.model_name} for item in items]
+
+    def score_answer(self, question, answer, expected_keywords, features=None):
+        self.single.append(answer)
+        return {'score': 5, 'feedback': 'Unable to score', 'fallback': True}
+
+    def generate_final_recommendation(self, interview_data):
+        return 'Hire'
+
+
+class InterviewAnswersMixin:
+    """An interview with two answers for the model and one trivial answer"""
+
+    def setUp(self):
+        candidate = Candidate.objects.create(name='Jane Doe', email='jane@example.com', phone='+15550000001')
+        job_description = JobDescription.objects.create(title='Backend Engineer', description='Python APIs')
+        self.interview = Interview.objects.create(candidate=candidate, job_description=job_description)
+        self.answers = []
+        for order, transcript in enumerate([
+            'I deployed our services with Docker and Kubernetes for years',
+            'I wrote REST APIs in Django and tuned the slow queries',
+            'No idea',
+        ]):
+            question = InterviewQuestion.objects.create(
+                job_description=job_description, question_text=f'Question {order}?',
+                expected_keywords=['docker'], order=order
+            )
+            self.answers.append(InterviewAnswer.objects.create(
+                interview=self.interview, question=question, transcript=transcript
+            ))
+
+
+@override_settings(AI_SCORING_BATCH_SIZE=10, AI_SCORING_BATCH_WINDOW=0, AI_PRESCORE_MIN_WORDS=5)
+class ScoreCacheTests(InterviewAnswersMixin, TestCase):
+    def test_scores_are_reused_for_unchanged_answers(self):
+        ai_service = StubAIService()
+        first = score_answers(self.answers, ai_service)
+        self.assertEqual(len(ai_service.batches), 1)
+        self.assertEqual(len(ai_service.batches[0]), 2)
+        self.assertEqual(ScoreCacheEntry.objects.count(), 2)
+
+        second = score_answers(self.answers, ai_service)
+        self.assertEqual(len(ai_service.batches), 1)
+        self.assertEqual([result['score'] for result in second], [result['score'] for result in first])
+        self.assertEqual([result['source'] for result in second], ['ai', 'ai', 'local'])
+        self.assertEqual(second[0]['model'], 'stub-model')
+
+    def test_changed_transcript_is_scored_again(self):
+        ai_service = StubAIService()
+        score_answers(self.answers, ai_service)
+        self.answers[0].transcript = 'I deployed our services with Docker Swarm for many years'
+        score_answers(self.answers, ai_service)
+        self.assertEqual(len(ai_service.batches), 2)
+        self.assertEqual(len(ai_service.batches[1]), 1)
+
+    def test_fallback_scores_are_not_stored(self):
+        ai_service = StubAIService(batch_result=lambda item: None)
+        results = score_answers(self.answers[:1], ai_service)
+        self.assertTrue(results[0]['fallback'])
+        self.assertEqual(len(ai_service.single), 1)
+        self.assertFalse(ScoreCacheEntry.objects.exists())
+
+    def test_key_depends_on_every_input(self):
+        cache = ScoreCache()
+        key = cache.key('Q?', 'answer', ['docker'], 'model-a')
+        self.assertEqual(key, cache.key('Q?', 'answer', ['docker'], 'model-a'))
+        for other in [
+            cache.key('Q2?', 'answer', ['docker'], 'model-a'),
+            cache.key('Q?', 'answer 2', ['docker'], 'model-a'),
+            cache.key('Q?', 'answer', ['k8s'], 'model-a'),
+            cache.key('Q?', 'answer', ['docker'], 'model-b'),
+        ]:
+            self.assertNotEqual(key, other)
+
+    def test_unscorable_answers_defer_the_interview(self):
+        ai_service = StubAIService(batch_result=lambda item: None)
+        with self.assertRaises(AIServiceUnavailable):
+            score_interview(self.interview, ai_service)
+        self.interview.refresh_from_db()
+        self.assertIsNone(self.interview.total_score)
+        # The local score of the trivial answer is kept
+        self.assertEqual(InterviewAnswer.objects.filter(score__isnull=False).count(), 1)
+
+    def test_last_attempt_finalizes_without_unscorable_answers(self):
+        def batch_result(item):
+            return None if 'REST' in item['answer'] else {'score': 8, 'feedback': 'Good'}
+
+        with self.assertLogs('interviews.scoring', 'ERROR'):
+            total = score_interview(self.interview, StubAIService(batch_result), finalize=True)
+
+        unscorable = InterviewAnswer.objects.get(transcript__contains='REST')
+        self.assertEqual((unscorable.score, unscorable.score_source), (None, 'unscorable'))
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.total_score, total)
+        self.assertEqual(self.interview.recommendation, 'Hire')
+        # Later runs do not retry it
+        ai_service = StubAIService()
+        score_interview(self.interview, ai_service)
+        self.assertEqual(ai_service.batches, [])
+
+    def test_task_finalizes_on_its_last_retry(self):
+        ai_service = StubAIService(batch_result=lambda item: None)
+        with mock.patch('interviews.scoring.get_ai_service', return_value=ai_service), \
+                self.assertLogs('interviews', 'ERROR'):
+            result = score_interview_async.apply(args=[str(self.interview.id)], retries=5).get()
+        self.assertTrue(result)
+        self.assertEqual(InterviewAnswer.objects.filter(score_source='unscorable').count(), 2)
+
+    def test_purge_removes_old_entries(self):
+        score_answers(self.answers, StubAIService())
+        ScoreCacheEntry.objects.filter(pk=ScoreCacheEntry.objects.first().pk).update(
+            created_at=timezone.now() - timedelta(days=40)
+        )
+        self.assertEqual(ScoreCache().purge(max_age_days=30), 1)
+        self.assertEqual(ScoreCacheEntry.objects.count(), 1)
+
+
+class ExtractJSONTests(SimpleTestCase):
+    def test_value_surrounded_by_commentary(self):
+        text = 'Sure! Here you go:\n```json\n[{"q": "What is [x]?"}]\n```\nLet me know.'
+        self.assertEqual(extract_json(text), ([{'q': 'What is [x]?'}], 'ok'))
+
+    def test_objects(self):
+        value = extract_json('Result: {"score": 7, "feedback": "ok"}', '{')
+        self.assertEqual(value, ({'score': 7, 'feedback': 'ok'}, 'ok'))
+
+    def test_skips_candidates_that_do_not_parse(self):
+        self.assertEqual(extract_json('See [note 1] and [2, 3]'), ([2, 3], 'ok'))
+        self.assertEqual(extract_json('a ] b [ {"x": 1} } [4]'), ([4], 'ok'))
+
+    def test_no_value(self):
+        self.assertEqual(extract_json('no json here'), (None, 'failed'))
+        self.assertEqual(extract_json(None), (None, 'failed'))
+        self.assertEqual(extract_json('[unclosed'), (None, 'failed'))
+
+    def test_truncated_array_drops_the_cut_off_item(self):
+        text = '[{"question": "Explain REST"}, {"question": "Explain gR'
+        self.assertEqual(extract_json(text), ([{'question': 'Explain REST'}], 'repaired'))
+
+    def test_truncated_object_keeps_the_cut_off_text(self):
+        text = '{"score": 6, "feedback": "Solid answer but miss'
+        self.assertEqual(extract_json(text, '{'), ({'score': 6, 'feedback': 'Solid answer but miss'}, 'repaired'))
+
+    def test_truncated_after_a_comma(self):
+        self.assertEqual(extract_json('[1, 2, '), ([1, 2], 'repaired'))
+
+    def test_truncated_nested_value(self):
+        text = '[{"index": 0, "score": 8}, {"index": 1, "strengths": ["clear"'
+        value, outcome = extract_json(text)
+        self.assertEqual(outcome, 'repaired')
+        self.assertEqual(value[0], {'index': 0, 'score': 8})
+
+    def test_repair_closes_open_string_and_brackets(self):
+        self.assertEqual(json_stream._repair('{"a": ["b', ['{', '['], True, None), {'a': ['b']})
+        self.assertIsNone(json_stream._repair('{"a": ', ['{'], False, None))
+
+    def test_unclosed_brackets_in_prose(self):
+        text = 'Scores use the scale [0, 10).\n[{"score": 5, "feedback": "x"}]'
+        self.assertEqual(extract_json(text), ([{'score': 5, 'feedback': 'x'}], 'ok'))
+        text = 'Here are items [as requested:\n[{"question": "q"}]'
+        self.assertEqual(extract_json(text), ([{'question': 'q'}], 'ok'))
+
+    def test_closed_candidates_that_fail_are_not_rescanned(self):
+        text = '[' * 200 + 'x' + ']' * 200
+        with mock.patch('interviews.json_stream._scan', wraps=json_stream._scan) as scan:
+            self.assertEqual(extract_json(text), (None, 'failed'))
+        self.assertEqual(scan.call_count, 1)
+
+    def test_deeply_nested_brackets(self):
+        self.assertEqual(extract_json('[' * 100000 + ']' * 100000 + ' [1]'), ([1], 'ok'))
+
+
+class JSONArrayStreamTests(SimpleTestCase):
+    def test_objects_are_returned_as_soon_as_they_close(self):
+        stream = JSONArrayStream()
+        self.assertEqual(stream.feed('```json\n[{"q": "a'), [])
+        self.assertEqual(stream.feed('"}, {"q"'), [{'q': 'a'}])
+        self.assertEqual(stream.feed(': "b}]"}'), [{'q': 'b}]'}])
+        self.assertFalse(stream.done)
+        self.assertEqual(stream.feed(']\n```'), [])
+        self.assertTrue(stream.done)
+
+    def test_nested_values_and_escaped_quotes(self):
+        stream = JSONArrayStream()
+        items = stream.feed('[{"q": "say \\"hi\\"", "k": ["a", {"b": 1}]}]')
+        self.assertEqual(items, [{'q': 'say "hi"', 'k': ['a', {'b': 1}]}])
+
+    def test_scalars_and_invalid_objects_are_skipped(self):
+        stream = JSONArrayStream()
+        self.assertEqual(stream.feed('[1, "two", {bad}, {"ok": true}]'), [{'ok': True}])
+
+    def test_text_after_the_array_is_ignored(self):
+        stream = JSONArrayStream()
+        self.assertEqual(stream.feed('[{"a": 1}] [{"b": 2}]'), [{'a': 1}])
+        self.assertEqual(stream.feed('{"c": 3}'), [])
+
+
+@mock.patch('interviews.singleflight.POLL_INTERVAL', 0.01)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = LocMemCache('single-flight-tests', {})
+        self.cache.clear()
+        self.flight = SingleFlight('test', result_ttl=10, cache=self.cache)
+        self.key = self.flight.key('prompt', {'temperature': 0})
+
+    def _run_concurrently(self, function, callers=5):
+        """Call do() from several threads while function blocks; returns their results"""
+        results = [None] * callers
+        started = threading.Barrier(callers)
+
+        def call(index):
+            started.wait()
+            try:
+                results[index] = self.flight.do(self.key, function, time.monotonic() + 5)
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=call, args=(index,)) for index in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results
+
+    def test_concurrent_callers_share_one_call(self):
+        calls = []
+        release = threading.Event()
+
+        def function():
+            calls.append(1)
+            release.wait(timeout=5)
+            return {'questions': ['q1']}
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results = self._run_concurrently(function)
+        timer.cancel()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([value for value, shared in results], [{'questions': ['q1']}] * 5)
+        self.assertEqual(sorted(shared for value, shared in results), [False, True, True, True, True])
+        stats = self.flight.stats()
+        self.assertEqual((stats['calls'], stats['coalesced'], stats['in_flight']), (1, 4, 0))
+
+    def test_concurrent_callers_share_the_exception(self):
+        def function():
+            time.sleep(0.2)
+            raise AIServiceUnavailable('quota exhausted', retry_after=30)
+
+        results = self._run_concurrently(function, callers=3)
+        self.assertTrue(all(isinstance(result, AIServiceUnavailable) for result in results))
+        self.assertEqual(self.flight.stats()['calls'], 1)
+
+    def test_sequential_calls_are_not_served_a_stale_result(self):
+        values = iter(['first', 'second'])
+        deadline = time.monotonic() + 5
+        self.assertEqual(self.flight.do(self.key, lambda: next(values), deadline), ('first', False))
+        self.assertEqual(self.flight.do(self.key, lambda: next(values), deadline), ('second', False))
+
+    def test_waits_for_the_result_of_another_process(self):
+        self.cache.add(f"test:lock:{self.key}", 1, timeout=5)
+
+        def other_process_finishes():
+            self.cache.set(f"test:result:{self.key}", 'remote value', timeout=10)
+            self.cache.delete(f"test:lock:{self.key}")
+
+        threading.Timer(0.1, other_process_finishes).start()
+        value = self.flight.do(self.key, lambda: 'local value', time.monotonic() + 5)
+        self.assertEqual(value, ('remote value', True))
+        self.assertEqual(self.flight.stats()['coalesced_across_processes'], 1)
+
+    def test_runs_the_call_when_the_other_process_fails(self):
+        self.cache.add(f"test:lock:{self.key}", 1, timeout=5)
+        threading.Timer(0.1, self.cache.delete, args=[f"test:lock:{self.key}"]).start()
+        value = self.flight.do(self.key, lambda: 'local value', time.monotonic() + 5)
+        self.assertEqual(value, ('local value', False))
+
+    def test_waiting_stops_at_the_deadline(self):
+        self.cache.add(f"test:lock:{self.key}", 1, timeout=5)
+        with self.assertRaises(AIServiceUnavailable):
+            self.flight.do(self.key, lambda: 'local value', time.monotonic() + 0.05)
+
+
+class CompressJobDescriptionTests(SimpleTestCase):
+    def compress(self, text):
+        # One token over budget, so boilerplate is dropped but nothing needs cutting
+        return compress_job_description(text, count_tokens(text) - 1)
+
+    def test_plain_text_headings_end_boilerplate_sections(self):
+        text = (
+            "Senior Backend Engineer\nAbout Us\nWe are a fintech startup.\nWhat you will do\n"
+            "- Build APIs in Django\nRequirements\n- 5 years of Python\nBenefits\n- Health insurance\n"
+            "- Gym membership"
+        )
+        self.assertEqual(self.compress(text), (
+            "Senior Backend Engineer\nWhat you will do\n- Build APIs in Django\nRequirements\n- 5 years of Python"
+        ))
+
+    def test_boilerplate_words_in_body_text_do_not_start_a_section(self):
+        text = (
+            "Backend Engineer\nCompetitive salary\nResponsibilities\n- Own the payments service\n"
+            "We offer a great salary and benefits package.\n- Mentor engineers"
+        )
+        self.assertEqual(self.compress(text + "\nWe are an equal opportunity employer."), text)
+
+    def test_paragraph_break_ends_a_boilerplate_section(self):
+        text = (
+            "PERKS & BENEFITS:\n- Health insurance\n- Gym membership\n\n"
+            "You will design event-driven services.\nEqual opportunity employer."
+        )
+        self.assertEqual(self.compress(text), "You will design event-driven services.")
+
+    def test_text_within_budget_is_unchanged(self):
+        text = "Backend Engineer\n\nBenefits:\n- Health insurance\n- Health insurance"
+        self.assertEqual(compress_job_description(text, 1000), text)
+        self.assertEqual(fit(text, 1000, compress_job_description), (text, 0))
+
+    def test_cuts_trailing_lines_over_budget(self):
+        text = "\n".join(f"Requirement number {index} for this role" for index in range(50))
+        fitted, saved = fit(text, 60, compress_job_description)
+        self.assertLessEqual(count_tokens(fitted), 60)
+        self.assertTrue(fitted.endswith('[...]'))
+        self.assertGreater(saved, 0)
+
+
+class AIMetricsTests(TestCase):
+    def test_metrics_aggregate_the_call_log_of_every_process(self):
+        for latency, outcome in [(0.3, 'ok'), (4.0, 'ok'), (0.05, 'coalesced')]:
+            LLMCallLog.objects.create(
+                kind='score', model_name='gemini-2.5-pro', backend='gemini', outcome=outcome,
+                latency=latency, prompt_tokens=100, response_tokens=20, cost='0.000325',
+            )
+
+        response = self.client.get('/api/ai/metrics/')
+        lines = response.content.decode().splitlines()
+
+        labels = 'kind="score",model="gemini-2.5-pro",outcome="ok"'
+        self.assertIn(f'ai_call_duration_seconds_bucket{{{labels},le="0.5"}} 1', lines)
+        self.assertIn(f'ai_call_duration_seconds_bucket{{{labels},le="5.0"}} 2', lines)
+        self.assertIn(f'ai_call_duration_seconds_count{{{labels}}} 2', lines)
+        self.assertIn(f'ai_call_duration_seconds_sum{{{labels}}} 4.300000', lines)
+        self.assertIn('ai_call_tokens_total{kind="score",model="gemini-2.5-pro",direction="prompt"} 300', lines)
+        self.assertIn('ai_call_cost_usd_total{kind="score",model="gemini-2.5-pro"} 0.000975', lines)
+
+
+class ScoringBatcherTests(SimpleTestCase):
+    def item(self, answer):
+        return {'question': 'Q?', 'answer': answer, 'expected_keywords': [], 'features': {}}
+
+    def test_answers_submitted_within_the_window_share_one_call(self):
+        ai_service = StubAIService()
+        shares = []
+        score_answers_batch = ai_service.score_answers_batch
+
+        def record_shares(items):
+            shares.append(instrumentation._call_context.get()['ids']['interview_shares'])
+            return score_answers_batch(items)
+        ai_service.score_answers_batch = record_shares
+
+        batcher = ScoringBatcher(ai_service, get_scoring_executor(), batch_size=10, window=0.2)
+        futures = []
+        submitters = [
+            threading.Thread(target=lambda items, ids: futures.extend(batcher.submit(items, ids)), args=args)
+            for args in [([self.item('a'), self.item('b'), self.item('c')], ['i1', 'i1', 'i1']),
+                         ([self.item('d')], ['i2'])]
+        ]
+        for submitter in submitters:
+            submitter.start()
+        for submitter in submitters:
+            submitter.join()
+
+        results = [future.result(timeout=5) for future in futures]
+        self.assertEqual(len(ai_service.batches), 1)
+        self.assertEqual(sorted(item['answer'] for item in ai_service.batches[0]), ['a', 'b', 'c', 'd'])
+        self.assertEqual([result['score'] for result in results], [7] * 4)
+        # Token usage is split by the interviews' number of answers
+        self.assertEqual(shares, [{'i1': 0.75, 'i2': 0.25}])
+        stats = batcher.stats()
+        self.assertEqual((stats['batches'], stats['answers'], stats['interviews_per_batch']), (1, 4, 2.0))
+
+    def test_full_batch_is_sent_before_the_window_ends(self):
+        ai_service = StubAIService()
+        batcher = ScoringBatcher(ai_service, get_scoring_executor(), batch_size=2, window=30)
+        started = time.monotonic()
+        futures = batcher.submit([self.item('a'), self.item('b'), self.item('c')], ['i1', 'i1', 'i2'])
+        futures[0].result(timeout=5)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual([len(batch) for batch in ai_service.batches], [2])
+        self.assertEqual(batcher.stats()['full_batches'], 1)
+        self.assertFalse(futures[2].done())
+
+    def test_failed_batch_fails_every_future(self):
+        ai_service = StubAIService()
+        ai_service.score_answers_batch = mock.Mock(side_effect=AIServiceUnavailable('quota', retry_after=30))
+        batcher = ScoringBatcher(ai_service, get_scoring_executor(), batch_size=10, window=0.01)
+        futures = batcher.submit([self.item('a'), self.item('b')], ['i1', 'i2'])
+        for future in futures:
+            with self.assertRaises(AIServiceUnavailable):
+                future.result(timeout=5)
+
+
+@override_settings(AI_SCORING_BATCH_SIZE=10, AI_SCORING_BATCH_WINDOW=0.05, AI_PRESCORE_MIN_WORDS=5)
+class SharedBatchScoringTests(InterviewAnswersMixin, TestCase):
+    def test_answers_missing_from_a_batch_are_scored_alone(self):
+        ai_service = StubAIService(
+            batch_result=lambda item: None if 'REST' in item['answer'] else {'score': 8, 'feedback': 'Good'}
+        )
+        results = score_answers(self.answers, ai_service)
+        self.assertEqual(len(ai_service.batches), 1)
+        self.assertEqual(ai_service.single, [self.answers[1].transcript])
+        self.assertEqual(results[0]['score'], 8)
+        self.assertTrue(results[1]['fallback'])
+
+    def test_waiting_for_a_batch_stops_at_the_deadline(self):
+        ai_service = StubAIService()
+        score_answers_batch = ai_service.score_answers_batch
+        ai_service.score_answers_batch = lambda items: time.sleep(0.5) or score_answers_batch(items)
+        with ai_deadline(0.1), self.assertRaises(AIServiceUnavailable):
+            score_answers(self.answers, ai_service)
+
+
+@override_settings(
+    AI_BACKEND='fake', AI_SINGLE_FLIGHT=False, AI_REQUESTS_PER_MINUTE=0, AI_TOKENS_PER_MINUTE=0, AI_HEDGE_DELAY=0.05,
+    AI_CALL_DEADLINE=5, AI_SCORING_BATCH_SIZE=10, AI_SCORING_BATCH_WINDOW=0, AI_PRESCORE_MIN_WORDS=5,
+)
+class HedgedCallTests(InterviewAnswersMixin, TestCase):
+    """Model calls against fake backends with fixed latencies"""
+
+    def ai_service(self, primary_ms, fallback_ms, primary_error_rate=0.0):
+        return AIService(
+            model_name='primary-model',
+            backend=FakeBackend('primary-model', latency_ms=primary_ms, latency_sigma=0, error_rate=primary_error_rate),
+            hedge_backend=FakeBackend('fallback-model', latency_ms=fallback_ms, latency_sigma=0, error_rate=0),
+        )
+
+    def test_fast_primary_is_not_hedged(self):
+        ai_service = self.ai_service(primary_ms=10, fallback_ms=10)
+        result = ai_service.score_answer('Q?', 'An answer about APIs', ['APIs'])
+        self.assertEqual(result['model'], 'primary-model')
+        self.assertEqual(ai_service.hedge_stats.stats()['hedged'], 0)
+
+    def test_slow_primary_is_hedged_after_the_delay_and_the_fallback_wins(self):
+        ai_service = self.ai_service(primary_ms=2000, fallback_ms=10)
+        started = time.monotonic()
+        result = ai_service.score_answer('Q?', 'An answer about APIs', ['APIs'])
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(result['model'], 'fallback-model')
+        stats = ai_service.hedge_stats.stats()
+        self.assertEqual((stats['hedged'], stats['hedge_wins']), (1, 1))
+        # The abandoned primary request is logged as cancelled
+        self.assertEqual(
+            list(LLMCallLog.objects.values_list('model_name', 'outcome').order_by('model_name')),
+            [('fallback-model', 'ok'), ('primary-model', 'cancelled')]
+        )
+
+    def test_failed_primary_is_hedged_without_waiting_for_the_delay(self):
+        ai_service = self.ai_service(primary_ms=10, fallback_ms=10, primary_error_rate=1.0)
+        with override_settings(AI_HEDGE_DELAY=30):
+            started = time.monotonic()
+            result = ai_service.score_answer('Q?', 'An answer about APIs', ['APIs'])
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(result['model'], 'fallback-model')
+
+    def test_calls_still_running_at_the_deadline_fail(self):
+        ai_service = self.ai_service(primary_ms=2000, fallback_ms=2000)
+        started = time.monotonic()
+        with ai_deadline(0.2), self.assertRaises(AIServiceUnavailable):
+            ai_service.score_answer('Q?', 'An answer about APIs', ['APIs'])
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(ai_service.hedge_stats.stats()['deadline_exceeded'], 1)
+
+    def test_answers_record_the_model_that_scored_them(self):
+        score_interview(self.interview, self.ai_service(primary_ms=2000, fallback_ms=10))
+        self.assertEqual(
+            [(answer.score_source, answer.scoring_model) for answer in self.answers_by_order()],
+            [('ai', 'fallback-model'), ('ai', 'fallback-model'), ('local', '')]
+        )
+
+    def answers_by_order(self):
+        return InterviewAnswer.objects.filter(interview=self.interview).order_by('question__order')
+
+
+class FakeClock:
+    """Stands in for the time module in interviews.ratelimit; sleeping advances the clock"""
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    monotonic = time
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock(120 + 10)
+        patcher = mock.patch('interviews.ratelimit.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = LocMemCache('rate-limit-tests', {})
+        self.cache.clear()
+
+    def test_bucket_refuses_calls_over_the_minute_budget_until_it_refills(self):
+        bucket = TokenBucket('test', requests_per_minute=2, tokens_per_minute=0, cache=self.cache)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertEqual(bucket.try_acquire(), 50)
+
+        self.clock.now = 180
+        self.assertEqual(bucket.try_acquire(), 0)
+
+    def test_refused_calls_give_back_what_they_took(self):
+        bucket = TokenBucket('test', requests_per_minute=10, tokens_per_minute=100, cache=self.cache)
+        self.assertEqual(bucket.try_acquire(60), 0)
+        self.assertEqual(bucket.try_acquire(60), 50)
+        self.assertEqual(bucket.usage()['requests_this_minute'], 1)
+        self.assertEqual(bucket.usage()['tokens_this_minute'], 60)
+        # A call larger than the whole budget goes through on an empty bucket
+        self.clock.now = 180
+        self.assertEqual(bucket.try_acquire(500), 0)
+
+    def test_acquire_waits_for_the_refill_up_to_max_wait(self):
+        bucket = TokenBucket('test', requests_per_minute=1, tokens_per_minute=0, cache=self.cache)
+        bucket.acquire()
+        with self.assertRaises(AIServiceUnavailable) as raised:
+            bucket.acquire(max_wait=10)
+        self.assertEqual(raised.exception.retry_after, 50)
+
+        bucket.acquire(max_wait=60)
+        self.assertGreaterEqual(self.clock.now, 180)
+
+    def test_circuit_opens_at_the_error_rate_and_closes_after_the_cooldown(self):
+        circuit = CircuitBreaker('test', error_rate=0.5, min_calls=4, window=60, cooldown=30, cache=self.cache)
+        for success in (True, True, False):
+            circuit.record(success)
+        circuit.check()
+
+        circuit.record(success=False)
+        with self.assertRaises(AIServiceUnavailable) as raised:
+            circuit.check()
+        self.assertEqual(raised.exception.retry_after, 30)
+
+        self.clock.now += 31
+        circuit.check()
+        # The error rate is measured afresh: one more failure does not reopen it
+        circuit.record(success=False)
+        circuit.check()
+        self.assertEqual(circuit.state()['failures_in_window'], 1)
+
+
+@override_settings(AI_FALLBACK_MODEL='', AI_RATE_LIMIT_MAX_WAIT=0)
+class RetryAfterTests(InterviewAnswersMixin, TestCase):
+    def test_generate_questions_answers_503_with_the_wait_until_refill(self):
+        ai_service = AIService(backend=FakeBackend('stub-model', latency_ms=0, latency_sigma=0, error_rate=0))
+        ai_service.rate_limiter = TokenBucket('test', 1, 0, cache=LocMemCache('retry-after-tests', {}))
+        ai_service.rate_limiter.cache.clear()
+
+        with mock.patch('interviews.views.get_ai_service', return_value=ai_service), \
+                mock.patch('interviews.ratelimit.time', FakeClock(120 + 15)):
+            ai_service.rate_limiter.try_acquire()
+            response = self.client.post('/api/generate-questions/', {
+                'job_description_text': 'Backend engineer building Python APIs', 'num_questions': 3,
+            })
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '45')
+
+    def test_scoring_task_retries_after_the_services_wait(self):
+        with mock.patch('interviews.tasks.score_interview',
+                        side_effect=AIServiceUnavailable('rate limit reached', retry_after=42)), \
+                mock.patch.object(score_interview_async, 'retry', side_effect=RuntimeError('retried')) as retry:
+            score_interview_async.apply(args=[str(self.interview.id)])
+        countdown = retry.call_args.kwargs['countdown']
+        self.assertGreaterEqual(countdown, 42)
+        self.assertLessEqual(countdown, 72)
+
+
+@override_settings(AI_BACKEND='fake', AI_FALLBACK_MODEL='', AI_FAKE_LATENCY_MS=0)
+class SharedAIServiceTests(TestCase):
+    def setUp(self):
+        for name in ('_ai_service', '_ai_service_pid'):
+            patcher = mock.patch.object(services, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_one_instance_per_process(self):
+        self.assertFalse(ai_service_stats()['initialized'])
+        instances = []
+        threads = [threading.Thread(target=lambda: instances.append(get_ai_service())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(instance) for instance in instances}), 1)
+        self.assertIs(get_ai_service(), instances[0])
+        self.assertTrue(ai_service_stats()['initialized'])
+
+    def test_forked_process_gets_its_own_instance(self):
+        parent = get_ai_service()
+        with mock.patch('interviews.services.os.getpid', return_value=-1):
+            child = get_ai_service()
+            self.assertIsNot(child, parent)
+            self.assertIs(get_ai_service(), child)
+
+    def test_stats_endpoint_reports_the_shared_client(self):
+        get_ai_service().score_answer('Q?', 'An answer about APIs', ['APIs'])
+        response = self.client.get('/api/ai/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['backend'], response.data['calls']), ('fake', 1))
+
+
+class GeminiConfigurationTests(SimpleTestCase):
+    @mock.patch('interviews.backends.genai.configure')
+    def test_sdk_is_configured_once_per_process(self, configure):
+        with mock.patch.object(backends, '_configured_pid', None):
+            backends.GeminiBackend('gemini-2.5-pro')
+            backends.GeminiBackend('gemini-2.5-flash')
+            self.assertEqual(configure.call_count, 1)
+
+
+@override_settings(AI_FALLBACK_MODEL='', AI_SINGLE_FLIGHT=False, AI_REQUESTS_PER_MINUTE=0, AI_TOKENS_PER_MINUTE=0)
+class QuestionCacheTests(TestCase):
+    def setUp(self):
+        backend = FakeBackend('stub-model', latency_ms=0, latency_sigma=0, error_rate=0)
+        self.generate = mock.Mock(wraps=backend.generate)
+        backend.generate = self.generate
+        self.ai_service = AIService(backend=backend)
+
+    def test_same_job_description_is_generated_once(self):
+        first = self.ai_service.generate_questions_from_jd('Backend engineer, Python and APIs', 3)
+        second = self.ai_service.generate_questions_from_jd('  backend ENGINEER,\n python and   APIs ', 3)
+
+        self.assertEqual(self.generate.call_count, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(len(first), 3)
+
+    def test_question_count_and_prompt_version_are_part_of_the_key(self):
+        self.ai_service.generate_questions_from_jd('Backend engineer', 3)
+        self.ai_service.generate_questions_from_jd('Backend engineer', 4)
+        with mock.patch('interviews.services.QUESTION_PROMPT_VERSION', 99):
+            self.ai_service.generate_questions_from_jd('Backend engineer', 3)
+        self.assertEqual(self.generate.call_count, 3)
+
+    def test_fallback_questions_are_not_cached(self):
+        self.generate.side_effect = ValueError('bad response')
+        fallback = self.ai_service.generate_questions_from_jd('Backend engineer', 3)
+        self.assertEqual(fallback, self.ai_service._get_fallback_questions())
+
+        self.generate.side_effect = None
+        questions = self.ai_service.generate_questions_from_jd('Backend engineer', 3)
+        self.assertNotEqual(questions, fallback)
+        self.assertEqual(self.generate.call_count, 2)
+
+
+@override_settings(AI_FALLBACK_MODEL='', AI_SINGLE_FLIGHT=False, AI_REQUESTS_PER_MINUTE=0, AI_TOKENS_PER_MINUTE=0)
+class QuestionStreamTests(TestCase):
+    def setUp(self):
+        self.backend = FakeBackend('stub-model', latency_ms=0, latency_sigma=0, error_rate=0)
+        patcher = mock.patch('interviews.views.get_ai_service', return_value=AIService(backend=self.backend))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stream(self):
+        return self.client.post('/api/generate-questions/stream/', {
+            'job_description_text': 'Backend engineer building Python APIs', 'num_questions': 3,
+        })
+
+    def events(self, response):
+        body = b''.join(response.streaming_content).decode('utf-8')
+        events = []
+        for message in body.strip().split('\n\n'):
+            event, data = message.split('\n')
+            events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+        return events
+
+    def test_questions_are_sent_and_saved_one_by_one(self):
+        response = self.stream()
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = self.events(response)
+
+        self.assertEqual([event for event, _ in events], ['job_description', 'question', 'question', 'question', 'done'])
+        job_description_id = events[0][1]['job_description_id']
+        self.assertEqual(events[-1][1], {'job_description_id': job_description_id, 'questions': 3})
+        self.assertEqual(
+            [data['question_text'] for event, data in events if event == 'question'],
+            list(InterviewQuestion.objects.filter(job_description_id=job_description_id)
+                 .order_by('order').values_list('question_text', flat=True))
+        )
+
+    def test_unavailable_service_answers_503_before_streaming(self):
+        self.backend.stream = mock.Mock(side_effect=AIServiceUnavailable('circuit open', retry_after=30))
+        response = self.stream()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertFalse(JobDescription.objects.exists())
+
+    def test_stream_interrupted_after_the_first_question_ends_with_an_error_event(self):
+        text = self.backend.respond(self.backend_prompt())
+
+        def stream(prompt, generation_config):
+            yield text[:text.index('}, {') + 1]
+            raise google_exceptions.ServiceUnavailable('overloaded')
+        self.backend.stream = stream
+
+        events = self.events(self.stream())
+        self.assertEqual([event for event, _ in events], ['job_description', 'question', 'error'])
+        self.assertEqual(events[-1][1]['questions'], 1)
+
+    def backend_prompt(self):
+        return AIService(backend=self.backend)._questions_prompt('Backend engineer building Python APIs', 3)
+
+
+class LLMBackendTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.recordings = directory.name
+
+    def fake(self, **options):
+        return FakeBackend('fake-model', **dict({'latency_ms': 0, 'latency_sigma': 0, 'error_rate': 0}, **options))
+
+    def test_fake_backend_is_deterministic_and_answers_in_the_requested_shape(self):
+        prompt = 'Based on this job description, generate 4 relevant interview questions'
+        self.assertEqual(self.fake().generate(prompt, {}), self.fake(seed=1).generate(prompt, {}))
+        self.assertEqual(len(json.loads(self.fake().generate(prompt, {}))), 4)
+
+        score = json.loads(self.fake().generate('Question: Q?\nExpected Keywords: APIs', {}))
+        self.assertTrue(0 <= score['score'] <= 10)
+
+    def test_fake_backend_stream_joins_to_the_full_response(self):
+        self.assertEqual(''.join(self.fake().stream('Summarize', {})), self.fake().generate('Summarize', {}))
+
+    def test_fake_backend_injects_errors_and_timeouts(self):
+        with self.assertRaises(google_exceptions.ServiceUnavailable):
+            self.fake(error_rate=1).generate('prompt', {})
+        with self.assertRaises(google_exceptions.DeadlineExceeded):
+            self.fake(latency_ms=1000).generate('prompt', {}, timeout=0.01)
+
+    def test_recorded_responses_are_replayed_without_the_model(self):
+        inner = mock.Mock(wraps=self.fake())
+        inner.name = 'fake'
+        recorder = RecordReplayBackend('fake-model', inner, 'record', self.recordings)
+        text = recorder.generate('prompt', {'temperature': 0.3})
+
+        replay = RecordReplayBackend('fake-model', None, 'replay', self.recordings)
+        self.assertEqual(replay.generate('prompt', {'temperature': 0.3}), text)
+        self.assertEqual(inner.generate.call_count, 1)
+        with self.assertRaises(RecordingNotFound):
+            replay.generate('prompt', {'temperature': 0.7})
+
+    def test_backend_selection(self):
+        with override_settings(AI_BACKEND='fake', AI_RECORD_MODE=''):
+            self.assertIsInstance(get_backend('fake-model'), FakeBackend)
+        with override_settings(AI_BACKEND='fake', AI_RECORD_MODE='record', AI_RECORDINGS_DIR=self.recordings):
+            backend = get_backend('fake-model')
+            self.assertEqual((backend.name, backend.mode), ('fake+record', 'record'))
+        with override_settings(AI_BACKEND='openai'), self.assertRaises(ValueError):
+            get_backend('fake-model')
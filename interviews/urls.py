@@ -8,6 +8,7 @@ urlpatterns = [
     
     # Question generation
     path('generate-questions/', views.generate_questions, name='generate-questions'),
+    path('generate-questions/stream/', views.generate_questions_stream, name='generate-questions-stream'),
     
     # Interview endpoints
     path('interviews/', views.InterviewListView.as_view(), name='interview-list'),
@@ -15,4 +16,8 @@ urlpatterns = [
     path('interviews/create/', views.create_interview, name='create-interview'),
     path('interviews/<uuid:interview_id>/trigger/', views.trigger_interview, name='trigger-interview'),
     path('interviews/<uuid:interview_id>/results/', views.get_interview_results, name='interview-results'),
+    
+    # AI client
+    path('ai/stats/', views.ai_stats, name='ai-stats'),
+    path('ai/metrics/', views.ai_metrics, name='ai-metrics'),
 ]
@@ -1,6 +1,9 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from .models import JobDescription, InterviewQuestion, Interview, InterviewAnswer
@@ -8,10 +11,16 @@ from .serializers import (
     JobDescriptionSerializer, InterviewQuestionSerializer, 
     InterviewSerializer, CreateInterviewSerializer, GenerateQuestionsSerializer
 )
-from .services import AIService
+from .batching import scoring_batcher_stats
+from .hedging import ai_deadline
+from .instrumentation import llm_context, render_metrics
+from .scoring import ScoreCache
+from .services import AIServiceUnavailable, ai_service_stats, get_ai_service
 from candidates.models import Candidate
 from voice_calls.services import TwilioVoiceService
 from voice_calls.models import VoiceCall
+import itertools
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -42,17 +51,19 @@ def generate_questions(request):
         num_questions = serializer.validated_data['num_questions']
         
         try:
-            # Create job description
-            job_desc = JobDescription.objects.create(
-                title="Generated JD",
-                description=job_description_text
-            )
-            
-            # Generate questions using AI
-            ai_service = AIService()
-            questions_data = ai_service.generate_questions_from_jd(
-                job_description_text, num_questions
-            )
+            with llm_context() as call_ids, ai_deadline(settings.AI_REQUEST_DEADLINE):
+                # Generate questions using AI
+                ai_service = get_ai_service()
+                questions_data = ai_service.generate_questions_from_jd(
+                    job_description_text, num_questions
+                )
+                
+                # Create job description
+                job_desc = JobDescription.objects.create(
+                    title="Generated JD",
+                    description=job_description_text
+                )
+                call_ids['job_description_id'] = job_desc.id
             
             # Save questions to database
             questions = []
@@ -71,6 +82,13 @@ def generate_questions(request):
                 'questions': InterviewQuestionSerializer(questions, many=True).data
             }, status=status.HTTP_201_CREATED)
             
+        except AIServiceUnavailable as e:
+            logger.warning(f"Question generation deferred: {e}")
+            return Response(
+                {'error': 'AI service is temporarily unavailable, please retry later'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(int(e.retry_after))}
+            )
         except Exception as e:
             logger.error(f"Error generating questions: {e}")
             return Response(
@@ -81,6 +99,79 @@ def generate_questions(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def _sse(event: str, data) -> str:
+    """One Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def generate_questions_stream(request):
+    """Generate interview questions from job description, streamed as Server-Sent Events
+    
+    Sends a 'job_description' event, then a 'question' event as soon as each
+    question has been generated and saved, and finally 'done' (or 'error').
+    """
+    serializer = GenerateQuestionsSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    job_description_text = serializer.validated_data['job_description_text']
+    num_questions = serializer.validated_data['num_questions']
+    questions_stream = get_ai_service().stream_questions_from_jd(job_description_text, num_questions)
+    
+    # Wait for the first question before answering, so an unavailable AI
+    # service still gets a plain 503 instead of an empty stream
+    try:
+        first_question = next(questions_stream, None)
+    except AIServiceUnavailable as e:
+        logger.warning(f"Question generation deferred: {e}")
+        return Response(
+            {'error': 'AI service is temporarily unavailable, please retry later'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': str(int(e.retry_after))}
+        )
+    except Exception as e:
+        logger.error(f"Error generating questions: {e}")
+        return Response(
+            {'error': 'Failed to generate questions'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    job_desc = JobDescription.objects.create(
+        title="Generated JD",
+        description=job_description_text
+    )
+    
+    def events():
+        yield _sse('job_description', {'job_description_id': job_desc.id})
+        order = 0
+        # The model call is logged when the stream ends, inside this block
+        with llm_context(job_description_id=job_desc.id):
+            try:
+                for q_data in itertools.chain([first_question] if first_question else [], questions_stream):
+                    order += 1
+                    question = InterviewQuestion.objects.create(
+                        job_description=job_desc,
+                        question_text=q_data.get('question', ''),
+                        expected_keywords=q_data.get('expected_keywords', []),
+                        difficulty=q_data.get('difficulty', 'medium'),
+                        order=order
+                    )
+                    yield _sse('question', InterviewQuestionSerializer(question).data)
+            except Exception as e:
+                logger.error(f"Error streaming questions: {e}")
+                yield _sse('error', {'error': 'Question generation stopped early', 'questions': order})
+                return
+        yield _sse('done', {'job_description_id': job_desc.id, 'questions': order})
+    
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 class InterviewListView(generics.ListAPIView):
     """List all interviews"""
     queryset = Interview.objects.all()
@@ -169,7 +260,7 @@ def trigger_interview(request, interview_id):
         # Update interview status
         interview.status = 'in_progress'
         interview.started_at = timezone.now()
-        interview.save()
+        interview.save(update_fields=['status', 'started_at'])
         
         return Response({
             'message': 'Notification call initiated successfully',
@@ -218,6 +309,12 @@ def get_interview_results(request, interview_id):
             'recommendation': interview.recommendation,
             'started_at': interview.started_at,
             'completed_at': interview.completed_at,
+            'ai_usage': {
+                'calls': interview.ai_call_count,
+                'latency': round(interview.ai_latency, 3),
+                'tokens': interview.ai_tokens,
+                'cost': interview.ai_cost,
+            },
             'questions_and_answers': []
         }
         
@@ -240,3 +337,20 @@ def get_interview_results(request, interview_id):
             {'error': 'Failed to get interview results'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def ai_stats(request):
+    """Stats of this worker process's shared AI client, its scoring batcher and the answer score cache"""
+    stats = ai_service_stats()
+    if stats['initialized']:
+        stats['scoring_batcher'] = scoring_batcher_stats(get_ai_service())
+    return Response(dict(stats, score_cache=ScoreCache().stats()), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def ai_metrics(request):
+    """Latency histograms, token and cost counters of all logged model calls, for Prometheus"""
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,3 +1,35 @@
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from candidates.models import Candidate
+from interviews.models import Interview, InterviewQuestion, JobDescription
+from .models import VoiceCall
+
+
+class NextQuestionWebhookTests(TestCase):
+    def setUp(self):
+        candidate = Candidate.objects.create(name='Jane Doe', email='jane@example.com', phone='+15550000001')
+        job_description = JobDescription.objects.create(title='Backend Engineer', description='Python APIs')
+        for order in range(2):
+            InterviewQuestion.objects.create(job_description=job_description, question_text=f'Q{order}?', order=order)
+        self.interview = Interview.objects.create(candidate=candidate, job_description=job_description)
+        VoiceCall.objects.create(
+            interview=self.interview, call_sid='CA123', to_phone='+15550000001', from_phone='+15550000000'
+        )
+
+    @mock.patch('voice_calls.views.TwilioVoiceService')
+    @mock.patch('voice_calls.views.score_interview_async')
+    def test_last_answer_queues_scoring_instead_of_scoring_in_the_webhook(self, score_task, voice_service):
+        voice_service.return_value.generate_interview_twiml.return_value = '<Response/>'
+        with mock.patch('interviews.scoring.score_interview') as score_interview, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/voice/webhook/next-question/2/', {
+                'CallSid': 'CA123', 'RecordingUrl': 'https://api.twilio.com/recordings/RE1', 'RecordingDuration': '12',
+            })
+
+        self.assertEqual(response.status_code, 200)
+        score_interview.assert_not_called()
+        score_task.delay.assert_called_once_with(str(self.interview.id))
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.status, 'completed')
@@ -1,6 +1,8 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from django.conf import settings
+from django.db import transaction
 from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
@@ -12,8 +14,12 @@ except ImportError:
     from twilio.twiml import VoiceResponse
 from .models import VoiceCall, CallEvent
 from .services import TwilioVoiceService
+from interviews.hedging import ai_deadline
 from interviews.models import Interview, InterviewQuestion, InterviewAnswer
-from interviews.services import AIService
+from interviews.prescoring import TRANSCRIPT_PENDING, is_pending
+from interviews.scoring import score_answers
+from interviews.services import AIServiceUnavailable
+from interviews.tasks import score_interview_async
 import json
 import logging
 
@@ -80,7 +86,7 @@ def next_question_webhook(request, question_index):
                     defaults={
                         'audio_url': recording_url,
                         'audio_duration': float(recording_duration) if recording_duration else 0,
-                        'transcript': 'Transcription pending...'
+                        'transcript': TRANSCRIPT_PENDING
                     }
                 )
                 
@@ -102,9 +108,9 @@ def next_question_webhook(request, question_index):
         if question_index >= len(question_texts):
             interview.status = 'completed'
             interview.completed_at = timezone.now()
-            interview.save()
+            interview.save(update_fields=['status', 'completed_at'])
             
-            # Trigger scoring process (could be done asynchronously)
+            # Trigger scoring process in a worker
             score_interview_answers(interview)
         
         return HttpResponse(twiml, content_type='text/xml')
@@ -147,17 +153,30 @@ def transcription_webhook(request, question_index):
                 answer.transcript = transcription_text
                 answer.save()
                 
-                # Score the answer using AI
-                ai_service = AIService()
-                score_data = ai_service.score_answer(
-                    question.question_text,
-                    transcription_text,
-                    question.expected_keywords
-                )
+                # Score the answer (trivial answers locally, the rest using AI),
+                # within a deadline that keeps the webhook under Twilio's timeout
+                try:
+                    with ai_deadline(settings.AI_WEBHOOK_DEADLINE):
+                        # Waiting for a shared batch would eat into the deadline
+                        score_data = score_answers([answer], share_batches=False)[0]
+                    if score_data.get('fallback'):
+                        raise AIServiceUnavailable('model output could not be used as a score')
+                except AIServiceUnavailable as e:
+                    # Left unscored; a worker scores it with the rest of the interview
+                    logger.warning(f"Scoring answer {answer.id} deferred: {e}")
+                    score_interview_async.apply_async((str(interview.id),), countdown=e.retry_after)
+                    return HttpResponse('OK')
                 
                 answer.score = score_data.get('score', 0)
                 answer.feedback = score_data.get('feedback', '')
+                answer.score_source = score_data['source']
+                answer.scoring_model = score_data.get('model') or ''
                 answer.save()
+                
+                # Completion scoring ran before the transcriptions arrived; once the
+                # last one is scored, recompute the total and recommendation
+                if interview.status == 'completed' and not _answers_pending(interview):
+                    score_interview_async.delay(str(interview.id))
         
         return HttpResponse('OK')
         
@@ -188,7 +207,7 @@ def call_status_webhook(request):
                     voice_call.interview.status = 'completed'
                 else:
                     voice_call.interview.status = 'failed'
-                voice_call.interview.save()
+                voice_call.interview.save(update_fields=['status'])
             
             voice_call.save()
             
@@ -243,49 +262,20 @@ def recording_webhook(request):
         return HttpResponse('Error', status=500)
 
 
+def _answers_pending(interview) -> bool:
+    """Whether any answer still waits for its transcription or its score"""
+    return any(
+        is_pending(answer.transcript)
+        or (answer.transcript and answer.score is None and answer.score_source != 'unscorable')
+        for answer in InterviewAnswer.objects.filter(interview=interview).only('transcript', 'score', 'score_source')
+    )
+
+
 def score_interview_answers(interview):
-    """Score all answers for an interview and generate final recommendation"""
-    try:
-        answers = InterviewAnswer.objects.filter(interview=interview)
-        total_score = 0
-        scored_answers = 0
-        
-        ai_service = AIService()
-        
-        for answer in answers:
-            if answer.score is None and answer.transcript:
-                # Score the answer
-                score_data = ai_service.score_answer(
-                    answer.question.question_text,
-                    answer.transcript,
-                    answer.question.expected_keywords
-                )
-                
-                answer.score = score_data.get('score', 0)
-                answer.feedback = score_data.get('feedback', '')
-                answer.save()
-            
-            if answer.score is not None:
-                total_score += answer.score
-                scored_answers += 1
-        
-        # Calculate average score
-        if scored_answers > 0:
-            interview.total_score = total_score / scored_answers
-            
-            # Generate final recommendation
-            interview_data = {
-                'candidate_name': interview.candidate.name,
-                'total_score': interview.total_score,
-                'individual_scores': [a.score for a in answers if a.score],
-                'qa_summary': '\n'.join([
-                    f"Q: {a.question.question_text}\nA: {a.transcript[:200]}..."
-                    for a in answers if a.transcript
-                ])
-            }
-            
-            interview.recommendation = ai_service.generate_final_recommendation(interview_data)
-            interview.save()
-            
-    except Exception as e:
-        logger.error(f"Error scoring interview: {e}")
+    """Score all answers for an interview and generate final recommendation in a worker
+
+    Scoring a whole interview takes several model calls, far longer than
+    Twilio waits for a webhook response.
+    """
+    interview_id = str(interview.id)
+    transaction.on_commit(lambda: score_interview_async.delay(interview_id))